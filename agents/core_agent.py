@@ -1,14 +1,19 @@
 from agents.tool_registry import ToolRegistry
+from agents.session_store import InMemorySessionStore
 from agents.prompt_templates import SYSTEM_PROMPT, RESERVATION_PROMPT, RECOMMENDATION_PROMPT, ERROR_PROMPT
 
 class FoodieSpotAgent:
-    def __init__(self, llm, data_service):
+    def __init__(self, llm, data_service, session_store=None):
         self.llm = llm
         self.data_service = data_service
         self.tool_registry = self._initialize_tools()
-        self.conversation_history = []
-        self.current_context = None
-        self.pending_reservation = None
+        # Per-conversation history and pending reservations; shareable across workers with SqliteSessionStore
+        self.sessions = session_store or InMemorySessionStore()
+
+    @property
+    def conversation_history(self):
+        """Messages of the default session, for single-user callers."""
+        return self.sessions.get("default").messages()
 
     def _initialize_tools(self):
         """Register all available tools"""
@@ -19,9 +24,11 @@ class FoodieSpotAgent:
 
         validation = ValidationService()
         tool_registry = ToolRegistry()
+        # Tools see an instrumented DataService so metrics can split I/O from compute time
+        data_service = tool_registry.instrument(self.data_service)
 
         # Register reservation tools
-        reservation_tools = ReservationTools(self.data_service, validation)
+        reservation_tools = ReservationTools(data_service, validation)
         tool_registry.register_tool(
             "check_availability",
             reservation_tools.check_availability,
@@ -35,7 +42,7 @@ class FoodieSpotAgent:
         )
 
         # Register query tools
-        query_tools = QueryTools(self.data_service)
+        query_tools = QueryTools(data_service)
         tool_registry.register_tool(
             "list_restaurants",
             query_tools.list_restaurants,
@@ -48,7 +55,7 @@ class FoodieSpotAgent:
         )
 
         # Register recommendation tools
-        recommendation_tools = RecommendationTools(self.data_service)
+        recommendation_tools = RecommendationTools(data_service)
         tool_registry.register_tool(
             "get_recommendations",
             recommendation_tools.get_recommendations,
@@ -71,6 +78,8 @@ class FoodieSpotAgent:
             else:
                 alternatives = tool_result.get("alternative_times", [])
                 alt_msg = f" Alternative times: {', '.join(alternatives)}" if alternatives else ""
+                nearby = tool_result.get("alternative_restaurants", [])
+                alt_msg += f" Similar restaurants with space: {', '.join(nearby)}" if nearby else ""
                 return f"Sorry, {tool_result['restaurant_name']} is booked at that time.{alt_msg}"
         elif tool_name == "list_restaurants":
             if tool_result.get('count', 0) == 0:
@@ -82,13 +91,14 @@ class FoodieSpotAgent:
             return f"I recommend: {', '.join(names)}"
         return str(tool_result)
 
-    def process_message(self, user_input):
+    def process_message(self, user_input, session_id="default"):
         """Main agent loop with improved conversation flow"""
-        self.conversation_history.append({"role": "user", "content": user_input})
+        session = self.sessions.get(session_id)
+        self.sessions.append(session, "user", user_input)
 
-        if self.pending_reservation:
+        if session.pending_reservation:
             # Collect missing reservation info if needed
-            missing = [p for p in ["restaurant_id", "date", "party_size", "time_slot"] if p not in self.pending_reservation]
+            missing = [p for p in ["restaurant_id", "date", "party_size", "time_slot"] if p not in session.pending_reservation]
             if missing:
                 questions = {
                     "restaurant_id": "Which location would you prefer? (Downtown or Riverside)",
@@ -97,14 +107,15 @@ class FoodieSpotAgent:
                     "time_slot": "What time would you like to reserve?"
                 }
                 response = questions[missing[0]]
-                self.conversation_history.append({"role": "assistant", "content": response})
+                self.sessions.append(session, "assistant", response)
+                self.sessions.save(session)
                 return response
             try:
                 tool_result = self.tool_registry.execute_tool(
                     "check_availability",
-                    self.pending_reservation
+                    session.pending_reservation
                 )
-                self.pending_reservation = None
+                session.pending_reservation = None
                 response = self._format_tool_response("check_availability", tool_result)
             except Exception as e:
                 response = self.llm.generate("error") + f"\nError: {str(e)}"
@@ -112,8 +123,8 @@ class FoodieSpotAgent:
             # New reservation flow or general query
             tool_decision = self.llm.generate("tool_decision", user_input)
             if tool_decision.get("requires_tool"):
-                self.pending_reservation = tool_decision["arguments"]
-                missing = [p for p in ["restaurant_id", "date", "party_size", "time_slot"] if p not in self.pending_reservation]
+                session.pending_reservation = tool_decision["arguments"]
+                missing = [p for p in ["restaurant_id", "date", "party_size", "time_slot"] if p not in session.pending_reservation]
                 if missing:
                     questions = {
                         "restaurant_id": "Which location would you prefer? (Downtown or Riverside)",
@@ -126,13 +137,14 @@ class FoodieSpotAgent:
                     try:
                         tool_result = self.tool_registry.execute_tool(
                             tool_decision["tool_name"],
-                            self.pending_reservation
+                            session.pending_reservation
                         )
-                        self.pending_reservation = None
+                        session.pending_reservation = None
                         response = self._format_tool_response(tool_decision["tool_name"], tool_result)
                     except Exception as e:
                         response = self.llm.generate("error") + f"\nError: {str(e)}"
             else:
                 response = self.llm.generate("general_response", user_input)
-        self.conversation_history.append({"role": "assistant", "content": response})
+        self.sessions.append(session, "assistant", response)
+        self.sessions.save(session)
         return response
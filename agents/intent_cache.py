@@ -0,0 +1,75 @@
+# agents/intent_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_input(user_input):
+    """Lowercase and collapse whitespace so near-identical messages share a cache entry."""
+    return " ".join(user_input.lower().split())
+
+
+class IntentCache:
+    """Bounded LRU cache with a time-to-live for detect_intent results.
+
+    Keys are (normalized input, catalog generation), so entries computed against an
+    older catalog are never returned; they age out through the LRU order. Values are
+    (intent, params) pairs and `get` returns a fresh params dict each time, so callers
+    cannot corrupt the cached copy. A `maxsize` of 0 disables caching.
+    """
+
+    def __init__(self, maxsize=4096, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires at, intent, params)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return a copy of the cached (intent, params) for `key`, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], dict(entry[2])
+
+    def put(self, key, intent, params):
+        """Cache a copy of (intent, params), evicting the least recently used entry if full."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, intent, dict(params))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters plus current size; hit_rate is over all lookups so far."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,103 @@
+# agents/matcher.py
+
+from collections import deque
+
+
+class MultiPatternMatcher:
+    """Aho-Corasick automaton: finds every occurrence of many patterns in one pass over the text."""
+
+    def __init__(self, patterns):
+        """`patterns` is an iterable of (text, payload) pairs; text is matched case-sensitively."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._lengths = []
+        self._payloads = []
+        for text, payload in patterns:
+            if text:
+                self._add(text, payload)
+        self._build_failure_links()
+
+    def _add(self, text, payload):
+        node = 0
+        for char in text:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(len(self._payloads))
+        self._lengths.append(len(text))
+        self._payloads.append(payload)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                # Inherit the matches that end at the failure state
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text):
+        """Yield (start, end, payload) for every pattern occurrence in `text`."""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for index in output[node]:
+                yield end - self._lengths[index], end, self._payloads[index]
+
+
+def _is_word_boundary(text, start, end):
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+class CatalogMatcher:
+    """Finds restaurant names, cuisines and intent keywords in user input with a single scan."""
+
+    def __init__(self, restaurants, tools, catalog_generation=None):
+        self.catalog_generation = catalog_generation
+        patterns = []
+        # Earlier catalog entries win ties, as in the original linear scan
+        for order, restaurant in enumerate(restaurants):
+            patterns.append((restaurant["name"].lower(), ("restaurant", order, restaurant["name"])))
+        for cuisine in dict.fromkeys(r["cuisine"] for r in restaurants):
+            patterns.append((cuisine.lower(), ("cuisine", 0, cuisine.capitalize())))
+        for intent, tool in tools.items():
+            for keyword in tool["keywords"]:
+                patterns.append((keyword.lower(), ("keyword", 0, intent)))
+        self._automaton = MultiPatternMatcher(patterns)
+
+    def scan(self, user_input):
+        """Return a dict with the best "restaurant" and "cuisine" match and the set of
+        (intent, keyword) "keywords" found in the input.
+
+        Names and cuisines must sit on word boundaries; keywords match anywhere, so
+        "booking" still counts as "book". The longest restaurant name wins.
+        """
+        text = user_input.lower()
+        restaurant, restaurant_rank = None, None
+        cuisine, cuisine_start = None, None
+        keywords = set()
+        for start, end, (kind, order, value) in self._automaton.find_all(text):
+            if kind == "keyword":
+                keywords.add((value, text[start:end]))
+            elif not _is_word_boundary(text, start, end):
+                continue
+            elif kind == "restaurant":
+                rank = (-(end - start), order)
+                if restaurant_rank is None or rank < restaurant_rank:
+                    restaurant, restaurant_rank = value, rank
+            elif cuisine_start is None or start < cuisine_start:
+                cuisine, cuisine_start = value, start
+        return {"restaurant": restaurant, "cuisine": cuisine, "keywords": keywords}
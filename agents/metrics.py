@@ -0,0 +1,172 @@
+# agents/metrics.py
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Latency histogram bucket upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Per-thread time spent inside DataService calls during the current tool dispatch, and
+# the depth of nested timed calls, so that they are not counted twice
+_io = threading.local()
+
+# DataService methods that serve in-memory derived views. Only their refresh path (the
+# storage reads that bring a view up to date) counts as I/O, through io_timer
+COMPUTE_METHODS = frozenset({
+    "get_fuzzy_index", "get_availability_engine", "get_slot_index", "get_compact_catalog", "get_reservation_index",
+    "reservations_between", "reservations_on", "by_customer",
+})
+
+
+class _ToolStats:
+    __slots__ = ("calls", "errors", "buckets", "latency_sum", "latency_max", "io_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}  # Exception type name -> count
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last bucket is +Inf
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.io_seconds = 0.0
+
+
+class ToolMetrics:
+    """Thread-safe counters and latency histograms for tool dispatches.
+
+    Each call records its wall time and the part of it spent inside DataService (see
+    InstrumentedDataService); the rest is reported as compute. Snapshots export as
+    JSON or as Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix="foodiespot_tool"):
+        self.prefix = prefix
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool_name, seconds, io_seconds=0.0, error=None):
+        """Record one dispatch of `tool_name`; `error` is the exception type name if it raised."""
+        with self._lock:
+            stats = self._stats.get(tool_name)
+            if stats is None:
+                stats = self._stats[tool_name] = _ToolStats()
+            stats.calls += 1
+            stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.latency_sum += seconds
+            stats.latency_max = max(stats.latency_max, seconds)
+            stats.io_seconds += io_seconds
+            if error is not None:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self):
+        """Return {tool name: metrics dict} with cumulative histogram buckets, like Prometheus."""
+        with self._lock:
+            snapshot = {}
+            for name, stats in sorted(self._stats.items()):
+                cumulative, buckets = 0, {}
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    buckets[str(bound)] = cumulative
+                snapshot[name] = {
+                    "calls": stats.calls,
+                    "errors": sum(stats.errors.values()),
+                    "errors_by_type": dict(stats.errors),
+                    "latency_seconds": {
+                        "sum": stats.latency_sum,
+                        "mean": stats.latency_sum / stats.calls,
+                        "max": stats.latency_max,
+                        "buckets": buckets,
+                    },
+                    "io_seconds": stats.io_seconds,
+                    "compute_seconds": max(stats.latency_sum - stats.io_seconds, 0.0),
+                }
+            return snapshot
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self):
+        """Render the snapshot in the Prometheus text exposition format."""
+        p = self.prefix
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {p}_calls_total Tool dispatches.", f"# TYPE {p}_calls_total counter",
+            *(f'{p}_calls_total{{tool="{name}"}} {m["calls"]}' for name, m in snapshot.items()),
+            f"# HELP {p}_errors_total Tool dispatches that raised, by exception type.", f"# TYPE {p}_errors_total counter",
+            *(f'{p}_errors_total{{tool="{name}",error="{error}"}} {count}'
+              for name, m in snapshot.items() for error, count in sorted(m["errors_by_type"].items())),
+            f"# HELP {p}_latency_seconds Tool dispatch latency.", f"# TYPE {p}_latency_seconds histogram",
+        ]
+        for name, m in snapshot.items():
+            latency = m["latency_seconds"]
+            lines += [f'{p}_latency_seconds_bucket{{tool="{name}",le="{bound}"}} {count}' for bound, count in latency["buckets"].items()]
+            lines += [f'{p}_latency_seconds_sum{{tool="{name}"}} {latency["sum"]:.6f}',
+                      f'{p}_latency_seconds_count{{tool="{name}"}} {m["calls"]}']
+        lines += [
+            f"# HELP {p}_io_seconds_total Time spent inside DataService calls.", f"# TYPE {p}_io_seconds_total counter",
+            *(f'{p}_io_seconds_total{{tool="{name}"}} {m["io_seconds"]:.6f}' for name, m in snapshot.items()),
+            f"# HELP {p}_compute_seconds_total Time spent outside DataService calls.", f"# TYPE {p}_compute_seconds_total counter",
+            *(f'{p}_compute_seconds_total{{tool="{name}"}} {m["compute_seconds"]:.6f}' for name, m in snapshot.items()),
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def io_clock_start():
+    """Start attributing DataService time on this thread; returns the previous total to restore."""
+    previous = getattr(_io, "seconds", None)
+    _io.seconds = 0.0
+    return previous
+
+def io_clock_stop(previous):
+    """Return the DataService time since io_clock_start and restore the outer dispatch's clock."""
+    seconds = _io.seconds
+    _io.seconds = previous
+    if previous is not None:
+        _io.seconds += seconds  # A nested dispatch's I/O also belongs to the outer one
+    return seconds
+
+
+@contextmanager
+def io_timer():
+    """Add the time spent in the block to this thread's dispatch clock, unless an enclosing block already does."""
+    depth = getattr(_io, "depth", 0)
+    _io.depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _io.depth = depth
+        if depth == 0 and getattr(_io, "seconds", None) is not None:
+            _io.seconds += time.perf_counter() - start
+
+
+class InstrumentedDataService:
+    """Proxy that adds the time spent in each storage-touching DataService method to the dispatch clock.
+
+    The derived-view getters in COMPUTE_METHODS are passed through; the DataService times
+    their refresh path with io_timer instead (see DataService.refresh_timer). Calls nested
+    inside another timed call are not counted twice.
+    """
+
+    def __init__(self, data_service):
+        self._target = data_service
+        data_service.refresh_timer = io_timer
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or name in COMPUTE_METHODS or not callable(attribute):
+            return attribute
+
+        def timed(*args, **kwargs):
+            with io_timer():
+                return getattr(self._target, name)(*args, **kwargs)
+
+        timed.__name__ = name
+        self.__dict__[name] = timed  # Later lookups skip __getattr__
+        return timed
@@ -7,6 +7,7 @@ I can help you:
 - Book a reservation
 - Find a restaurant recommendation
 - Query restaurant details
+- Cancel a reservation
 What would you like to do?
 """
 
@@ -51,9 +52,73 @@ It looks like you might be interested in {possible_action}. {suggestion}
 GUIDANCE_SUGGESTIONS = {
     "make_reservation": "Try saying something like: 'Book a table at Restaurant A for 2 people at 2025-05-17 18:00'.",
     "recommend_restaurant": "Try saying something like: 'Recommend an Italian restaurant for 4 people'.",
-    "query_restaurant": "Try saying something like: 'Tell me about Restaurant B'."
+    "query_restaurant": "Try saying something like: 'Tell me about Restaurant B'.",
+    "cancel_reservation": "Try saying something like: 'Cancel reservation 3f9a1c2b7d4e'.",
+    "find_reservations": "Try saying something like: 'Show reservations at Restaurant C on 2025-05-17'."
 }
 
 ERROR_NO_AVAILABILITY = """
 Sorry, the restaurant is fully booked at that time. Please try a different time or restaurant.
+"""
+
+ALTERNATIVE_TIMES = """
+Nearest available times at {restaurant_name}: {times}
+"""
+
+ALTERNATIVE_RESTAURANTS = """
+Similar restaurants with space: {options}
+"""
+
+RESPONSE_RESERVATION_ID = """- Reservation ID: {reservation_id} (quote it to cancel)
+"""
+
+RESPONSE_WAITLISTED = """
+The restaurant is fully booked at that time, so you are on the waitlist (position {position}).
+You will be booked automatically if enough seats are freed. Waitlist ID: {waitlist_id}
+"""
+
+RESPONSE_CANCELLATION_SUCCESS = """
+Reservation {reservation_id} cancelled.
+- Restaurant: {restaurant_name}
+- Date and Time: {date_time}
+- Party Size: {party_size}
+"""
+
+RESPONSE_WAITLIST_PROMOTED = """
+The freed seats went to {count} waitlisted part{plural}.
+"""
+
+RESPONSE_RESERVATION_LIST = """
+Found {count} reservation{plural}:
+{lines}
+"""
+
+RESPONSE_NO_RESERVATIONS = """
+No reservations found.
+"""
+
+ASK_RESERVATION_FILTER = """
+Please tell me a restaurant, a date (YYYY-MM-DD) or the name the reservations were booked under.
+"""
+
+ERROR_RESERVATION_NOT_FOUND = """
+Sorry, I couldn't find a reservation with ID {reservation_id}. It may already be cancelled.
+"""
+
+# Prompts for the LLM-driven FoodieSpotAgent (agents/core_agent.py)
+SYSTEM_PROMPT = """
+You are FoodieSpot's reservation assistant. Use the available tools to check availability,
+list restaurants and give recommendations. Ask for any missing details before calling a tool.
+"""
+
+RESERVATION_PROMPT = """
+Collect the restaurant, date (YYYY-MM-DD), time (HH:MM) and party size, then check availability.
+"""
+
+RECOMMENDATION_PROMPT = """
+Ask about the occasion and preferences (cuisine, location), then recommend up to three restaurants.
+"""
+
+ERROR_PROMPT = """
+Sorry, something went wrong while handling your request. Please try again.
 """
\ No newline at end of file
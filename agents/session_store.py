@@ -0,0 +1,231 @@
+# agents/session_store.py
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+def summarize_turn(summary, turn, max_chars=500):
+    """Default summarizer: fold a user turn leaving the window into a bounded digest.
+
+    Assistant replies are dropped; the digest keeps the most recent `max_chars` characters.
+    """
+    role, content = turn
+    if role != "user":
+        return summary
+    summary = f"{summary} | {content[:80]}" if summary else content[:80]
+    return summary[-max_chars:]
+
+
+class Session:
+    """One conversation: a ring buffer of recent turns plus the agent's in-progress state."""
+
+    __slots__ = ("session_id", "history", "summary", "turn_count", "pending_reservation", "current_context", "last_seen")
+
+    def __init__(self, session_id, history_size=20, last_seen=0.0):
+        self.session_id = session_id
+        self.history = deque(maxlen=history_size)  # (role, content) tuples, oldest first
+        self.summary = ""       # Digest of turns that fell out of the ring buffer
+        self.turn_count = 0
+        self.pending_reservation = None
+        self.current_context = None
+        self.last_seen = last_seen
+
+    def messages(self):
+        """Recent turns as chat messages, led by the summary of older ones if there is one."""
+        messages = [{"role": "system", "content": f"Earlier in this conversation: {self.summary}"}] if self.summary else []
+        return messages + [{"role": role, "content": content} for role, content in self.history]
+
+    def to_dict(self):
+        return {
+            "history": [list(turn) for turn in self.history],
+            "summary": self.summary,
+            "turn_count": self.turn_count,
+            "pending_reservation": self.pending_reservation,
+            "current_context": self.current_context,
+            "last_seen": self.last_seen,
+        }
+
+    @classmethod
+    def from_dict(cls, session_id, data, history_size=20):
+        session = cls(session_id, history_size, data["last_seen"])
+        session.history.extend(tuple(turn) for turn in data["history"])
+        session.summary = data["summary"]
+        session.turn_count = data["turn_count"]
+        session.pending_reservation = data["pending_reservation"]
+        session.current_context = data["current_context"]
+        return session
+
+
+class SessionStore:
+    """Base class for session stores.
+
+    Sessions idle for longer than `idle_timeout` seconds are dropped, and at most
+    `max_sessions` are kept, evicting the least recently used. Each session keeps the
+    last `history_size` turns; older ones go through `summarizer(summary, turn)`, or are
+    dropped if it is None.
+    """
+
+    def __init__(self, history_size=20, idle_timeout=1800.0, max_sessions=10000,
+                 summarizer=summarize_turn, clock=time.time):
+        self.history_size = history_size
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.summarizer = summarizer
+        self.clock = clock
+        self.evictions = 0
+
+    def get(self, session_id):
+        """Return the session, starting a fresh one if it is unknown or has expired."""
+        raise NotImplementedError
+
+    def save(self, session):
+        """Persist the session after a turn."""
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        raise NotImplementedError
+
+    def evict_idle(self):
+        """Drop every session idle past the timeout; returns how many were dropped."""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def append(self, session, role, content):
+        """Add a turn, summarizing the oldest one if the ring buffer is full."""
+        if len(session.history) == session.history.maxlen and self.summarizer is not None:
+            session.summary = self.summarizer(session.summary, session.history[0])
+        session.history.append((role, content))
+        session.turn_count += 1
+
+
+class InMemorySessionStore(SessionStore):
+    """Sessions in an LRU-ordered dict; idle ones are swept from the cold end as a side effect of access."""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = self.clock()
+        with self._lock:
+            self._evict_idle(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, self.history_size)
+                self._sessions[session_id] = session
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            session.last_seen = now
+            return session
+
+    def save(self, session):
+        with self._lock:
+            session.last_seen = self.clock()
+            self._sessions[session.session_id] = session
+            self._sessions.move_to_end(session.session_id)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_idle(self):
+        with self._lock:
+            return self._evict_idle(self.clock())
+
+    def _evict_idle(self, now):
+        # LRU order is last-access order, so idle sessions are all at the front
+        dropped = 0
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_seen <= self.idle_timeout:
+                break
+            self._sessions.popitem(last=False)
+            dropped += 1
+        self.evictions += dropped
+        return dropped
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    last_seen REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_seen ON sessions (last_seen);
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """Sessions stored as JSON rows in SQLite (WAL mode), shared by every process using the file.
+
+    Eviction runs every `sweep_every` saves: expired rows are deleted and only the
+    `max_sessions` most recently seen are kept.
+    """
+
+    def __init__(self, db_file, sweep_every=256, **options):
+        super().__init__(**options)
+        import sqlite3  # Only needed when this store is selected
+        self._sqlite3 = sqlite3
+        self.db_file = db_file
+        self.sweep_every = sweep_every
+        self._saves = 0
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id):
+        now = self.clock()
+        row = self._connection().execute(
+            "SELECT last_seen, data FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+        if row is not None and now - row[0] <= self.idle_timeout:
+            session = Session.from_dict(session_id, json.loads(row[1]), self.history_size)
+        else:
+            session = Session(session_id, self.history_size)
+        session.last_seen = now
+        return session
+
+    def save(self, session):
+        session.last_seen = self.clock()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (session_id, last_seen, data) VALUES (?, ?, ?)",
+            (session.session_id, session.last_seen, json.dumps(session.to_dict(), separators=(",", ":"))))
+        self._saves += 1
+        if self._saves % self.sweep_every == 0:
+            self.evict_idle()
+
+    def delete(self, session_id):
+        self._connection().execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def evict_idle(self):
+        conn = self._connection()
+        dropped = conn.execute("DELETE FROM sessions WHERE last_seen < ?", (self.clock() - self.idle_timeout,)).rowcount
+        dropped += conn.execute(
+            "DELETE FROM sessions WHERE session_id IN "
+            "(SELECT session_id FROM sessions ORDER BY last_seen DESC LIMIT -1 OFFSET ?)", (self.max_sessions,)).rowcount
+        self.evictions += dropped
+        return dropped
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
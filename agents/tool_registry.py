@@ -1,74 +1,307 @@
 # agents/tool_registry.py
 
+import math
+import re
+import time
 from datetime import datetime  # Add this import
-from tools.reservation_tools import make_reservation
+from weakref import WeakKeyDictionary
+from tools.reservation_tools import make_reservation, cancel_reservation, find_reservations
 from tools.recommendation_tools import recommend_restaurant
 from tools.query_tools import query_restaurant
-from services.data_service import DataService
-from config import RESTAURANTS_FILE, RESERVATIONS_FILE
-
-print(f"ToolRegistry: datetime = {datetime}, has strptime = {hasattr(datetime, 'strptime')}")
-# Initialize DataService to access restaurant data
-data_service = DataService(RESTAURANTS_FILE, RESERVATIONS_FILE)
+from services.data_service import get_data_service
+from agents.matcher import CatalogMatcher
+from services.datetime_parser import find_date, find_slot, parse_slot
+from agents.metrics import ToolMetrics, InstrumentedDataService, io_clock_start, io_clock_stop
+from agents.intent_cache import IntentCache, normalize_input
+from config import INTENT_CACHE_SIZE, INTENT_CACHE_TTL
 
 # Registry of available tools with intent keywords and weights
 TOOLS = {
     "make_reservation": {
         "function": make_reservation,
         "description": "Books a reservation at a restaurant.",
-        "parameters": ["restaurant_name", "date_time", "party_size"],
+        "parameters": {
+            "restaurant_name": {"type": "string", "required": True},
+            "date_time": {"type": "string", "required": True},
+            "party_size": {"type": "integer", "required": True},
+            "waitlist": {"type": "boolean", "required": False},
+            "customer": {"type": "string", "required": False}
+        },
         "keywords": ["book", "reserve", "table"],
         "weight": 1.0
     },
     "recommend_restaurant": {
         "function": recommend_restaurant,
         "description": "Recommends a restaurant based on user preferences.",
-        "parameters": ["cuisine", "party_size", "date_time"],
+        "parameters": {
+            "cuisine": {"type": "string", "required": True},
+            "party_size": {"type": "integer", "required": True},
+            "date_time": {"type": "string", "required": True},
+            "location": {"type": "string", "required": False},
+            "offset": {"type": "integer", "required": False},
+            "limit": {"type": "integer", "required": False},
+            "weights": {"type": "object", "required": False, "format": "weights"}
+        },
         "keywords": ["recommend", "suggest", "find"],
         "weight": 0.8
     },
     "query_restaurant": {
         "function": query_restaurant,
         "description": "Queries details about a restaurant.",
-        "parameters": ["restaurant_name"],
+        "parameters": {
+            "restaurant_name": {"type": "string", "required": True}
+        },
         "keywords": ["query", "details", "info"],
         "weight": 0.6
+    },
+    "cancel_reservation": {
+        "function": cancel_reservation,
+        "description": "Cancels a reservation by its ID, offering the seats to the waitlist.",
+        "parameters": {
+            "reservation_id": {"type": "string", "required": True}
+        },
+        "keywords": ["cancel"],
+        "weight": 1.0
+    },
+    "find_reservations": {
+        "function": find_reservations,
+        "description": "Lists reservations for a customer, a restaurant and/or a date.",
+        "parameters": {
+            "restaurant_name": {"type": "string", "required": False},
+            "date": {"type": "string", "required": False, "format": "YYYY-MM-DD"},
+            "start": {"type": "string", "required": False, "format": "YYYY-MM-DD HH:MM"},
+            "end": {"type": "string", "required": False, "format": "YYYY-MM-DD HH:MM"},
+            "customer": {"type": "string", "required": False}
+        },
+        "keywords": ["reservations", "upcoming"],
+        "weight": 1.1
     }
 }
 
-def detect_intent(user_input):
+# Reservation IDs are 12 lowercase hex digits
+RESERVATION_ID = re.compile(r"\b[0-9a-f]{12}\b")
+
+def _is_integer(value):
+    if isinstance(value, str):
+        value = value.strip().lstrip("+-")
+        return value.isdigit()
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def _is_number(value):
+    if isinstance(value, str):
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _matches_format(pattern):
+    def check(value):
+        try:
+            datetime.strptime(str(value).strip(), pattern)
+            return True
+        except ValueError:
+            return False
+    return check
+
+def _are_weights(weights):
+    """Scoring weights are names mapped to finite numbers."""
+    return all(isinstance(name, str) and _is_number(value) and math.isfinite(float(value))
+               for name, value in weights.items())
+
+# Parameter schema types; integers and numbers may arrive as strings from intent extraction
+PARAMETER_TYPES = {
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "list": lambda value: isinstance(value, (list, tuple)),
+    "object": lambda value: isinstance(value, dict),
+}
+
+PARAMETER_FORMATS = {
+    "YYYY-MM-DD": _matches_format("%Y-%m-%d"),
+    "HH:MM": _matches_format("%H:%M"),
+    "YYYY-MM-DD HH:MM": lambda value: parse_slot(str(value)) is not None,
+    "weights": _are_weights,
+}
+
+class ToolRegistry:
+    """Tools registered by name with parameter schemas, dispatched through `execute_tool`.
+
+    A schema maps each parameter name to {"type": ..., "required": bool, "format": ...}.
+    Tools take a single params dict. Every dispatch, including ones that fail
+    validation or raise, is recorded in `metrics`.
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics or ToolMetrics()
+        self._tools = {}
+
+    def register_tool(self, name, func, description, parameters=None):
+        """Register `func(params)` under `name`; raises ValueError for a malformed schema."""
+        parameters = dict(parameters or {})
+        for param, spec in parameters.items():
+            if spec.get("type") not in PARAMETER_TYPES:
+                raise ValueError(f"Tool {name!r} parameter {param!r} has unknown type {spec.get('type')!r}.")
+            if "format" in spec and spec["format"] not in PARAMETER_FORMATS:
+                raise ValueError(f"Tool {name!r} parameter {param!r} has unknown format {spec['format']!r}.")
+        self._tools[name] = {"function": func, "description": description, "parameters": parameters}
+
+    def list_tools(self):
+        """Describe the registered tools, e.g. for an LLM prompt."""
+        return [{"name": name, "description": tool["description"], "parameters": tool["parameters"]}
+                for name, tool in self._tools.items()]
+
+    def instrument(self, data_service):
+        """Wrap a DataService so time spent in it is reported as I/O in the metrics."""
+        return InstrumentedDataService(data_service)
+
+    def validate(self, name, params):
+        """Return a list of problems with `params` for tool `name` (empty if valid)."""
+        schema = self._tools[name]["parameters"]
+        problems = [f"unexpected parameter {param!r}" for param in params if param not in schema]
+        for param, spec in schema.items():
+            value = params.get(param)
+            if value is None:
+                if spec.get("required"):
+                    problems.append(f"missing required parameter {param!r}")
+            elif not PARAMETER_TYPES[spec["type"]](value):
+                problems.append(f"{param!r} must be of type {spec['type']}")
+            elif "format" in spec and not PARAMETER_FORMATS[spec["format"]](value):
+                problems.append(f"{param!r} must match format {spec['format']}")
+        return problems
+
+    def execute_tool(self, name, params=None):
+        """Validate `params` against the tool's schema and call it, recording metrics.
+
+        Raises ValueError for an unknown tool or invalid parameters; exceptions raised by
+        the tool itself propagate after being counted.
+        """
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name!r}")
+        params = params or {}
+        error = None
+        previous = io_clock_start()
+        start = time.perf_counter()
+        try:
+            problems = self.validate(name, params)
+            if problems:
+                raise ValueError(f"Invalid parameters for {name}: " + "; ".join(problems) + ".")
+            return tool["function"](params)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.record(name, elapsed, io_clock_stop(previous), error)
+
+def create_registry(data_service, metrics=None):
+    """Build a ToolRegistry serving the intent tools in TOOLS against `data_service`."""
+    registry = ToolRegistry(metrics)
+    instrumented = registry.instrument(data_service)
+    for name, tool in TOOLS.items():
+        registry.register_tool(
+            name,
+            lambda params, function=tool["function"]: function(params, instrumented),
+            tool["description"],
+            tool["parameters"]
+        )
+    return registry
+
+# Compiled matcher over catalog names, cuisines and TOOLS keywords, rebuilt when the catalog changes
+_matcher = None
+_matcher_source = None
+
+def get_matcher(data_service=None):
+    """Return the catalog matcher for `data_service`, rebuilding it only if the catalog changed.
+
+    Without an explicit `data_service` the shared per-process one is used.
+    """
+    global _matcher, _matcher_source
+    data_service = data_service or get_data_service()
+    generation = data_service.catalog_generation
+    if _matcher is None or _matcher_source is not data_service or _matcher.catalog_generation != generation:
+        _matcher = CatalogMatcher(data_service.load_restaurants(), TOOLS, generation)
+        _matcher_source = data_service
+    return _matcher
+
+# One detect_intent cache per DataService, dropped along with it
+_intent_caches = WeakKeyDictionary()
+
+def get_intent_cache(data_service=None):
+    """Return the detect_intent cache for `data_service` (the shared one by default)."""
+    data_service = data_service or get_data_service()
+    cache = _intent_caches.get(data_service)
+    if cache is None:
+        cache = _intent_caches.setdefault(data_service, IntentCache(INTENT_CACHE_SIZE, INTENT_CACHE_TTL))
+    return cache
+
+def detect_intent(user_input, data_service=None, use_cache=True):
     """
     Detects user intent based on input using a scoring mechanism.
     Returns the tool name and extracted parameters.
+
+    Results are cached on the normalized input and the catalog generation, so repeated
+    messages skip extraction and scoring; a catalog edit makes older entries unreachable.
     """
-    user_input = user_input.lower().strip()
-    restaurants = data_service.load_restaurants()
-    restaurant_names = [r["name"].lower() for r in restaurants]
+    user_input = normalize_input(user_input)
+    data_service = data_service or get_data_service()
+    if not use_cache:
+        return _detect_intent(user_input, data_service)
+
+    cache = get_intent_cache(data_service)
+    key = (user_input, data_service.catalog_generation)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+    intent, params = _detect_intent(user_input, data_service)
+    cache.put(key, intent, params)
+    return intent, params
+
+def _scan(user_input, data_service):
+    """Matcher scan of the input. A restaurant or cuisine it misses is looked for again in
+    the input with misspelled words corrected against the catalog ("resturant a")."""
+    matches = get_matcher(data_service).scan(user_input)
+    if matches["restaurant"] is None or matches["cuisine"] is None:
+        corrected = data_service.get_fuzzy_index().correct(user_input)
+        if corrected != user_input.lower():
+            retry = get_matcher(data_service).scan(corrected)
+            matches["restaurant"] = matches["restaurant"] or retry["restaurant"]
+            matches["cuisine"] = matches["cuisine"] or retry["cuisine"]
+    return matches
 
-    # Extract fields
-    potential_restaurant = extract_field(user_input, "restaurant")
-    cuisine = extract_field(user_input, "cuisine")
+def _detect_intent(user_input, data_service):
+    """Uncached intent detection on already-normalized input."""
+    # Extract fields; names, cuisines and keywords all come from one pass over the input
+    matches = _scan(user_input, data_service)
+    potential_restaurant = matches["restaurant"]
+    cuisine = matches["cuisine"]
     date_time = extract_field(user_input, "time")
     party_size = extract_field(user_input, "people")
+    reservation_id = extract_field(user_input, "reservation_id")
 
     # Initialize scores for each intent
     intent_scores = {intent: 0.0 for intent in TOOLS}
 
     # Score intents based on keywords
-    for intent, tool in TOOLS.items():
-        for keyword in tool["keywords"]:
-            if keyword in user_input:
-                intent_scores[intent] += tool["weight"]
+    for intent, keyword in matches["keywords"]:
+        intent_scores[intent] += TOOLS[intent]["weight"]
 
     # Boost scores based on extracted fields
-    if potential_restaurant and potential_restaurant.lower() in restaurant_names:
+    if potential_restaurant:
         intent_scores["make_reservation"] += 0.5
         intent_scores["query_restaurant"] += 0.7  # Higher boost for query since it's more likely
+        intent_scores["find_reservations"] += 0.5
     if cuisine:
         intent_scores["recommend_restaurant"] += 0.6
     if date_time and party_size:
         intent_scores["make_reservation"] += 0.4
         intent_scores["recommend_restaurant"] += 0.3
+    if reservation_id:
+        intent_scores["cancel_reservation"] += 0.5
 
     # Select the intent with the highest score
     best_intent = max(intent_scores, key=intent_scores.get)
@@ -83,6 +316,8 @@ def detect_intent(user_input):
             "date_time": date_time or "2025-05-17 18:00",
             "party_size": party_size or "2"
         }
+        if "waitlist" in user_input:
+            params["waitlist"] = True
     elif best_intent == "recommend_restaurant":
         params = {
             "cuisine": cuisine or "Italian",
@@ -93,58 +328,34 @@ def detect_intent(user_input):
         params = {
             "restaurant_name": potential_restaurant
         }
+    elif best_intent == "cancel_reservation":
+        params = {
+            "reservation_id": reservation_id
+        }
+    elif best_intent == "find_reservations":
+        params = {
+            "restaurant_name": potential_restaurant,
+            "date": find_date(user_input)
+        }
+        params = {name: value for name, value in params.items() if value is not None}
 
     return best_intent, params
 
-def extract_field(user_input, field):
+def extract_field(user_input, field, data_service=None):
     """
     Extracts a field from user input dynamically.
     """
     user_input = user_input.lower()
 
     if field == "restaurant":
-        restaurants = data_service.load_restaurants()
-        restaurant_names = [r["name"].lower() for r in restaurants]
-        for name in restaurant_names:
-            if name in user_input:
-                for r in restaurants:
-                    if r["name"].lower() == name:
-                        return r["name"]
-        return None
+        return _scan(user_input, data_service or get_data_service())["restaurant"]
 
     elif field == "cuisine":
-        restaurants = data_service.load_restaurants()
-        cuisines = set(r["cuisine"].lower() for r in restaurants)
-        for cuisine in cuisines:
-            if cuisine in user_input:
-                return cuisine.capitalize()
-        return None
+        return _scan(user_input, data_service or get_data_service())["cuisine"]
 
     elif field == "time":
-        words = user_input.split()
-        for i, word in enumerate(words):
-            if word in ["at", "on"] and i + 1 < len(words):
-                # Look for "YYYY-MM-DD HH:MM", "YYYY-MM-DD HH:MM:SS", or "YYYY-MM-DD HHMM"
-                potential_time = " ".join(words[i + 1:i + 3])  # Start with "YYYY-MM-DD HH:MM"
-                if potential_time:
-                    # Check if it matches any supported format
-                    formats = ['%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H%M']
-                    for fmt in formats:
-                        try:
-                            datetime.strptime(potential_time, fmt)
-                            return potential_time
-                        except ValueError:
-                            continue
-                # If the first attempt fails, try including seconds
-                potential_time = " ".join(words[i + 1:i + 4])  # Include possible seconds
-                if potential_time:
-                    for fmt in formats:
-                        try:
-                            datetime.strptime(potential_time, fmt)
-                            return potential_time
-                        except ValueError:
-                            continue
-        return None
+        # "at"/"on" followed by a slot; returned as the canonical "YYYY-MM-DD HH:MM" key
+        return find_slot(user_input)
 
     elif field == "people":
         words = user_input.split()
@@ -157,4 +368,8 @@ def extract_field(user_input, field):
                     continue
         return None
 
+    elif field == "reservation_id":
+        match = RESERVATION_ID.search(user_input)
+        return match.group(0) if match else None
+
     return None
\ No newline at end of file
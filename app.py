@@ -1,13 +1,23 @@
 # app.py
 
 import streamlit as st
-from agents.tool_registry import detect_intent, TOOLS
+from agents.tool_registry import detect_intent, get_matcher, create_registry, TOOLS
 from agents.prompt_templates import WELCOME_MESSAGE, ERROR_INVALID_INPUT, DYNAMIC_GUIDANCE, GUIDANCE_SUGGESTIONS
-from services.data_service import DataService
-from config import RESTAURANTS_FILE, RESERVATIONS_FILE
+from services.data_service import get_data_service
 
-# Initialize data service
-data_service = DataService(RESTAURANTS_FILE, RESERVATIONS_FILE)
+@st.cache_resource
+def load_services():
+    """Create the shared DataService, compiled catalog matcher and tool registry once per process.
+
+    Streamlit reruns this script on every interaction; the resource cache keeps these
+    (and their caches and metrics) alive across reruns and sessions.
+    """
+    data_service = get_data_service()
+    get_matcher(data_service)
+    # Tool dispatch with schema validation and per-tool metrics
+    return data_service, create_registry(data_service)
+
+data_service, registry = load_services()
 
 # Streamlit app
 st.title("FoodieSpot Reservation System 🍽️")
@@ -18,33 +28,28 @@ user_input = st.text_input("Enter your request:")
 
 if user_input:
     # Detect intent and call the appropriate tool
-    intent, params = detect_intent(user_input)
+    intent, params = detect_intent(user_input, data_service)
     if intent and intent in TOOLS:
-        tool = TOOLS[intent]["function"]
-        response = tool(params, data_service)
+        try:
+            response = registry.execute_tool(intent, params)
+        except ValueError as e:
+            response = ERROR_INVALID_INPUT + "\n" + str(e)
         st.markdown(response)
     else:
         # Determine possible intent based on input
-        user_input_lower = user_input.lower()
-        restaurants = data_service.load_restaurants()
-        restaurant_names = [r["name"].lower() for r in restaurants]
+        matches = get_matcher(data_service).scan(user_input)
         possible_action = "something else"
         suggestion = "Please provide more details or try a different request."
 
         # Check if a restaurant name is mentioned
-        for name in restaurant_names:
-            if name in user_input_lower:
-                possible_action = "querying restaurant details or making a reservation"
-                suggestion = GUIDANCE_SUGGESTIONS["query_restaurant"] + " Or, " + GUIDANCE_SUGGESTIONS["make_reservation"]
-                break
+        if matches["restaurant"]:
+            possible_action = "querying restaurant details or making a reservation"
+            suggestion = GUIDANCE_SUGGESTIONS["query_restaurant"] + " Or, " + GUIDANCE_SUGGESTIONS["make_reservation"]
 
         # Check if a cuisine is mentioned
-        cuisines = set(r["cuisine"].lower() for r in restaurants)
-        for cuisine in cuisines:
-            if cuisine in user_input_lower:
-                possible_action = "finding a restaurant recommendation"
-                suggestion = GUIDANCE_SUGGESTIONS["recommend_restaurant"]
-                break
+        if matches["cuisine"]:
+            possible_action = "finding a restaurant recommendation"
+            suggestion = GUIDANCE_SUGGESTIONS["recommend_restaurant"]
 
         # Display dynamic guidance
         error_message = ERROR_INVALID_INPUT + "\n" + DYNAMIC_GUIDANCE.format(
@@ -58,4 +63,8 @@ if st.checkbox("Show available restaurants"):
     restaurants = data_service.load_restaurants()
     st.write("Available Restaurants:")
     for restaurant in restaurants:
-        st.write(f"- {restaurant['name']} ({restaurant['cuisine']}) - {restaurant['location']}")
\ No newline at end of file
+        st.write(f"- {restaurant['name']} ({restaurant['cuisine']}) - {restaurant['location']}")
+
+# Per-tool call counts, errors and latency split into DataService I/O and compute
+if st.checkbox("Show tool metrics"):
+    st.code(registry.metrics.to_prometheus())
\ No newline at end of file
@@ -0,0 +1,64 @@
+# benchmarks/bench_availability.py
+"""Vectorized availability queries over a large synthetic inventory.
+
+Run with `python -m benchmarks.bench_availability`. Builds 100k restaurants x 96
+daily slots (15-minute grid) and times typical recommendation queries.
+"""
+
+import argparse
+import time
+import numpy as np
+from services.availability_engine import AvailabilityEngine
+
+CUISINES = ["Italian", "Japanese", "Mexican", "Chinese", "Indian", "Thai", "French", "Greek"]
+LOCATIONS = ["Downtown", "Midtown", "Uptown", "Eastside", "Westside"]
+DAY = "2030-01-01"
+
+def build_engine(restaurants, seed=7):
+    rng = np.random.default_rng(seed)
+    slot_keys = [f"{DAY} {minute // 60:02d}:{minute % 60:02d}" for minute in range(0, 24 * 60, 15)]
+    capacity = rng.choice([20, 40, 60], size=restaurants).astype(np.int32)
+    remaining = (capacity[:, None] * rng.random((restaurants, len(slot_keys)))).astype(np.int32)
+    return AvailabilityEngine(
+        [f"Venue {i:06d}" for i in range(restaurants)],
+        [CUISINES[i % len(CUISINES)] for i in range(restaurants)],
+        [LOCATIONS[i % len(LOCATIONS)] for i in range(restaurants)],
+        capacity, slot_keys, remaining
+    )
+
+def _time_ms(func, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def run(restaurants, repeats):
+    start = time.perf_counter()
+    engine = build_engine(restaurants)
+    print(f"built {restaurants} restaurants x {len(engine.slot_keys)} slots in {time.perf_counter() - start:.2f}s")
+    queries = [
+        ("Italian, >=4 seats at 19:00",
+         lambda: engine.restaurants_with_seats(4, f"{DAY} 19:00", cuisine="Italian")),
+        ("Italian Downtown, >=4 seats at 19:00",
+         lambda: engine.restaurants_with_seats(4, f"{DAY} 19:00", cuisine="Italian", location="Downtown")),
+        ("any slot this evening, >=4 seats",
+         lambda: engine.slots_with_seats(4, f"{DAY} 17:00", f"{DAY} 22:00")),
+        ("any slot this evening, Thai Uptown >=6",
+         lambda: engine.slots_with_seats(6, f"{DAY} 17:00", f"{DAY} 22:00", cuisine="Thai", location="Uptown")),
+        ("apply one booking",
+         lambda: engine.apply("Venue 000042", f"{DAY} 19:00", 3)),
+    ]
+    for name, query in queries:
+        print(f"  {name:<40} {_time_ms(query, repeats):8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    run(args.restaurants, args.repeats)
+
+if __name__ == "__main__":
+    main()
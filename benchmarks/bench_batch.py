@@ -0,0 +1,64 @@
+# benchmarks/bench_batch.py
+"""Throughput of N single make_reservation calls against one make_reservations batch of N.
+
+Run with `python -m benchmarks.bench_batch`.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from services.data_service import DataService
+from tools.reservation_tools import make_reservation, make_reservations
+
+SIZES = [10, 100, 1000]
+
+def _requests(count, day):
+    # Spread over every restaurant and several evening slots so every request fits
+    return [{
+        "restaurant_name": f"Restaurant {chr(65 + i % 20)}",
+        "date_time": f"{day} {17 + (i // 20) % 6}:00",
+        "party_size": "1"
+    } for i in range(count)]
+
+def _fresh_service(tmp_dir, backend):
+    for name in os.listdir(tmp_dir):
+        path = os.path.join(tmp_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    return DataService(os.path.join(tmp_dir, "restaurants.json"), os.path.join(tmp_dir, "reservations.json"), backend=backend)
+
+def run(sizes, backend):
+    print(f"backend: {backend}")
+    print(f"{'N':>6} {'single/s':>10} {'batch/s':>10} {'speedup':>8}")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            data_service = _fresh_service(tmp_dir, backend)
+            requests = _requests(size, "2030-01-01")
+            start = time.perf_counter()
+            for params in requests:
+                make_reservation(params, data_service)
+            single = size / (time.perf_counter() - start)
+
+            data_service = _fresh_service(tmp_dir, backend)
+            start = time.perf_counter()
+            results = make_reservations(requests, data_service)
+            batch = size / (time.perf_counter() - start)
+            assert all(r["status"] == "booked" for r in results)
+            print(f"{size:>6} {single:>10.0f} {batch:>10.0f} {batch / single:>7.1f}x")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    args = parser.parse_args()
+    run(args.sizes, args.backend)
+
+if __name__ == "__main__":
+    main()
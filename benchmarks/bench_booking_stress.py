@@ -0,0 +1,78 @@
+# benchmarks/bench_booking_stress.py
+"""Multiprocess booking stress test.
+
+Run with `python -m benchmarks.bench_booking_stress`. Worker processes book one seat
+at a time, either all against one hot slot or spread across every restaurant, and
+the run reports bookings/sec and checks that no slot ended up over capacity.
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+from services.data_service import DataService
+
+SLOT = "2030-01-01 19:00"
+
+def _worker(restaurants_file, reservations_file, worker_id, attempts, spread, results):
+    data_service = DataService(restaurants_file, reservations_file)
+    names = [r["name"] for r in data_service.load_restaurants()]
+    booked = 0
+    for i in range(attempts):
+        name = names[(worker_id + i) % len(names)] if spread else names[0]
+        if data_service.book_reservation({"restaurant_name": name, "date_time": SLOT, "party_size": 1}):
+            booked += 1
+    results.put(booked)
+
+def run(processes, attempts, spread):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        restaurants_file = os.path.join(tmp_dir, "restaurants.json")
+        reservations_file = os.path.join(tmp_dir, "reservations.json")
+        data_service = DataService(restaurants_file, reservations_file)
+        capacities = {r["name"]: r["seating_capacity"] for r in data_service.load_restaurants()}
+
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_worker, args=(restaurants_file, reservations_file, i, attempts, spread, results))
+            for i in range(processes)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        booked = sum(results.get() for _ in workers)
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        reopened = DataService(restaurants_file, reservations_file)
+        seats = Counter()
+        for reservation in reopened.iter_reservations():
+            seats[reservation["restaurant_name"]] += reservation["party_size"]
+        overbooked = [name for name, taken in seats.items() if taken > capacities[name]]
+        mismatched = [
+            r["name"] for r in reopened.load_restaurants()
+            if r["available_slots"].get(SLOT, r["seating_capacity"]) != capacities[r["name"]] - seats[r["name"]]
+        ]
+        mode = "spread" if spread else "hot slot"
+        print(f"{mode}: {processes} processes x {attempts} attempts, {booked} booked in {elapsed:.2f}s "
+              f"({processes * attempts / elapsed:.0f} attempts/sec, {booked / elapsed:.0f} bookings/sec)")
+        print(f"  overbooked restaurants: {len(overbooked)}, inventory mismatches: {len(mismatched)}")
+        return not overbooked and not mismatched
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=50, help="booking attempts per process")
+    args = parser.parse_args()
+    ok = run(args.processes, args.attempts, spread=False)
+    ok = run(args.processes, args.attempts, spread=True) and ok
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
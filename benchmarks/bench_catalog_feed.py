@@ -0,0 +1,85 @@
+# benchmarks/bench_catalog_feed.py
+"""Peak memory and rows/sec of streamed catalog imports and exports as the feed grows.
+
+Run with `python -m benchmarks.bench_catalog_feed`. For each feed size it writes a
+generated CSV or JSON-lines feed (one row in a thousand invalid), imports it into a
+fresh data directory with `import_feed`, then exports it again with `export_feed`,
+reporting rows/sec and the tracemalloc peak of each (from separate runs, since tracing
+slows Python down several times). For comparison it also reports the peak of reading
+the same feed whole, as a list of dicts. The backend's own catalog cache is warmed
+before the export; memory SQLite allocates itself is not traced.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from benchmarks.bench_catalog_memory import _feed
+from services.catalog_feed import _csv_pieces, _jsonl_pieces, export_feed, import_feed, read_feed
+from services.data_service import DataService
+
+def _write_feed(path, format, count, slots_per_day, days):
+    def rows():
+        for i, restaurant in enumerate(_feed(count, slots_per_day, days)):
+            if i % 1000 == 999:
+                restaurant["seating_capacity"] = 0
+            yield restaurant
+    pieces = _csv_pieces if format == "csv" else _jsonl_pieces
+    with open(path, 'w') as f:
+        f.writelines(pieces(rows()))
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def _peak(func):
+    """Peak traced bytes while func() runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(backends, counts, format, slots_per_day, days, chunk_size):
+    print(f"{format} feeds, {days} days x {slots_per_day} slots per restaurant, chunks of {chunk_size}")
+    print(f"  {'backend':<12} {'rows':>8} {'feed MB':>8} {'whole MB':>9} {'import MB':>10} {'import/s':>9} "
+          f"{'export MB':>10} {'export/s':>9}")
+    for count in counts:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            feed = os.path.join(tmp_dir, "feed." + format)
+            _write_feed(feed, format, count, slots_per_day, days)
+            feed_mb = os.path.getsize(feed) / 1e6
+            whole = _peak(lambda: list(read_feed(feed)))
+            for backend in backends:
+                data_dir = os.path.join(tmp_dir, backend)
+                data_service = DataService(os.path.join(data_dir, "restaurants.json"),
+                                           os.path.join(data_dir, "reservations.json"), backend=backend)
+                report, import_s = _timed(lambda: import_feed(data_service, feed, chunk_size=chunk_size))
+                import_peak = _peak(lambda: import_feed(data_service, feed, chunk_size=chunk_size))
+                out = os.path.join(data_dir, "export." + format)
+                sum(len(r["available_slots"]) for r in data_service.load_restaurants())  # Warms the partitioned shard cache too
+                exported, export_s = _timed(lambda: export_feed(data_service, out))
+                export_peak = _peak(lambda: export_feed(data_service, out))
+                print(f"  {backend:<12} {count:>8} {feed_mb:>8.1f} {whole / 1e6:>9.1f} {import_peak / 1e6:>10.1f} "
+                      f"{report['imported'] / import_s:>9.0f} {export_peak / 1e6:>10.1f} {exported / export_s:>9.0f}")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=["json", "sqlite", "partitioned"], default=["json", "partitioned", "sqlite"])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10_000, 100_000])
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--slots-per-day", type=int, default=8)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.backends, args.counts, args.format, args.slots_per_day, args.days, args.chunk_size)
+
+if __name__ == "__main__":
+    main()
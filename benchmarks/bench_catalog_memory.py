@@ -0,0 +1,65 @@
+# benchmarks/bench_catalog_memory.py
+"""Memory of the restaurant catalog as JSON-shaped dicts versus a CompactCatalog.
+
+Run with `python -m benchmarks.bench_catalog_memory`. The default target is 100k
+restaurants x 30 days x 48 slots (144M slots). The dict form is measured on a
+`--sample` of restaurants parsed from JSON, as the storage layer loads it, and
+scaled up linearly, since the full size would not fit in memory. The compact form
+is built at full size from a streamed feed, one restaurant dict at a time.
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from services.compact_catalog import CompactCatalog
+from services.data_service import DataService
+
+def _feed(count, slots_per_day, days, start_date="2030-01-01"):
+    """Yield `count` generated restaurant dicts without holding them all."""
+    template = DataService.__new__(DataService)._generate_restaurant_data(3, slots_per_day, days, start_date)
+    for i in range(count):
+        restaurant = dict(template[i % 3], name=f"Restaurant {DataService._letters(i)}")
+        restaurant["available_slots"] = dict(restaurant["available_slots"])
+        yield restaurant
+
+def _traced(build):
+    """(result, bytes allocated by build() that are still live)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def run(restaurants, days, slots_per_day, sample):
+    slots = restaurants * days * slots_per_day
+    print(f"{restaurants} restaurants x {days} days x {slots_per_day} slots = {slots:,} slots")
+
+    text = json.dumps(list(_feed(sample, slots_per_day, days)))
+    _, sample_bytes = _traced(lambda: json.loads(text))
+    dict_bytes = sample_bytes * restaurants / sample
+    print(f"  dicts (from {sample} restaurants): {dict_bytes / 2**20:>9,.0f} MiB  {dict_bytes / slots:6.1f} B/slot")
+
+    start = time.perf_counter()
+    catalog, compact_bytes = _traced(lambda: CompactCatalog.from_restaurants(_feed(restaurants, slots_per_day, days)))
+    elapsed = time.perf_counter() - start
+    print(f"  compact (built in {elapsed:.0f}s):        {compact_bytes / 2**20:>9,.0f} MiB  {compact_bytes / slots:6.1f} B/slot")
+    print(f"  reduction: {dict_bytes / compact_bytes:.0f}x")
+    for part, size in catalog.memory_usage().items():
+        print(f"    {part:<8} {size / 2**20:>9,.1f} MiB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--slots-per-day", type=int, default=48)
+    parser.add_argument("--sample", type=int, default=500, help="restaurants measured in dict form")
+    args = parser.parse_args()
+    run(args.restaurants, args.days, args.slots_per_day, args.sample)
+
+if __name__ == "__main__":
+    main()
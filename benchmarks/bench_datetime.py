@@ -0,0 +1,75 @@
+# benchmarks/bench_datetime.py
+"""Microbenchmark: date-time validation and extraction, legacy strptime loops vs the shared parser.
+
+Run with `python -m benchmarks.bench_datetime`.
+"""
+
+import argparse
+import timeit
+from datetime import datetime, timezone
+import pytz
+from services.datetime_parser import find_slot, parse_slot, to_utc
+
+LEGACY_FORMATS = ['%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H%M']
+SLOTS = ["2030-05-17 18:00", "2030-05-17 1830", "2030-05-17 19:00:00"]
+MESSAGE = "book a table at restaurant a for 4 people at 2030-05-17 1930 please"
+
+def legacy_validate(date_time_str):
+    """The previous ValidationService.validate_date_time, minus its debug prints."""
+    date_time_str = date_time_str.strip()
+    parsed_time = None
+    for fmt in LEGACY_FORMATS:
+        try:
+            parsed_time = datetime.strptime(date_time_str, fmt)
+            break
+        except ValueError:
+            continue
+    if parsed_time is None:
+        return False
+    ist = pytz.timezone("Asia/Kolkata")
+    parsed_time = ist.localize(parsed_time).astimezone(pytz.UTC)
+    return parsed_time > datetime.now(pytz.UTC)
+
+def new_validate(date_time_str):
+    parsed_time = parse_slot(date_time_str.strip())
+    return parsed_time is not None and to_utc(parsed_time) > datetime.now(timezone.utc)
+
+def legacy_extract(user_input):
+    """The previous extract_field(..., "time") sliding-window search."""
+    words = user_input.split()
+    for i, word in enumerate(words):
+        if word in ["at", "on"] and i + 1 < len(words):
+            for width in (2, 3):
+                potential_time = " ".join(words[i + 1:i + 1 + width])
+                for fmt in LEGACY_FORMATS:
+                    try:
+                        datetime.strptime(potential_time, fmt)
+                        return potential_time
+                    except ValueError:
+                        continue
+    return None
+
+def _per_call_us(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+def run(number):
+    rows = [
+        ("validate (cached)", lambda: [legacy_validate(s) for s in SLOTS], lambda: [new_validate(s) for s in SLOTS], len(SLOTS)),
+        ("validate (cold)", lambda: [legacy_validate(s) for s in SLOTS],
+         lambda: (parse_slot.cache_clear(), to_utc.cache_clear(), [new_validate(s) for s in SLOTS]), len(SLOTS)),
+        ("extract time", lambda: legacy_extract(MESSAGE), lambda: find_slot(MESSAGE), 1),
+    ]
+    print(f"{'operation':<20} {'legacy us':>10} {'new us':>10} {'speedup':>8}")
+    for name, legacy, new, calls in rows:
+        legacy_us = _per_call_us(legacy, number) / calls
+        new_us = _per_call_us(new, number) / calls
+        print(f"{name:<20} {legacy_us:>10.2f} {new_us:>10.2f} {legacy_us / new_us:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.number)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_fuzzy.py
+"""Latency of trigram fuzzy restaurant lookups against catalog size.
+
+Run with `python -m benchmarks.bench_fuzzy`. For each catalog size it indexes
+"Restaurant A", "Restaurant B", ... and looks up misspelled names such as
+"Resturant KQ", reporting the median lookup time, how many resolved to the intended
+restaurant, and the cost of an incremental add and rename.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from services.data_service import DataService
+from services.fuzzy_index import TrigramIndex
+
+def _misspell(name, rng):
+    """Swap two adjacent letters of "restaurant", the part every name shares."""
+    i = rng.randrange(1, 9)
+    word = list("restaurant")
+    word[i], word[i + 1] = word[i + 1], word[i]
+    return "".join(word) + name[len("Restaurant"):]
+
+def _median_us(func, args):
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+def run(sizes, lookups, seed):
+    rng = random.Random(seed)
+    print(f"  {'names':>8} {'build s':>8} {'lookup us':>10} {'resolved':>9} {'add us':>7} {'rename us':>10}")
+    for size in sizes:
+        names = [f"Restaurant {DataService._letters(i)}" for i in range(size)]
+        start = time.perf_counter()
+        index = TrigramIndex()
+        for name in names:
+            index.add(name)
+        build = time.perf_counter() - start
+        targets = [rng.choice(names) for _ in range(lookups)]
+        queries = [_misspell(name, rng) for name in targets]
+        results = [index.best_match(query)[0] for query in queries]
+        resolved = sum(result == target for result, target in zip(results, targets))
+        lookup_us = _median_us(index.best_match, queries)
+        new_names = [f"Bistro {DataService._letters(size + i)}" for i in range(lookups)]
+        add_us = _median_us(index.add, new_names)
+        rename_us = _median_us(lambda name: index.rename(name, name + " Annex"), new_names)
+        print(f"  {size:>8} {build:>8.2f} {lookup_us:>10.1f} {resolved / lookups:>9.0%} {add_us:>7.1f} {rename_us:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 1000, 10_000, 100_000])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.sizes, args.lookups, args.seed)
+
+if __name__ == "__main__":
+    main()
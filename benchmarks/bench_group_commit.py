@@ -0,0 +1,74 @@
+# benchmarks/bench_group_commit.py
+"""Bookings per second from concurrent clients with group commit off and on.
+
+Run with `python -m benchmarks.bench_group_commit`. For each backend and number of
+client threads it builds a seeded catalog in a temporary directory, lets every
+client book random slots for `--duration` seconds, and reports bookings/sec. With
+group commit on it also reports the mean batch size, the p50/p99 flush latency and
+the deepest the queue got. Without it, every booking pays for its own catalog or
+shard write and ledger fsync.
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import threading
+import time
+from benchmarks.suite import build_dataset
+
+def _run_clients(backend, group_commit, clients, restaurants, slots_per_day, days, duration, seed):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        data_service, catalog, _ = build_dataset(tmp_dir, restaurants, slots_per_day, days, 0, seed, backend)
+        data_service.group_commit = group_commit
+        slots = [(r["name"], date_time) for r in catalog for date_time in r["available_slots"]]
+        booked = [0] * clients
+        deadline = time.perf_counter() + duration
+
+        def client(i):
+            rng = random.Random(seed + i)
+            while time.perf_counter() < deadline:
+                restaurant_name, date_time = rng.choice(slots)
+                if data_service.book_reservation({"restaurant_name": restaurant_name, "date_time": date_time, "party_size": 1}):
+                    booked[i] += 1
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        committer = data_service.get_group_committer()
+        stats = committer.stats() if committer else None
+        data_service.close()
+        return sum(booked) / elapsed, stats
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def run(backends, client_counts, restaurants, slots_per_day, days, duration, seed):
+    print(f"{restaurants} restaurants x {slots_per_day} slots x {days} days, {duration:.0f}s per run")
+    print(f"  {'backend':<12} {'clients':>7} {'off /s':>8} {'on /s':>8} {'speedup':>8} {'batch':>6} "
+          f"{'flush p50 ms':>13} {'flush p99 ms':>13} {'max queue':>10}")
+    for backend in backends:
+        for clients in client_counts:
+            off, _ = _run_clients(backend, False, clients, restaurants, slots_per_day, days, duration, seed)
+            on, stats = _run_clients(backend, True, clients, restaurants, slots_per_day, days, duration, seed)
+            flush = stats["flush_seconds"]
+            print(f"  {backend:<12} {clients:>7} {off:>8.0f} {on:>8.0f} {on / off:>7.1f}x {stats['mean_batch_size']:>6.1f} "
+                  f"{flush['p50'] * 1000:>13.2f} {flush['p99'] * 1000:>13.2f} {stats['max_queue_depth']:>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=["json", "sqlite", "partitioned"], default=["json", "partitioned", "sqlite"])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--restaurants", type=int, default=200)
+    parser.add_argument("--slots-per-day", type=int, default=8)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.backends, args.clients, args.restaurants, args.slots_per_day, args.days, args.duration, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_intent.py
+"""Intent detection latency against catalog size.
+
+Run with `python -m benchmarks.bench_intent`. With the compiled matcher, latency
+should stay roughly constant from 20 to 50,000 restaurants. The last column repeats
+the messages with the intent cache enabled (all hits after the first round).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from agents.tool_registry import detect_intent, get_matcher
+from services.data_service import DataService
+
+SIZES = [20, 1_000, 10_000, 50_000]
+MESSAGES = [
+    "book a table at Venue 00007 for 2 people at 2030-01-01 18:00",
+    "recommend a restaurant with Italian cuisine for 4 people",
+    "tell me the details of venue 00042",
+    "hello there, what can you do?",
+]
+
+def _catalog(size):
+    cuisines = ["Italian", "Japanese", "Mexican", "Chinese", "Indian", "Thai", "French"]
+    locations = ["Downtown", "Midtown", "Uptown", "Eastside", "Westside"]
+    return [{
+        "name": f"Venue {i:05d}",
+        "location": locations[i % len(locations)],
+        "cuisine": cuisines[i % len(cuisines)],
+        "seating_capacity": (i % 3 + 1) * 20,
+        "available_slots": {}
+    } for i in range(size)]
+
+def run(sizes, repeats):
+    print(f"{'restaurants':>12} {'build ms':>10} {'p50 us':>10} {'p99 us':>10} {'cached p50 us':>14}")
+    for size in sizes:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            restaurants_file = os.path.join(tmp_dir, "restaurants.json")
+            with open(restaurants_file, 'w') as f:
+                json.dump(_catalog(size), f)
+            data_service = DataService(restaurants_file, os.path.join(tmp_dir, "reservations.json"))
+            start = time.perf_counter()
+            get_matcher(data_service)
+            build_ms = (time.perf_counter() - start) * 1000
+            samples = []
+            for i in range(repeats):
+                message = MESSAGES[i % len(MESSAGES)]
+                start = time.perf_counter()
+                detect_intent(message, data_service, use_cache=False)
+                samples.append((time.perf_counter() - start) * 1e6)
+            samples.sort()
+            cached = []
+            for i in range(repeats):
+                message = MESSAGES[i % len(MESSAGES)]
+                start = time.perf_counter()
+                detect_intent(message, data_service)
+                cached.append((time.perf_counter() - start) * 1e6)
+            print(f"{size:>12} {build_ms:>10.1f} {statistics.median(samples):>10.1f} "
+                  f"{samples[int(len(samples) * 0.99) - 1]:>10.1f} {statistics.median(cached):>14.1f}")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_ledger.py
+"""Booking latency against the number of stored reservations.
+
+Run with `python -m benchmarks.bench_ledger`. Latency of `save_reservation` should
+stay flat from 1k to 1M stored reservations; the legacy full-file rewrite is timed
+alongside for the smaller sizes.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from services.data_service import DataService
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LEGACY_MAX_SIZE = 100_000  # The rewrite path is too slow to be worth timing beyond this
+
+def _record(i):
+    return {
+        "restaurant_name": f"Restaurant {chr(65 + i % 20)}",
+        "date_time": "2030-01-01 19:00",
+        "party_size": i % 8 + 1
+    }
+
+def _prefill_ledger(path, count):
+    """Write `count` reservations straight to the ledger file in large chunks."""
+    chunk = 50_000
+    with open(path, 'w') as f:
+        for start in range(0, count, chunk):
+            f.write("".join(json.dumps(_record(i), separators=(",", ":")) + "\n"
+                            for i in range(start, min(start + chunk, count))))
+
+def _legacy_save(reservations_file, reservation):
+    """The previous save_reservation: load the whole array, append, rewrite."""
+    with open(reservations_file, 'r') as f:
+        reservations = json.loads(f.read())
+    reservations.append(reservation)
+    with open(reservations_file, 'w') as f:
+        json.dump(reservations, f, indent=4)
+
+def _time_calls(func, count):
+    samples = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+def run(sizes, bookings, legacy):
+    print(f"{'stored':>10} {'ledger p50 ms':>14} {'ledger p99 ms':>14} {'legacy p50 ms':>14}")
+    for size in sizes:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            restaurants_file = os.path.join(tmp_dir, "restaurants.json")
+            reservations_file = os.path.join(tmp_dir, "reservations.json")
+            ledger_file = os.path.join(tmp_dir, "reservations.jsonl")
+            _prefill_ledger(ledger_file, size)
+            data_service = DataService(restaurants_file, reservations_file, ledger_file)
+            p50, p99 = _time_calls(lambda i: data_service.save_reservation(_record(i)), bookings)
+
+            legacy_p50 = "-"
+            if legacy and size <= LEGACY_MAX_SIZE:
+                with open(reservations_file, 'w') as f:
+                    json.dump([_record(i) for i in range(size)], f, indent=4)
+                legacy_count = max(1, bookings // 20)
+                legacy_p50 = f"{_time_calls(lambda i: _legacy_save(reservations_file, _record(i)), legacy_count)[0]:.3f}"
+            print(f"{size:>10} {p50:>14.3f} {p99:>14.3f} {legacy_p50:>14}")
+        finally:
+            shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--bookings", type=int, default=500, help="appends timed per size")
+    parser.add_argument("--no-legacy", action="store_true", help="skip the full-rewrite comparison")
+    args = parser.parse_args()
+    run(args.sizes, args.bookings, not args.no_legacy)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_llm_batching.py
+"""Throughput and latency of micro-batched LLM calls versus one call per request.
+
+Run with `python -m benchmarks.bench_llm_batching`. Concurrent asyncio clients send
+tool-decision requests through a BatchingScheduler over the deterministic
+RuleBasedLLM, whose cost is a fixed per-batch latency plus a small per-item cost.
+max_batch_size=1 reproduces calling the model once per request.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from services.llm_backend import RuleBasedLLM
+from services.llm_scheduler import BatchingScheduler
+
+async def _client(scheduler, client, requests, latencies):
+    for i in range(requests):
+        start = time.perf_counter()
+        await scheduler.generate("tool_decision", f"client {client}: book restaurant a for {i % 8 + 1} at 18:{i % 60:02d}")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+async def _run_case(clients, requests, max_batch_size, max_wait, batch_latency, item_latency):
+    backend = RuleBasedLLM(batch_latency, item_latency)
+    scheduler = BatchingScheduler(backend, max_batch_size=max_batch_size, max_wait=max_wait, timeout=None)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(scheduler, client, requests, latencies) for client in range(clients)))
+    elapsed = time.perf_counter() - start
+    scheduler.close()
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "mean_batch": scheduler.stats()["mean_batch_size"],
+    }
+
+def run(clients, requests, batch_latency, item_latency):
+    print(f"{clients} clients x {requests} requests; model: {batch_latency * 1000:.0f} ms/batch + {item_latency * 1000:.1f} ms/item")
+    print(f"  {'max batch':>9} {'wait ms':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'mean batch':>11}")
+    for max_batch_size, max_wait in ((1, 0.0), (8, 0.002), (32, 0.002), (32, 0.01)):
+        result = asyncio.run(_run_case(clients, requests, max_batch_size, max_wait, batch_latency, item_latency))
+        print(f"  {max_batch_size:>9} {max_wait * 1000:>8.0f} {result['throughput']:>9.0f} {result['p50']:>9.1f} "
+              f"{result['p95']:>9.1f} {result['mean_batch']:>11.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--batch-latency-ms", type=float, default=20.0)
+    parser.add_argument("--item-latency-ms", type=float, default=0.5)
+    args = parser.parse_args()
+    run(args.clients, args.requests, args.batch_latency_ms / 1000, args.item_latency_ms / 1000)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_partitions.py
+"""Booking latency versus days of inventory kept, whole-file JSON versus date shards.
+
+Run with `python -m benchmarks.bench_partitions`. For each number of days it builds a
+seeded catalog in a temporary directory and times single bookings on random slots.
+The "json" backend rewrites all of restaurants.json per booking, so its cost grows
+with the days kept; "partitioned" rewrites one date's shard and should stay flat.
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from benchmarks.suite import build_dataset
+
+def _time_bookings(backend, restaurants, slots_per_day, days, bookings, seed):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        data_service, catalog, _ = build_dataset(tmp_dir, restaurants, slots_per_day, days, 0, seed, backend)
+        rng = random.Random(seed)
+        samples = []
+        for _ in range(bookings):
+            restaurant = rng.choice(catalog)
+            reservation = {"restaurant_name": restaurant["name"],
+                           "date_time": rng.choice(list(restaurant["available_slots"])), "party_size": 2}
+            start = time.perf_counter()
+            data_service.book_reservation(reservation)
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def run(restaurants, slots_per_day, day_counts, bookings, seed):
+    print(f"{restaurants} restaurants x {slots_per_day} slots/day; median ms per booking over {bookings} bookings")
+    print(f"  {'days':>5} {'json':>9} {'partitioned':>12}")
+    for days in day_counts:
+        json_ms = _time_bookings("json", restaurants, slots_per_day, days, bookings, seed)
+        partitioned_ms = _time_bookings("partitioned", restaurants, slots_per_day, days, bookings, seed)
+        print(f"  {days:>5} {json_ms:>9.2f} {partitioned_ms:>12.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restaurants", type=int, default=200)
+    parser.add_argument("--slots-per-day", type=int, default=8)
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 7, 30, 90])
+    parser.add_argument("--bookings", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.restaurants, args.slots_per_day, args.days, args.bookings, args.seed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_ranking.py
+"""Top-k recommendation ranking versus scoring and sorting every candidate.
+
+Run with `python -m benchmarks.bench_ranking`. Uses the synthetic inventory from
+bench_availability and compares the previous per-restaurant loop (score, build a
+reason string, full sort) with the Ranker's vectorized scores and bounded heap.
+"""
+
+import argparse
+import time
+from benchmarks.bench_availability import DAY, _time_ms, build_engine
+from services.ranking import Ranker
+
+def legacy_recommend(engine, restaurants, party_size, date_time, cuisine, limit=3):
+    """The ranking loop recommend_restaurant used before services.ranking."""
+    seats = engine.seats_at(date_time)
+    candidates = []
+    for row in engine.restaurants_with_seats(party_size, date_time, cuisine=cuisine):
+        restaurant = restaurants[row]
+        score = 1.0
+        ratio = int(seats[row]) / party_size
+        if 1.0 <= ratio <= 2.0:
+            score += 0.5
+        elif ratio > 2.0:
+            score += 0.3
+        if restaurant["location"] == "Downtown":
+            score += 0.4
+        elif restaurant["location"] in ["Midtown", "Uptown"]:
+            score += 0.2
+        candidates.append({
+            "restaurant": restaurant,
+            "score": score,
+            "reason": f"Matches your cuisine preference ({cuisine}) and has enough seating for {party_size} people."
+        })
+    candidates.sort(key=lambda x: x["score"], reverse=True)
+    return candidates[:limit]
+
+def run(restaurants, repeats):
+    engine = build_engine(restaurants)
+    catalog = [{"name": engine.names[row], "location": location}
+               for row, location in enumerate(engine.location_codes.tolist())]
+    locations = {code: name for name, code in engine.location_of.items()}
+    for restaurant in catalog:
+        restaurant["location"] = locations[restaurant["location"]].capitalize()
+    start = time.perf_counter()
+    ranker = Ranker(engine)
+    print(f"{restaurants} restaurants; ranker features built in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    date_time = f"{DAY} 19:00"
+    total, page = ranker.top(4, date_time, cuisine="Italian")
+    legacy = legacy_recommend(engine, catalog, 4, date_time, "Italian")
+    assert [catalog[row]["name"] for row, _, _ in page] == [c["restaurant"]["name"] for c in legacy]
+    print(f"  {total} candidates for 'Italian, 4 people at 19:00'")
+
+    cases = [
+        ("legacy full sort, top 3", lambda: legacy_recommend(engine, catalog, 4, date_time, "Italian")),
+        ("ranker heap, top 3", lambda: ranker.top(4, date_time, cuisine="Italian")),
+        ("ranker heap, page 10 (offset 27)", lambda: ranker.top(4, date_time, cuisine="Italian", offset=27)),
+        ("ranker heap, any cuisine, top 10", lambda: ranker.top(2, date_time, limit=10)),
+    ]
+    for name, case in cases:
+        print(f"  {name:<36} {_time_ms(case, repeats):8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--restaurants", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    run(args.restaurants, args.repeats)
+
+if __name__ == "__main__":
+    main()
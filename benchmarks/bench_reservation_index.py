@@ -0,0 +1,78 @@
+# benchmarks/bench_reservation_index.py
+"""Time-range and customer lookups over reservations: secondary index versus a full scan.
+
+Run with `python -m benchmarks.bench_reservation_index`. For each reservation count it
+generates seeded bookings spread over restaurants, days and customers, builds a
+ReservationIndex, and compares "one restaurant's bookings in a 3-hour window" and
+"one customer's bookings" against filtering the flat list `load_reservations()`
+returns. It also reports the build time and the cost of indexing one new booking.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from services.data_service import DataService
+from services.reservation_index import ReservationIndex, customer_key
+
+def _reservations(count, restaurants, days, customers, rng):
+    start = date(2030, 1, 1)
+    return [{
+        "reservation_id": f"{i:012x}",
+        "restaurant_name": f"Restaurant {DataService._letters(rng.randrange(restaurants))}",
+        "date_time": f"{start + timedelta(days=rng.randrange(days))} {rng.randrange(11, 23):02d}:{rng.choice((0, 30)):02d}",
+        "party_size": rng.choice((2, 4, 6)),
+        "customer": f"customer{rng.randrange(customers)}@example.com",
+    } for i in range(count)]
+
+def _median_us(func, args):
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        func(*arg)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+def run(counts, restaurants, days, customers, lookups, seed):
+    print(f"{restaurants} restaurants x {days} days, {customers} customers; median us per lookup over {lookups}")
+    print(f"  {'bookings':>9} {'build s':>8} {'range idx':>10} {'range scan':>11} {'cust idx':>9} {'cust scan':>10} {'add us':>7}")
+    for count in counts:
+        rng = random.Random(seed)
+        reservations = _reservations(count, restaurants, days, customers, rng)
+        start = time.perf_counter()
+        index = ReservationIndex.from_reservations(reservations)
+        build = time.perf_counter() - start
+
+        windows = []
+        for _ in range(lookups):
+            sample = rng.choice(reservations)
+            hour = int(sample["date_time"][11:13])
+            windows.append((sample["restaurant_name"], f"{sample['date_time'][:10]} {hour:02d}:00",
+                            f"{sample['date_time'][:10]} {min(hour + 3, 23):02d}:59"))
+        range_idx = _median_us(index.reservations_between, windows)
+        range_scan = _median_us(lambda name, lo, hi: [r for r in reservations if r["restaurant_name"] == name
+                                                      and lo <= r["date_time"] < hi], windows[:max(1, lookups // 10)])
+        people = [(rng.choice(reservations)["customer"],) for _ in range(lookups)]
+        cust_idx = _median_us(index.by_customer, people)
+        cust_scan = _median_us(lambda customer: [r for r in reservations if customer_key(r["customer"]) == customer_key(customer)],
+                               people[:max(1, lookups // 10)])
+        added = _reservations(lookups, restaurants, days, customers, rng)
+        for i, reservation in enumerate(added):
+            reservation["reservation_id"] = f"new{i}"
+        add_us = _median_us(index.add, [(r,) for r in added])
+        print(f"  {count:>9} {build:>8.2f} {range_idx:>10.1f} {range_scan:>11.0f} {cust_idx:>9.1f} {cust_scan:>10.0f} {add_us:>7.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--restaurants", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.counts, args.restaurants, args.days, args.customers, args.lookups, args.seed)
+
+if __name__ == "__main__":
+    main()
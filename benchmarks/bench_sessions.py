@@ -0,0 +1,81 @@
+# benchmarks/bench_sessions.py
+"""Memory and throughput of conversation state for many concurrent sessions.
+
+Run with `python -m benchmarks.bench_sessions`. Simulates 10k chat sessions of 60
+turns each and compares the agent's old per-instance unbounded history (a list of
+message dicts) with InMemorySessionStore's ring buffer plus summary, then times
+get/append/save round trips on SqliteSessionStore.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from agents.session_store import InMemorySessionStore, SqliteSessionStore
+
+def _turns(session, turns):
+    for turn in range(turns):
+        if turn % 2 == 0:
+            yield "user", f"session {session}: book a table at Restaurant {turn % 20} for {turn % 6 + 1} people"
+        else:
+            yield "assistant", f"Reservation successful for session {session}, turn {turn}. Anything else?"
+
+def _measure(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    state = build()
+    elapsed = time.perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return state, current, elapsed
+
+def run(sessions, turns, history_size):
+    def unbounded():
+        state = {}
+        for session in range(sessions):
+            history = [{"role": role, "content": content} for role, content in _turns(session, turns)]
+            state[session] = {"conversation_history": history, "current_context": None, "pending_reservation": None}
+        return state
+
+    def ring_buffer():
+        store = InMemorySessionStore(history_size=history_size, max_sessions=sessions)
+        for session in range(sessions):
+            state = store.get(str(session))
+            for role, content in _turns(session, turns):
+                store.append(state, role, content)
+            store.save(state)
+        return store
+
+    print(f"{sessions} sessions x {turns} turns (ring buffer keeps {history_size})")
+    for name, build in (("unbounded list of dicts", unbounded), ("InMemorySessionStore", ring_buffer)):
+        _, current, elapsed = _measure(build)
+        print(f"  {name:<26} {current / 2**20:8.1f} MB  {current / sessions:8.0f} B/session  built in {elapsed:.2f}s")
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmp_dir, "sessions.db")
+        store = SqliteSessionStore(path, history_size=history_size, max_sessions=sessions)
+        start = time.perf_counter()
+        for session in range(sessions):
+            state = store.get(str(session))
+            for role, content in _turns(session, 2):
+                store.append(state, role, content)
+            store.save(state)
+        elapsed = time.perf_counter() - start
+        print(f"  SqliteSessionStore: {sessions / elapsed:,.0f} get+save round trips/s, "
+              f"{os.path.getsize(path) / 2**20:.1f} MB on disk")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--history-size", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sessions, args.turns, args.history_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+"""Import time and cold-start latency of the agents and tools packages.
+
+Run with `python -m benchmarks.bench_startup`. Each measurement runs in a fresh
+interpreter; the time of a bare `python -c pass` is subtracted, so the numbers are
+what our modules add. Exits non-zero if importing the tools goes over --budget-ms.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("import agents.tool_registry", "import agents.tool_registry"),
+    ("import agents.core_agent + local_llm", "import agents.core_agent, local_llm"),
+    # First request on a fresh process: builds the DataService, catalog and matcher
+    ("cold detect_intent", """
+import os, shutil, tempfile
+from services.data_service import DataService
+from agents.tool_registry import detect_intent
+tmp = tempfile.mkdtemp()
+try:
+    data_service = DataService(os.path.join(tmp, "restaurants.json"), os.path.join(tmp, "reservations.json"))
+    detect_intent("book a table at restaurant a for 2 people at 2030-01-01 18:00", data_service)
+finally:
+    shutil.rmtree(tmp)
+"""),
+    ("cold recommend_restaurant (loads NumPy)", """
+import os, shutil, tempfile
+from services.data_service import DataService
+from tools.recommendation_tools import recommend_restaurant
+tmp = tempfile.mkdtemp()
+try:
+    data_service = DataService(os.path.join(tmp, "restaurants.json"), os.path.join(tmp, "reservations.json"))
+    recommend_restaurant({"cuisine": "Italian", "party_size": "4", "date_time": "2030-01-01 18:00"}, data_service)
+finally:
+    shutil.rmtree(tmp)
+"""),
+]
+
+def _run_ms(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+def run(repeats, budget_ms):
+    baseline = statistics.median(_run_ms("pass") for _ in range(repeats))
+    print(f"interpreter startup: {baseline:.1f} ms (subtracted below)")
+    results = {}
+    for name, code in CASES:
+        results[name] = statistics.median(_run_ms(code) for _ in range(repeats)) - baseline
+        print(f"  {name:<42} {results[name]:8.1f} ms")
+    imports = results[CASES[0][0]]
+    within = imports <= budget_ms
+    print(f"{'OK' if within else 'OVER BUDGET'}: importing the tools takes {imports:.1f} ms (budget {budget_ms:.0f} ms)")
+    return within
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=75.0, help="allowed import time for agents.tool_registry")
+    args = parser.parse_args()
+    raise SystemExit(0 if run(args.repeats, args.budget_ms) else 1)
+
+if __name__ == "__main__":
+    main()
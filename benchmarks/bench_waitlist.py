@@ -0,0 +1,129 @@
+# benchmarks/bench_waitlist.py
+"""Booking, cancellation and waitlist promotion under heavy cancellation churn.
+
+Run with `python -m benchmarks.bench_waitlist`. A seeded stream of requests hits a
+small catalog with few slots, so most of them find the slot full and join its
+waitlist; a `--cancel-rate` share of the events cancel a random live booking, whose
+freed seats are promoted to waitlisted parties. It reports throughput, p50/p99
+latency per event type, how many parties were promoted, and checks that every
+slot's seats plus its live bookings still add up to its capacity.
+
+A second table times `Waitlist.pop` against a scan of a plain request-ordered list
+as the number of parties waiting for one slot grows.
+"""
+
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from collections import Counter
+from benchmarks.suite import build_dataset, _percentile
+from services.waitlist import Waitlist
+
+def _churn(backend, restaurants, slots_per_day, events, cancel_rate, seed):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        data_service, catalog, _ = build_dataset(tmp_dir, restaurants, slots_per_day, 1, 0, seed, backend)
+        rng = random.Random(seed)
+        live = []  # Reservation IDs, for picking a random one to cancel
+        samples = {"book": [], "waitlist": [], "cancel": []}
+        promoted = 0
+        start = time.perf_counter()
+        for _ in range(events):
+            if live and rng.random() < cancel_rate:
+                i = rng.randrange(len(live))
+                live[i], live[-1] = live[-1], live[i]
+                began = time.perf_counter()
+                _, newly_booked = data_service.cancel_reservation(live.pop())
+                samples["cancel"].append(time.perf_counter() - began)
+                live.extend(r["reservation_id"] for r in newly_booked)
+                promoted += len(newly_booked)
+                continue
+            restaurant = rng.choice(catalog)
+            reservation = {"restaurant_name": restaurant["name"],
+                           "date_time": rng.choice(list(restaurant["available_slots"])),
+                           "party_size": rng.choice((2, 2, 4, 6, 8))}
+            began = time.perf_counter()
+            if data_service.book_reservation(reservation):
+                samples["book"].append(time.perf_counter() - began)
+                live.append(reservation["reservation_id"])
+            else:
+                data_service.join_waitlist(reservation)
+                samples["waitlist"].append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - start
+
+        booked = Counter()
+        for reservation in data_service.iter_reservations():
+            booked[reservation["restaurant_name"], reservation["date_time"]] += reservation["party_size"]
+        mismatched = sum(
+            1 for restaurant in data_service.load_restaurants() for date_time, seats in restaurant["available_slots"].items()
+            if seats + booked[restaurant["name"], date_time] != restaurant["seating_capacity"]
+        )
+        return elapsed, samples, promoted, len(data_service.get_waitlist()), mismatched
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def _pop_us(waiting, pops, seed):
+    """Median microseconds to pop the earliest party that fits, heap-backed versus list scan.
+
+    Most waiting parties are large, so a few freed seats fit only the odd small party
+    and the scan has to walk past the large ones at the front.
+    """
+    rng = random.Random(seed)
+    requests = [{"restaurant_name": "R", "date_time": "S",
+                 "party_size": rng.choice((2, 4)) if rng.random() < 0.05 else rng.choice((8, 10, 12))}
+                for _ in range(waiting)]
+    waitlist = Waitlist()
+    for t, reservation in enumerate(requests):
+        waitlist.join(reservation, requested_at=t)
+    queue = list(requests)
+    heap_samples, scan_samples = [], []
+    for _ in range(pops):
+        seats = rng.choice((2, 4, 6))
+        began = time.perf_counter()
+        entry = waitlist.pop("R", "S", seats)
+        heap_samples.append(time.perf_counter() - began)
+        began = time.perf_counter()
+        i = next((i for i, r in enumerate(queue) if r["party_size"] <= seats), None)
+        if i is not None:
+            del queue[i]
+        scan_samples.append(time.perf_counter() - began)
+        # Keep the length steady: the popped party rejoins at the back
+        if entry is not None:
+            waitlist.join(entry.reservation, requested_at=waiting + len(heap_samples))
+            queue.append(entry.reservation)
+    return statistics.median(heap_samples) * 1e6, statistics.median(scan_samples) * 1e6
+
+def run(backend, restaurants, slots_per_day, events, cancel_rate, waiting_sizes, seed):
+    elapsed, samples, promoted, still_waiting, mismatched = _churn(
+        backend, restaurants, slots_per_day, events, cancel_rate, seed)
+    print(f"{backend}: {events} events over {restaurants} restaurants x {slots_per_day} slots, "
+          f"{cancel_rate:.0%} cancellations: {events / elapsed:,.0f} events/s")
+    print(f"  {'event':<9} {'count':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for kind, times in samples.items():
+        if times:
+            print(f"  {kind:<9} {len(times):>7} {_percentile(times, 50) * 1000:>8.2f} {_percentile(times, 99) * 1000:>8.2f}")
+    print(f"  promoted from waitlist: {promoted}, still waiting: {still_waiting}, inconsistent slots: {mismatched}")
+    print()
+    print("pop the earliest party that fits, median us")
+    print(f"  {'waiting':>8} {'heap':>8} {'list scan':>10}")
+    for waiting in waiting_sizes:
+        heap_us, scan_us = _pop_us(waiting, 200, seed)
+        print(f"  {waiting:>8} {heap_us:>8.1f} {scan_us:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=["json", "sqlite", "partitioned"], default="partitioned")
+    parser.add_argument("--restaurants", type=int, default=20)
+    parser.add_argument("--slots-per-day", type=int, default=2)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--cancel-rate", type=float, default=0.4)
+    parser.add_argument("--waiting", type=int, nargs="+", default=[100, 1000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.backend, args.restaurants, args.slots_per_day, args.events, args.cancel_rate, args.waiting, args.seed)
+
+if __name__ == "__main__":
+    main()
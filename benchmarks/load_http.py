@@ -0,0 +1,190 @@
+# benchmarks/load_http.py
+"""Load generator for the HTTP API in server.py: requests/sec and tail latency.
+
+Run with `python -m benchmarks.load_http --spawn` to build a seeded synthetic
+dataset in a temporary directory, start `server.py --workers W` over it and drive it;
+or point `--url` at a server that is already running. Each of `--concurrency`
+asyncio clients keeps one HTTP/1.1 connection open and sends requests drawn from
+`--mix` until `--duration` seconds have passed. Reports overall requests/sec and
+p50/p95/p99 latency per endpoint.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+from benchmarks.suite import _percentile, build_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = {"intent": "/intent", "query": "/query", "recommend": "/recommendations", "reserve": "/reservations"}
+
+def make_requests(catalog, rng):
+    """Return {endpoint name: callable() -> JSON body} drawing from the catalog."""
+    cuisines = sorted({r["cuisine"] for r in catalog})
+
+    def pick():
+        restaurant = rng.choice(catalog)
+        return restaurant, rng.choice(list(restaurant["available_slots"]))
+
+    def intent():
+        restaurant, slot = pick()
+        return {"message": rng.choice([
+            f"book a table at {restaurant['name']} for 2 people at {slot}",
+            f"recommend a restaurant with {restaurant['cuisine']} cuisine for 4 people",
+            f"tell me the details of {restaurant['name'].lower()}",
+        ])}
+
+    def recommend():
+        _, slot = pick()
+        # Few distinct bodies, so concurrent identical reads are common, as in real traffic
+        return {"cuisine": rng.choice(cuisines), "party_size": "4", "date_time": slot}
+
+    def reserve():
+        restaurant, slot = pick()
+        return {"restaurant_name": restaurant["name"], "date_time": slot, "party_size": "2"}
+
+    return {
+        "intent": intent,
+        "query": lambda: {"restaurant_name": pick()[0]["name"]},
+        "recommend": recommend,
+        "reserve": reserve,
+    }
+
+def parse_mix(mix):
+    """'intent=4,query=3' -> ([names], [weights])."""
+    weights = dict(item.split("=") for item in mix.split(","))
+    unknown = set(weights) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {', '.join(sorted(unknown))}")
+    return list(weights), [float(w) for w in weights.values()]
+
+async def _request(reader, writer, host, path, body):
+    data = json.dumps(body).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+async def _client(host, port, deadline, requests, names, weights, rng, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            body = requests[name]()
+            start = time.perf_counter()
+            status = await _request(reader, writer, host, ENDPOINTS[name], body)
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors[name] = errors.get(name, 0) + 1
+    finally:
+        writer.close()
+
+async def _drive(host, port, concurrency, duration, requests, names, weights, seed):
+    latencies = {name: [] for name in names}
+    errors = {}
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, deadline, requests, names, weights, random.Random(seed + i), latencies, errors)
+                           for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_until_listening(host, port, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("server.py exited during startup")
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise SystemExit("server.py did not start listening in time")
+
+def run(url, spawn, workers, threads, restaurants, slots_per_day, days, concurrency, duration, mix, seed):
+    rng = random.Random(seed)
+    names, weights = parse_mix(mix)
+    tmp_dir = tempfile.mkdtemp(prefix="foodiespot-load-")
+    process = None
+    try:
+        _, catalog, reservations = build_dataset(tmp_dir, restaurants, slots_per_day, days, 1.0, seed, "json")
+        if spawn:
+            host, port = "127.0.0.1", _free_port()
+            process = subprocess.Popen(
+                [sys.executable, os.path.join(ROOT, "server.py"), "--host", host, "--port", str(port),
+                 "--workers", str(workers), "--threads", str(threads), "--data-dir", tmp_dir],
+                cwd=ROOT, stdout=subprocess.DEVNULL)
+            _wait_until_listening(host, port, process)
+            print(f"server.py: {workers} worker(s) x {threads} threads over {restaurants} restaurants, "
+                  f"{reservations} reservations")
+        else:
+            # The dataset only seeds request bodies; names match the generator's catalog
+            parts = urlsplit(url)
+            host, port = parts.hostname, parts.port or 80
+        latencies, errors, elapsed = asyncio.run(
+            _drive(host, port, concurrency, duration, make_requests(catalog, rng), names, weights, seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    total = sum(len(samples) for samples in latencies.values())
+    print(f"{concurrency} connections for {elapsed:.1f}s: {total} requests, {total / elapsed:.0f} req/s")
+    print(f"  {'endpoint':<10} {'count':>7} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    results = {"requests_per_second": total / elapsed, "concurrency": concurrency, "workers": workers, "endpoints": {}}
+    for name in names:
+        samples = latencies[name]
+        if not samples:
+            continue
+        stats = {"count": len(samples), "errors": errors.get(name, 0),
+                 "p50": _percentile(samples, 50), "p95": _percentile(samples, 95), "p99": _percentile(samples, 99)}
+        results["endpoints"][name] = stats
+        print(f"  {name:<10} {stats['count']:>7} {stats['errors']:>7} {stats['p50']:>8.2f} {stats['p95']:>8.2f} {stats['p99']:>8.2f}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base URL of a running server, e.g. http://127.0.0.1:8080")
+    target.add_argument("--spawn", action="store_true", help="start server.py over a synthetic dataset")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--restaurants", type=int, default=1000)
+    parser.add_argument("--slots-per-day", type=int, default=4)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default="intent=4,query=3,recommend=2,reserve=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+    results = run(args.url, args.spawn, args.workers, args.threads, args.restaurants, args.slots_per_day,
+                  args.days, args.concurrency, args.duration, args.mix, args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# benchmarks/replay.py
+"""Replay a transcript of user messages against a copy of the data to measure capacity.
+
+Run with `python -m benchmarks.replay messages.txt`. The transcript holds one user
+message per line, or, for a `.jsonl` file, one {"message": ..., "session": ...}
+record per line. The data directory (by default the configured one) is copied to a
+temporary directory first, so a replay never touches live data.
+
+Each of `--processes` worker processes opens its own DataService on the copy and
+takes every Nth message. A message goes through `detect_intent` and the matching
+TOOLS function, dispatched through the tool registry as app.py does. With `--agent`
+it is also sent to `FoodieSpotAgent.process_message`, answered by the rule-based
+stand-in model, and timed under the "agent" row.
+
+By default the replay is closed-loop: each worker sends its next message as soon as
+the previous one is answered, which finds peak throughput. With `--rate R` it is
+open-loop: message i is due at start + i/R regardless of how earlier ones went, and
+its latency counts from when it was due, so time spent queued behind slow requests
+shows up instead of being hidden by a slower send rate.
+
+The report gives throughput, p50/p95/p99 latency per intent and counts of messages
+with no intent, invalid parameters or errors. It ends with a consistency check: for
+every slot, the seats taken during the replay must equal the party sizes of the
+reservations booked, less those cancelled, and no slot may give out more seats than
+it had. The exit status is 1 if the check fails.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter, defaultdict
+from config import RESTAURANTS_FILE, STORAGE_BACKEND
+from benchmarks.suite import _percentile
+from services.data_service import DataService
+
+OUTCOMES = ["ok", "no_intent", "invalid", "error"]
+
+def read_transcript(path):
+    """Yield (message, session id) for each non-blank entry of the transcript."""
+    jsonl = path.endswith(".jsonl")
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if jsonl:
+                record = json.loads(line)
+                yield record["message"], str(record.get("session", "default"))
+            else:
+                yield line.strip(), "default"
+
+def _open(data_dir, backend):
+    return DataService(os.path.join(data_dir, "restaurants.json"), os.path.join(data_dir, "reservations.json"),
+                       backend=backend, sqlite_file=os.path.join(data_dir, "foodiespot.db"))
+
+def _handle(message, data_service, registry):
+    """Run one message down the intent -> tool path; returns (intent, outcome)."""
+    from agents.tool_registry import detect_intent
+    intent, params = detect_intent(message, data_service)
+    if intent is None:
+        return "none", "no_intent"
+    try:
+        registry.execute_tool(intent, params)
+    except ValueError:
+        return intent, "invalid"
+    except Exception:
+        return intent, "error"
+    return intent, "ok"
+
+def _worker(worker_id, processes, transcript, data_dir, backend, rate, agent_latency, limit, ready, go, start_at, results):
+    from agents.tool_registry import create_registry, get_matcher
+    data_service = _open(data_dir, backend)
+    registry = create_registry(data_service)
+    get_matcher(data_service)  # Compile the catalog before the clock starts, as the server does
+    agent = None
+    if agent_latency is not None:
+        from agents.core_agent import FoodieSpotAgent
+        from services.llm_backend import RuleBasedLLM
+        agent = FoodieSpotAgent(RuleBasedLLM(agent_latency, 0), data_service)
+    latencies = defaultdict(list)
+    outcomes = defaultdict(Counter)
+    late = 0
+    ready.put(worker_id)
+    go.wait()
+    start = start_at.value
+    for i, (message, session) in enumerate(read_transcript(transcript)):
+        if limit and i >= limit:
+            break
+        if i % processes != worker_id:
+            continue
+        if rate:
+            due = start + i / rate
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            else:
+                late += 1
+        else:
+            due = time.monotonic()
+        intent, outcome = _handle(message, data_service, registry)
+        latencies[intent].append(time.monotonic() - due)
+        outcomes[intent][outcome] += 1
+        if agent is not None:
+            sent = time.monotonic()
+            try:
+                agent.process_message(message, f"{worker_id}:{session}")
+                outcomes["agent"]["ok"] += 1
+            except Exception:
+                outcomes["agent"]["error"] += 1
+            latencies["agent"].append(time.monotonic() - sent)
+    data_service.close()
+    results.put((dict(latencies), {intent: dict(counts) for intent, counts in outcomes.items()}, late, time.monotonic()))
+
+def _reservation_key(reservation):
+    return reservation.get("reservation_id") or json.dumps(reservation, sort_keys=True)
+
+def snapshot(data_service):
+    """Capacities, seats per slot and the multiset of reservations, to check a replay against."""
+    capacities, seats = {}, {}
+    for restaurant in data_service.load_restaurants():
+        capacities[restaurant["name"]] = restaurant["seating_capacity"]
+        for date_time, available in restaurant["available_slots"].items():
+            seats[(restaurant["name"], date_time)] = available
+    reservations, slots = Counter(), {}
+    for reservation in data_service.iter_reservations():
+        key = _reservation_key(reservation)
+        reservations[key] += 1
+        slots[key] = ((reservation["restaurant_name"], reservation["date_time"]), int(reservation["party_size"]))
+    return capacities, seats, reservations, slots
+
+def check_consistency(before, after):
+    """Compare the seats each slot gave out between two snapshots with the reservations
+    booked and cancelled in between; returns (overbooked slots, mismatched slots).
+
+    Assumes the data was consistent to begin with.
+    """
+    capacities, seats_before, reservations_before, slots_before = before
+    _, seats_after, reservations_after, slots_after = after
+    booked = Counter()
+    for key, count in (reservations_after - reservations_before).items():
+        slot, party_size = slots_after[key]
+        booked[slot] += party_size * count
+    for key, count in (reservations_before - reservations_after).items():
+        slot, party_size = slots_before[key]
+        booked[slot] -= party_size * count
+    overbooked, mismatched = [], []
+    for slot in set(booked) | set(seats_before) | set(seats_after):
+        capacity = capacities.get(slot[0])
+        if capacity is None:
+            # Nothing can be booked at an unknown restaurant
+            if booked[slot]:
+                mismatched.append(slot)
+            continue
+        available = seats_before.get(slot, capacity)
+        taken = available - seats_after.get(slot, capacity)
+        if booked[slot] > available or seats_after.get(slot, capacity) < 0:
+            overbooked.append(slot)
+        if taken != booked[slot]:
+            mismatched.append(slot)
+    return sorted(overbooked), sorted(mismatched)
+
+def run(transcript, data_dir, backend, processes, rate, agent_latency, limit):
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        copy = os.path.join(tmp_dir, "data")
+        shutil.copytree(data_dir, copy, ignore=shutil.ignore_patterns(".locks", ".tmp-*", ".import-*"))
+        before = snapshot(_open(copy, backend))
+
+        ready, results = multiprocessing.Queue(), multiprocessing.Queue()
+        go, start_at = multiprocessing.Event(), multiprocessing.Value("d", 0.0)
+        workers = [
+            multiprocessing.Process(target=_worker, args=(i, processes, transcript, copy, backend, rate, agent_latency,
+                                                          limit, ready, go, start_at, results))
+            for i in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for _ in workers:
+            ready.get()
+        start_at.value = time.monotonic() + 0.05  # The clock starts once every worker is warmed up
+        go.set()
+        reports = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        elapsed = max(report[3] for report in reports) - start_at.value
+
+        latencies, outcomes, late = defaultdict(list), defaultdict(Counter), 0
+        for worker_latencies, worker_outcomes, worker_late, _ in reports:
+            for intent, samples in worker_latencies.items():
+                latencies[intent].extend(samples)
+            for intent, counts in worker_outcomes.items():
+                outcomes[intent].update(counts)
+            late += worker_late
+        messages = sum(len(samples) for intent, samples in latencies.items() if intent != "agent")
+
+        mode = f"open loop at {rate:g}/s" if rate else "closed loop"
+        print(f"{messages} messages from {transcript}, {processes} processes, {backend} backend, {mode}")
+        print(f"  {messages / elapsed:.0f} messages/sec over {elapsed:.2f}s"
+              + (f"; {late} sent late, behind schedule" if rate else ""))
+        print(f"  {'intent':<22} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              + " ".join(f"{outcome:>9}" for outcome in OUTCOMES))
+        for intent in sorted(latencies, key=lambda name: (name == "agent", name)):
+            samples = [s * 1000 for s in latencies[intent]]
+            print(f"  {intent:<22} {len(samples):>7} {_percentile(samples, 50):>8.2f} {_percentile(samples, 95):>8.2f} "
+                  f"{_percentile(samples, 99):>8.2f} " + " ".join(f"{outcomes[intent][outcome]:>9}" for outcome in OUTCOMES))
+
+        after = snapshot(_open(copy, backend))
+        overbooked, mismatched = check_consistency(before, after)
+        new = sum((after[2] - before[2]).values())
+        cancelled = sum((before[2] - after[2]).values())
+        print(f"  reservations: {new} booked, {cancelled} cancelled; "
+              f"overbooked slots: {len(overbooked)}, inventory mismatches: {len(mismatched)}")
+        for restaurant_name, date_time in (overbooked + mismatched)[:10]:
+            print(f"    {restaurant_name} at {date_time}")
+        return not overbooked and not mismatched
+    finally:
+        shutil.rmtree(tmp_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("transcript", help="one message per line, or .jsonl records with message and session")
+    parser.add_argument("--data-dir", default=os.path.dirname(RESTAURANTS_FILE), help="copied before the replay")
+    parser.add_argument("--backend", choices=["json", "sqlite", "partitioned"], default=STORAGE_BACKEND)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--rate", type=float, help="messages/sec for an open-loop replay (default: closed loop)")
+    parser.add_argument("--agent", action="store_true", help="also send every message to FoodieSpotAgent.process_message")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per stand-in model call with --agent")
+    parser.add_argument("--limit", type=int, help="replay only the first N messages")
+    args = parser.parse_args()
+    ok = run(args.transcript, args.data_dir, args.backend, args.processes, args.rate,
+             args.llm_latency if args.agent else None, args.limit)
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
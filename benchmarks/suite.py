@@ -0,0 +1,223 @@
+# benchmarks/suite.py
+"""End-to-end benchmark suite for the intent -> tool -> storage hot path.
+
+Run with `python -m benchmarks.suite`. For each catalog size it generates a seeded
+synthetic dataset (N restaurants, M slots per day, R existing reservations) in a
+temporary directory, then times detect_intent, make_reservation,
+recommend_restaurant and query_restaurant. It reports p50/p95/p99 latency, the
+tracemalloc peak per operation and the process RSS high-water mark, and writes
+everything to a JSON file.
+
+Save a run as a baseline and later check for regressions with
+`python -m benchmarks.suite --compare baseline.json`, which exits non-zero when
+any metric got slower or bigger than the tolerance allows. Everything runs
+offline with the standard library plus the repo's own dependencies.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from agents.tool_registry import detect_intent
+from services.data_service import DataService
+from tools.query_tools import query_restaurant
+from tools.recommendation_tools import recommend_restaurant
+from tools.reservation_tools import make_reservation
+
+SCALES = [20, 1_000, 10_000]
+OPERATIONS = ["detect_intent", "make_reservation", "recommend_restaurant", "query_restaurant"]
+# Operations that write to storage; each call persists the booking, so they get fewer iterations
+WRITE_OPERATIONS = {"make_reservation"}
+LATENCY_METRICS = ["p50_ms", "p95_ms", "p99_ms"]
+MEMORY_METRICS = ["peak_alloc_kb"]
+# p99 over a few hundred calls is mostly scheduler noise, so it is reported but not gated by default
+COMPARED_METRICS = ["p50_ms", "p95_ms", "peak_alloc_kb"]
+
+def build_dataset(tmp_dir, restaurants, slots_per_day, days, reservations_per_restaurant, seed, backend):
+    """Write a seeded synthetic dataset and return (data_service, restaurants, reservation count)."""
+    data_service = DataService(os.path.join(tmp_dir, "restaurants.json"),
+                               os.path.join(tmp_dir, "reservations.json"), backend=backend)
+    # Slots start a month out so every generated slot passes the "must be in the future" check
+    start_date = (date.today() + timedelta(days=30)).isoformat()
+    catalog = data_service._generate_restaurant_data(restaurants, slots_per_day, days, start_date, seed)
+    reservations = data_service._generate_reservation_data(
+        catalog, int(restaurants * reservations_per_restaurant), seed=seed)
+    data_service.storage.import_data(catalog, reservations)
+    return data_service, catalog, len(reservations)
+
+def make_workload(catalog, rng):
+    """Return {operation: callable(data_service)}; each call runs one randomly parameterized request."""
+    cuisines = sorted({r["cuisine"] for r in catalog})
+
+    def pick():
+        restaurant = rng.choice(catalog)
+        return restaurant, rng.choice(list(restaurant["available_slots"]))
+
+    def intent_message():
+        restaurant, slot = pick()
+        return rng.choice([
+            f"book a table at {restaurant['name']} for 2 people at {slot}",
+            f"recommend a restaurant with {restaurant['cuisine']} cuisine for 4 people",
+            f"tell me the details of {restaurant['name'].lower()}",
+            "hello there, what can you do?",
+        ])
+
+    def reservation():
+        restaurant, slot = pick()
+        return {"restaurant_name": restaurant["name"], "date_time": slot, "party_size": "2"}
+
+    def recommendation():
+        _, slot = pick()
+        return {"cuisine": rng.choice(cuisines), "party_size": str(rng.choice([2, 4, 6])), "date_time": slot}
+
+    return {
+        "detect_intent": lambda data_service: detect_intent(intent_message(), data_service),
+        "make_reservation": lambda data_service: make_reservation(reservation(), data_service),
+        "recommend_restaurant": lambda data_service: recommend_restaurant(recommendation(), data_service),
+        "query_restaurant": lambda data_service: query_restaurant({"restaurant_name": pick()[0]["name"]}, data_service),
+    }
+
+def _percentile(samples, q):
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1] if len(samples) > 1 else samples[0]
+
+def measure(operation, data_service, iterations, memory_iterations):
+    """Time `iterations` calls, then trace allocations over a few more."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        operation(data_service)
+        samples.append((time.perf_counter() - start) * 1000)
+    # Tracing slows every allocation down, so memory is measured in a separate pass
+    tracemalloc.start()
+    for _ in range(memory_iterations):
+        operation(data_service)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(samples, 50), 4),
+        "p95_ms": round(_percentile(samples, 95), 4),
+        "p99_ms": round(_percentile(samples, 99), 4),
+        "peak_alloc_kb": round(peak / 1024, 1),
+    }
+
+def run(scales, slots_per_day, days, reservations_per_restaurant, iterations, write_iterations,
+        memory_iterations, seed, backend):
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "backend": backend,
+            "seed": seed,
+            "slots_per_day": slots_per_day,
+            "days": days,
+            "reservations_per_restaurant": reservations_per_restaurant,
+            "iterations": iterations,
+            "write_iterations": write_iterations,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for scale in scales:
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            start = time.perf_counter()
+            data_service, catalog, reservations = build_dataset(
+                tmp_dir, scale, slots_per_day, days, reservations_per_restaurant, seed, backend)
+            setup_s = time.perf_counter() - start
+            workload = make_workload(catalog, random.Random(seed))
+            entry = {"restaurants": scale, "reservations": reservations, "setup_s": round(setup_s, 3), "operations": {}}
+            for name in OPERATIONS:
+                workload[name](data_service)  # Warm caches (matcher, availability engine)
+                count = write_iterations if name in WRITE_OPERATIONS else iterations
+                entry["operations"][name] = measure(workload[name], data_service, count, min(count, memory_iterations))
+            entry["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            report["results"][str(scale)] = entry
+            _print_scale(entry)
+        finally:
+            shutil.rmtree(tmp_dir)
+    return report
+
+def _print_scale(entry):
+    print(f"{entry['restaurants']} restaurants, {entry['reservations']} reservations "
+          f"(setup {entry['setup_s']:.2f}s, max RSS {entry['max_rss_kb'] / 1024:.1f} MB)")
+    print(f"  {'operation':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'peak KB':>10}")
+    for name, stats in entry["operations"].items():
+        print(f"  {name:<22} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} {stats['peak_alloc_kb']:10.1f}")
+
+def compare(baseline, current, tolerance, floor_ms, metrics=COMPARED_METRICS):
+    """Return a list of regression messages for metrics that grew beyond `tolerance`.
+
+    Latency changes smaller than `floor_ms` are ignored as timer noise. Scales or
+    operations missing from either report are skipped.
+    """
+    regressions = []
+    for scale, entry in current["results"].items():
+        base_entry = baseline["results"].get(scale)
+        if base_entry is None:
+            continue
+        for name, stats in entry["operations"].items():
+            base_stats = base_entry["operations"].get(name)
+            if base_stats is None:
+                continue
+            for metric in metrics:
+                old, new = base_stats[metric], stats[metric]
+                noise = floor_ms if metric in LATENCY_METRICS else 0
+                if new > old * (1 + tolerance) and new - old > noise:
+                    change = (new / old - 1) * 100 if old else float("inf")
+                    regressions.append(f"{scale} restaurants, {name} {metric}: {old} -> {new} (+{change:.0f}%)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default=",".join(map(str, SCALES)),
+                        help="comma-separated restaurant counts")
+    parser.add_argument("--slots-per-day", type=int, default=8)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--reservations-per-restaurant", type=float, default=2.0)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--write-iterations", type=int, default=50, help="iterations for make_reservation")
+    parser.add_argument("--memory-iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON report")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a saved report")
+    parser.add_argument("--results", metavar="REPORT", help="compare this saved report instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative growth (default 25%%)")
+    parser.add_argument("--floor-ms", type=float, default=0.05, help="ignore latency changes below this")
+    parser.add_argument("--metrics", default=",".join(COMPARED_METRICS),
+                        help="comma-separated metrics to compare (any of %s)" % ", ".join(LATENCY_METRICS + MEMORY_METRICS))
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            report = json.load(f)
+    else:
+        scales = [int(scale) for scale in args.scales.split(",")]
+        report = run(scales, args.slots_per_day, args.days, args.reservations_per_restaurant,
+                     args.iterations, args.write_iterations, args.memory_iterations, args.seed, args.backend)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.tolerance, args.floor_ms, args.metrics.split(","))
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.compare}")
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,25 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RESTAURANTS_FILE = os.path.join(BASE_DIR, "data", "restaurants.json")
-RESERVATIONS_FILE = os.path.join(BASE_DIR, "data", "reservations.json")
\ No newline at end of file
+RESERVATIONS_FILE = os.path.join(BASE_DIR, "data", "reservations.json")
+SQLITE_FILE = os.path.join(BASE_DIR, "data", "foodiespot.db")
+
+# Storage backend for DataService: "json" (default), "sqlite" or "partitioned"
+STORAGE_BACKEND = os.environ.get("FOODIESPOT_STORAGE_BACKEND", "json")
+
+# "partitioned" backend: inventory files per date (restaurants are spread over them by name hash)
+INVENTORY_SHARDS_PER_DATE = int(os.environ.get("FOODIESPOT_INVENTORY_SHARDS_PER_DATE", "1"))
+
+# detect_intent result cache: maximum entries (0 disables it) and time-to-live in seconds
+INTENT_CACHE_SIZE = int(os.environ.get("FOODIESPOT_INTENT_CACHE_SIZE", "4096"))
+INTENT_CACHE_TTL = float(os.environ.get("FOODIESPOT_INTENT_CACHE_TTL", "300"))
+
+# Group commit: queue concurrent bookings and flush them in batches with one ledger fsync, at most
+# GROUP_COMMIT_MAX_BATCH at a time. A batch is flushed as soon as the writer is free (bookings arriving
+# during a flush form the next one) unless GROUP_COMMIT_MAX_WAIT_MS lets it wait longer to fill up
+GROUP_COMMIT = os.environ.get("FOODIESPOT_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_MAX_BATCH = int(os.environ.get("FOODIESPOT_GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.environ.get("FOODIESPOT_GROUP_COMMIT_MAX_WAIT_MS", "0"))
+
+# Fuzzy restaurant/cuisine matching: minimum trigram similarity (0-1) to accept a correction
+FUZZY_MATCH_THRESHOLD = float(os.environ.get("FOODIESPOT_FUZZY_THRESHOLD", "0.5"))
\ No newline at end of file
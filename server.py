@@ -0,0 +1,231 @@
+# server.py
+"""HTTP/JSON API for the reservation tools, built on asyncio and the standard library.
+
+Run with `python server.py --port 8080 [--workers 4] [--data-dir data]`.
+
+Endpoints (JSON bodies in and out):
+    POST /intent            {"message": ...}  -> {"intent": ..., "params": {...}}
+    POST /reservations      make_reservation params       -> {"message": ...}
+    POST /cancellations     {"reservation_id": ...}       -> {"message": ...}
+    POST /recommendations   recommend_restaurant params   -> {"message": ...}
+    POST /query             {"restaurant_name": ...}      -> {"message": ...}
+    GET  /health            -> {"status": "ok", ...}
+    GET  /metrics           Prometheus text: per-tool metrics and server counters
+
+Each worker process keeps one warm DataService and catalog matcher. Tools run on a
+thread pool because they do blocking file I/O, and identical concurrent read requests
+share a single execution. With --workers N, N processes accept on the same port
+(SO_REUSEPORT); the storage layer's file locks keep their bookings consistent. The
+waitlist is kept in memory, so a worker only promotes parties that it waitlisted.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+MAX_BODY = 1 << 20
+READ_TOOLS = {"/recommendations": "recommend_restaurant", "/query": "query_restaurant"}
+WRITE_TOOLS = {"/reservations": "make_reservation", "/cancellations": "cancel_reservation"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ReservationServer:
+    """Routes HTTP requests to the tool registry of one shared DataService."""
+
+    def __init__(self, data_service, threads=8):
+        from agents.tool_registry import create_registry, detect_intent, get_matcher
+        self.data_service = data_service
+        self.registry = create_registry(data_service)
+        self._detect_intent = detect_intent
+        get_matcher(data_service)  # Compile the catalog before the first request
+        data_service.get_reservation_index()  # And index the stored reservations
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="tools")
+        self._inflight = {}  # Coalescing key -> future of the running read
+        self.requests = 0
+        self.coalesced = 0
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                try:
+                    method, path, version, headers, body = await self._read_request(request_line, reader)
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                    status, payload, content_type = await self.dispatch(method, path, body)
+                except HttpError as e:
+                    status, payload, content_type = e.status, {"error": str(e)}, "application/json"
+                    keep_alive = e.status < 500 and e.status != HTTPStatus.BAD_REQUEST
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    status, payload, content_type = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": type(e).__name__}, "application/json"
+                    keep_alive = False
+                data = payload.encode() if isinstance(payload, str) else json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(request_line, reader):
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length.")
+        length = int(length)
+        if length > MAX_BODY:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], version, headers, body
+
+    async def dispatch(self, method, path, body):
+        """Return (HTTPStatus, payload, content type) for one request."""
+        self.requests += 1
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok", "pid": os.getpid(), "restaurants": len(self.data_service.load_restaurants())}, "application/json"
+        if method == "GET" and path == "/metrics":
+            return HTTPStatus.OK, self.metrics_text(), "text/plain; version=0.0.4"
+        if method != "POST" or (path != "/intent" and path not in READ_TOOLS and path not in WRITE_TOOLS):
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} {path}.")
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body must be JSON.")
+        if not isinstance(params, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+
+        if path == "/intent":
+            if not isinstance(params.get("message"), str):
+                raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, "'message' must be a string.")
+            intent, intent_params = await self._coalesce((path, params["message"]), self._detect_intent, params["message"], self.data_service)
+            return HTTPStatus.OK, {"intent": intent, "params": intent_params}, "application/json"
+        try:
+            if path in WRITE_TOOLS:
+                # Bookings are never coalesced: two identical requests are two bookings
+                message = await self._run(self.registry.execute_tool, WRITE_TOOLS[path], params)
+            else:
+                key = (path, json.dumps(params, sort_keys=True))
+                message = await self._coalesce(key, self.registry.execute_tool, READ_TOOLS[path], params)
+        except ValueError as e:
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+        return HTTPStatus.OK, {"message": message}, "application/json"
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _coalesce(self, key, func, *args):
+        """Run a read once for all identical requests that arrive while it is in flight."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(self._run(func, *args))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def metrics_text(self):
+        committer = self.data_service.get_group_committer()
+        return self.registry.metrics.to_prometheus() + (committer.to_prometheus() if committer else "") + (
+            "# HELP foodiespot_http_requests_total HTTP requests handled by this worker.\n"
+            "# TYPE foodiespot_http_requests_total counter\n"
+            f"foodiespot_http_requests_total {self.requests}\n"
+            "# HELP foodiespot_http_coalesced_total Read requests answered by an identical in-flight request.\n"
+            "# TYPE foodiespot_http_coalesced_total counter\n"
+            f"foodiespot_http_coalesced_total {self.coalesced}\n"
+        )
+
+
+def create_data_service(data_dir=None):
+    """The process's shared DataService, or one over `data_dir` if given."""
+    from services.data_service import DataService, get_data_service
+    if data_dir is None:
+        return get_data_service()
+    return DataService(os.path.join(data_dir, "restaurants.json"), os.path.join(data_dir, "reservations.json"))
+
+
+async def serve(host, port, data_dir=None, threads=8, reuse_port=False, ready=None):
+    """Run one worker until SIGTERM/SIGINT; `ready(server)` is called once it is listening."""
+    app = ReservationServer(create_data_service(data_dir), threads)
+    server = await asyncio.start_server(app.handle_connection, host, port, reuse_port=reuse_port, backlog=1024)
+    loop = asyncio.get_running_loop()
+    stop = loop.create_future()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+    print(f"worker {os.getpid()} listening on http://{host}:{port}", flush=True)
+    if ready is not None:
+        ready(server)
+    async with server:
+        await stop
+    app.executor.shutdown(wait=False)
+    app.data_service.close()  # Commit bookings still queued for a group commit
+
+
+def _worker(host, port, data_dir, threads):
+    asyncio.run(serve(host, port, data_dir, threads, reuse_port=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1, help="processes sharing the port (SO_REUSEPORT)")
+    parser.add_argument("--threads", type=int, default=8, help="tool threads per worker")
+    parser.add_argument("--data-dir", help="directory with restaurants.json (default: config paths)")
+    args = parser.parse_args()
+    if args.workers == 1:
+        asyncio.run(serve(args.host, args.port, args.data_dir, args.threads))
+        return
+    workers = [multiprocessing.Process(target=_worker, args=(args.host, args.port, args.data_dir, args.threads))
+               for _ in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    # Turn SIGTERM into SystemExit so the workers are stopped rather than orphaned
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# services/availability_engine.py
+
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+
+class AvailabilityEngine:
+    """Remaining seats for every (restaurant, slot) pair held as a NumPy matrix.
+
+    Rows are restaurants in catalog order and columns are slot keys in chronological
+    order, so questions like "Italian places with 4 seats at 19:00" become one
+    vectorized expression instead of a loop over restaurant dicts. Slots a restaurant
+    has never listed count as fully available, matching
+    `available_slots.get(date_time, seating_capacity)`.
+    """
+
+    def __init__(self, names, cuisines, locations, capacity, slot_keys, remaining,
+                 restaurants=None, inventory_generation=None):
+        self.names = list(names)
+        self.restaurants = restaurants  # Original dicts, when built from a catalog
+        self.row_of = {name: row for row, name in enumerate(self.names)}
+        self.cuisine_codes, self.cuisine_of = self._encode(cuisines)
+        self.location_codes, self.location_of = self._encode(locations)
+        self.capacity = np.asarray(capacity, dtype=np.int32)
+        self.slot_keys = list(slot_keys)  # Sorted; "YYYY-MM-DD HH:MM" sorts chronologically
+        self.column_of = {key: col for col, key in enumerate(self.slot_keys)}
+        # Column-major, so one slot (or a run of adjacent slots) is a contiguous block
+        self.remaining = np.asfortranarray(np.asarray(remaining, dtype=np.int32).reshape(len(self.names), len(self.slot_keys)))
+        self.inventory_generation = inventory_generation
+
+    @classmethod
+    def from_restaurants(cls, restaurants, inventory_generation=None):
+        """Build the engine from `restaurants.json`-shaped dicts."""
+        slot_keys = sorted({key for r in restaurants for key in r["available_slots"]})
+        column_of = {key: col for col, key in enumerate(slot_keys)}
+        capacity = np.fromiter((r["seating_capacity"] for r in restaurants), dtype=np.int32, count=len(restaurants))
+        remaining = np.repeat(capacity[:, None], len(slot_keys), axis=1)
+        for row, restaurant in enumerate(restaurants):
+            for key, seats in restaurant["available_slots"].items():
+                remaining[row, column_of[key]] = seats
+        return cls(
+            [r["name"] for r in restaurants],
+            [r["cuisine"] for r in restaurants],
+            [r["location"] for r in restaurants],
+            capacity, slot_keys, remaining, restaurants, inventory_generation
+        )
+
+    @staticmethod
+    def _encode(values):
+        """Intern strings as small integer codes; lookups are case-insensitive."""
+        code_of = {}
+        codes = np.fromiter((code_of.setdefault(v.lower(), len(code_of)) for v in values), dtype=np.int16, count=len(values))
+        return codes, code_of
+
+    def mask(self, cuisine=None, location=None):
+        """Boolean row mask for the cuisine and/or location filters."""
+        mask = np.ones(len(self.names), dtype=bool)
+        for value, code_of, codes in ((cuisine, self.cuisine_of, self.cuisine_codes),
+                                      (location, self.location_of, self.location_codes)):
+            if value is not None:
+                code = code_of.get(value.lower())
+                if code is None:
+                    return np.zeros(len(self.names), dtype=bool)
+                mask &= codes == code
+        return mask
+
+    def seats_at(self, date_time):
+        """Remaining seats per restaurant at one slot."""
+        col = self.column_of.get(date_time)
+        return self.capacity if col is None else self.remaining[:, col]
+
+    def restaurants_with_seats(self, party_size, date_time, cuisine=None, location=None):
+        """Row indices of restaurants that can seat `party_size` at `date_time`."""
+        return np.flatnonzero(self.mask(cuisine, location) & (self.seats_at(date_time) >= party_size))
+
+    def slot_range(self, start, end):
+        """Column slice covering known slots with start <= key <= end."""
+        return slice(bisect_left(self.slot_keys, start), bisect_right(self.slot_keys, end))
+
+    def slots_with_seats(self, party_size, start, end, cuisine=None, location=None):
+        """(rows, columns) of every known slot in [start, end] that can seat `party_size`.
+
+        Columns index `slot_keys`; keys are not materialized since results can be large.
+        """
+        columns = self.slot_range(start, end)
+        hits = (self.remaining[:, columns] >= party_size) & self.mask(cuisine, location)[:, None]
+        rows, cols = np.nonzero(hits)
+        return rows, cols + columns.start
+
+    def apply(self, restaurant_name, date_time, seats):
+        """Record the new remaining seat count for one slot after a booking."""
+        row = self.row_of.get(restaurant_name)
+        if row is None:
+            return
+        col = self.column_of.get(date_time)
+        if col is None:
+            col = self._add_slot(date_time)
+        self.remaining[row, col] = seats
+
+    def _add_slot(self, date_time):
+        """Insert a new slot column (at full capacity) in chronological position."""
+        col = bisect_left(self.slot_keys, date_time)
+        self.slot_keys.insert(col, date_time)
+        self.column_of = {key: index for index, key in enumerate(self.slot_keys)}
+        self.remaining = np.asfortranarray(np.insert(self.remaining, col, self.capacity, axis=1))
+        return col
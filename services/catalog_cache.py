@@ -0,0 +1,70 @@
+# services/catalog_cache.py
+
+import os
+from services.locking import atomic_write_json
+
+
+class CatalogCache:
+    """Keeps the parsed restaurant catalog in memory and reloads it only when the file changes."""
+
+    def __init__(self, path):
+        self.path = path
+        self.generation = 0  # Bumped when names, locations, cuisines or capacities change
+        self.inventory_generation = 0  # Bumped on every reload or write, including bookings
+        self._static_key = None
+        self._restaurants = None
+        self._by_name = {}
+        self._signature = None
+
+    @staticmethod
+    def _stat_signature(path):
+        """Return a (mtime, size, inode) tuple identifying the current file version."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def is_stale(self):
+        """Check whether the file on disk differs from the cached copy."""
+        return self._restaurants is None or self._stat_signature(self.path) != self._signature
+
+    def get(self, loader):
+        """Return the cached catalog, calling `loader()` to re-parse it if the file changed."""
+        if self.is_stale():
+            signature = self._stat_signature(self.path)
+            self._set(loader())
+            # Take the signature before loading so a concurrent write is picked up next time
+            self._signature = signature if signature is not None else self._stat_signature(self.path)
+        return self._restaurants
+
+    def find(self, restaurant_name, loader):
+        """Look up a restaurant dict by exact name."""
+        self.get(loader)
+        return self._by_name.get(restaurant_name)
+
+    def _set(self, restaurants):
+        self._restaurants = restaurants
+        self._by_name = {r["name"]: r for r in restaurants}
+        self.inventory_generation += 1
+        # A reload caused by another process's booking leaves the static catalog unchanged
+        static_key = hash(tuple((r["name"], r["location"], r["cuisine"], r["seating_capacity"]) for r in restaurants))
+        if static_key != self._static_key:
+            self._static_key = static_key
+            self.generation += 1
+
+    def write(self, restaurants):
+        """Persist the catalog atomically and adopt it as the cached copy without re-reading the file."""
+        atomic_write_json(self.path, restaurants)
+        if restaurants is not self._restaurants:
+            self._set(restaurants)
+        else:
+            # In-place edits through the cache only touch availability
+            self.inventory_generation += 1
+        self._signature = self._stat_signature(self.path)
+
+    def invalidate(self):
+        """Drop the cached copy so the next access re-reads the file."""
+        self._restaurants = None
+        self._by_name = {}
+        self._signature = None
@@ -0,0 +1,228 @@
+# services/catalog_feed.py
+"""Import or export the restaurant catalog as a streamed CSV or JSON-lines feed.
+
+Usage:
+    python -m services.catalog_feed import FEED [--format csv|jsonl] [--errors PATH] [--chunk-size N]
+    python -m services.catalog_feed export FEED [--format csv|jsonl]
+
+An import replaces the catalog and keeps reservations. Rows are parsed and validated
+`chunk_size` at a time and handed straight to the storage backend, so memory stays flat
+however long the feed is; the only state that grows is the set of names seen, kept to
+reject duplicates. Rows that fail validation are skipped and written, one JSON line each,
+to the errors file (FEED.errors.jsonl by default).
+
+CSV feeds have the columns name, location, cuisine, seating_capacity and available_slots,
+the last as "YYYY-MM-DD HH:MM=seats" entries separated by ";". A slot without "=seats"
+starts with the full seating capacity. JSON-lines feeds hold one restaurants.json entry
+per line. In either format, a row that lists the same slot twice, however the keys are
+written, is rejected.
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import time
+from config import RESTAURANTS_FILE, RESERVATIONS_FILE, SQLITE_FILE
+from services.data_service import DataService
+from services.datetime_parser import canonical_slot
+from services.locking import atomic_write_stream
+from services.validation_service import ValidationService
+
+FORMATS = ["csv", "jsonl"]
+CSV_FIELDS = ["name", "location", "cuisine", "seating_capacity", "available_slots"]
+MAX_ERROR_SAMPLES = 20
+
+
+def feed_format(path, format=None):
+    """The feed format: `format` if given, else guessed from the file extension."""
+    if format is None:
+        format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    if format not in FORMATS:
+        raise ValueError(f"Unknown feed format: {format!r}")
+    return format
+
+
+def _int_or_raw(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _from_csv_row(row):
+    """A restaurants.json-shaped dict from one CSV row; values that do not parse are left for validation."""
+    capacity = _int_or_raw((row.get("seating_capacity") or "").strip())
+    slots = {}
+    for entry in (row.get("available_slots") or "").split(";"):
+        date_time, _, seats = entry.partition("=")
+        if date_time.strip():
+            slots[date_time.strip()] = _int_or_raw(seats.strip()) if seats.strip() else capacity
+    return {"name": row.get("name"), "location": row.get("location"), "cuisine": row.get("cuisine"),
+            "seating_capacity": capacity, "available_slots": slots}
+
+
+def read_feed(path, format=None):
+    """Yield (line number, restaurant dict or None, problem) for each row of the feed."""
+    if feed_format(path, format) == "csv":
+        with open(path, 'r', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, _from_csv_row(row), None
+        return
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, f"invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "expected a JSON object"
+                continue
+            yield line_number, record, None
+
+
+def _duplicate_slots(restaurant):
+    """Canonical slot keys that more than one of the row's slot keys stand for (e.g. "19:00" and "1900")."""
+    seen, duplicates = set(), []
+    for date_time in restaurant.get("available_slots", {}):
+        key = canonical_slot(date_time)
+        if key in seen and key not in duplicates:
+            duplicates.append(key)
+        seen.add(key)
+    return duplicates
+
+
+def _normalize(restaurant):
+    """The entry as stored: trimmed strings and canonical slot keys."""
+    return {
+        "name": restaurant["name"].strip(),
+        "location": restaurant["location"].strip(),
+        "cuisine": restaurant["cuisine"].strip(),
+        "seating_capacity": restaurant["seating_capacity"],
+        "available_slots": {canonical_slot(date_time): seats
+                            for date_time, seats in restaurant.get("available_slots", {}).items()},
+    }
+
+
+def validate_feed(rows, chunk_size, report, errors_file=None):
+    """Yield lists of up to `chunk_size` valid, normalized restaurants; rejected rows go to
+    `errors_file` and are counted in `report`."""
+    seen = set()
+    while True:
+        batch = list(itertools.islice(rows, chunk_size))
+        if not batch:
+            return
+        chunk = []
+        for line_number, restaurant, problem in batch:
+            problems = [problem] if problem else ValidationService.restaurant_problems(restaurant)
+            if not problems:
+                # Normalizing would silently keep only one of the seat counts
+                problems = [f"duplicate slot {key!r}" for key in _duplicate_slots(restaurant)]
+            if not problems:
+                restaurant = _normalize(restaurant)
+                if restaurant["name"] in seen:
+                    problems = [f"duplicate name {restaurant['name']!r}"]
+            if problems:
+                error = {"line": line_number, "problems": problems}
+                report["rejected"] += 1
+                if len(report["errors"]) < MAX_ERROR_SAMPLES:
+                    report["errors"].append(error)
+                if errors_file is not None:
+                    errors_file.write(json.dumps(error) + "\n")
+                continue
+            seen.add(restaurant["name"])
+            chunk.append(restaurant)
+        del batch  # Only the normalized copies stay alive while the backend writes them
+        if chunk:
+            yield chunk
+
+
+def import_feed(data_service, path, format=None, chunk_size=1000, errors_path=None):
+    """Replace the catalog with the valid rows of a feed; returns a report dict.
+
+    The report has the imported and rejected counts, the first few errors, the errors
+    file path (None if every row was valid) and the elapsed seconds. Raises ValueError
+    without touching the catalog if the feed has no valid rows.
+    """
+    errors_path = errors_path or path + ".errors.jsonl"
+    report = {"imported": 0, "rejected": 0, "errors": [], "errors_path": None, "seconds": 0.0}
+    start = time.perf_counter()
+    with open(errors_path, 'w') as errors_file:
+        chunks = validate_feed(read_feed(path, format), chunk_size, report, errors_file)
+        first = next(chunks, None)
+        if first is not None:
+            report["imported"] = data_service.import_catalog(itertools.chain([first], chunks))
+    if report["rejected"]:
+        report["errors_path"] = errors_path
+    else:
+        os.remove(errors_path)
+    report["seconds"] = time.perf_counter() - start
+    if first is None:
+        raise ValueError(f"No valid restaurants in {path}; the catalog was left unchanged.")
+    return report
+
+
+def _csv_pieces(restaurants):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(CSV_FIELDS)
+    for restaurant in restaurants:
+        slots = ";".join(f"{date_time}={seats}" for date_time, seats in restaurant["available_slots"].items())
+        writer.writerow([restaurant["name"], restaurant["location"], restaurant["cuisine"],
+                         restaurant["seating_capacity"], slots])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _jsonl_pieces(restaurants):
+    for restaurant in restaurants:
+        # A plain dict copy, since the partitioned backend's slots are lazy views
+        yield json.dumps(dict(restaurant, available_slots=dict(restaurant["available_slots"]))) + "\n"
+
+
+def export_feed(data_service, path, format=None):
+    """Write the catalog to a feed one restaurant at a time, replacing `path` atomically; returns the count."""
+    restaurants = data_service.load_restaurants()
+    pieces = _csv_pieces if feed_format(path, format) == "csv" else _jsonl_pieces
+    atomic_write_stream(path, pieces(restaurants))
+    return len(restaurants)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("feed", help="CSV or JSON-lines file")
+    parser.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+    parser.add_argument("--errors", help="where rejected rows are reported (import only)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--backend", choices=["json", "sqlite", "partitioned"], help="default: FOODIESPOT_STORAGE_BACKEND")
+    parser.add_argument("--restaurants", default=RESTAURANTS_FILE, help="restaurants.json path")
+    parser.add_argument("--reservations", default=RESERVATIONS_FILE, help="reservations.json path (ledger is alongside)")
+    parser.add_argument("--sqlite", default=SQLITE_FILE, help="SQLite database path")
+    args = parser.parse_args()
+    data_service = DataService(args.restaurants, args.reservations, backend=args.backend, sqlite_file=args.sqlite)
+    if args.command == "export":
+        count = export_feed(data_service, args.feed, args.format)
+        print(f"Exported {count} restaurants to {args.feed}.")
+        return
+    try:
+        report = import_feed(data_service, args.feed, args.format, args.chunk_size, args.errors)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(f"Imported {report['imported']} restaurants in {report['seconds']:.1f}s; rejected {report['rejected']}.")
+    for error in report["errors"][:5]:
+        print(f"  line {error['line']}: {'; '.join(error['problems'])}")
+    if report["errors_path"]:
+        print(f"All rejected rows are listed in {report['errors_path']}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# services/compact_catalog.py
+
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+CORE_FIELDS = ("name", "location", "cuisine", "seating_capacity", "available_slots")
+
+
+def slot_minute(date_time):
+    """'YYYY-MM-DD HH:MM' -> minutes since 2000-01-01 00:00."""
+    day = date(int(date_time[0:4]), int(date_time[5:7]), int(date_time[8:10])).toordinal() - EPOCH_ORDINAL
+    return day * 1440 + int(date_time[11:13]) * 60 + int(date_time[14:16])
+
+
+def slot_key(minute):
+    """Minutes since 2000-01-01 00:00 -> 'YYYY-MM-DD HH:MM'."""
+    day, minute = divmod(minute, 1440)
+    return f"{date.fromordinal(EPOCH_ORDINAL + day).isoformat()} {minute // 60:02d}:{minute % 60:02d}"
+
+
+class CompactCatalog:
+    """The restaurant catalog as parallel arrays instead of one dict per restaurant.
+
+    Row i describes one restaurant: `names[i]`, interned `location_codes[i]` and
+    `cuisine_codes[i]` (indexes into `locations` / `cuisines`) and `capacity[i]`. Slot
+    keys are integer minutes since 2000-01-01, kept in sorted "grids" that restaurants
+    with the same slot schedule share; restaurant i's seats for its grid's slots are the
+    unsigned 16-bit run `seats[offsets[i]:offsets[i] + len(grid)]`. Fields other than
+    the core ones (e.g. "features") are kept per row as they are.
+    """
+
+    def __init__(self, inventory_generation=None):
+        self.inventory_generation = inventory_generation
+        self.names = []
+        self.row_of = {}
+        self.locations, self._location_code = [], {}
+        self.cuisines, self._cuisine_code = [], {}
+        self.location_codes = array("H")
+        self.cuisine_codes = array("H")
+        self.capacity = array("H")
+        self.grids, self._grid_id = [], {}  # Sorted array("i") of slot minutes, shared between rows; bytes -> id
+        self.grid_of = array("I")
+        self.offsets = array("q")
+        self.seats = array("H")
+        self.extras = {}  # Row -> non-core fields
+        self._day_ordinals = {}  # "YYYY-MM-DD" -> day number, while parsing keys
+        self._layouts = {}  # Slot key tuple -> (grid id, sort order or None), while building
+
+    @classmethod
+    def from_restaurants(cls, restaurants, inventory_generation=None):
+        """Build from `restaurants.json`-shaped dicts; any iterable works, so a feed can be streamed."""
+        catalog = cls(inventory_generation)
+        for restaurant in restaurants:
+            catalog.add(restaurant)
+        catalog._day_ordinals.clear()
+        catalog._layouts.clear()
+        return catalog
+
+    def add(self, restaurant):
+        """Append one restaurant dict; returns its row."""
+        row = len(self.names)
+        name = restaurant["name"]
+        self.names.append(name)
+        self.row_of[name] = row
+        self.location_codes.append(self._intern(restaurant["location"], self.locations, self._location_code))
+        self.cuisine_codes.append(self._intern(restaurant["cuisine"], self.cuisines, self._cuisine_code))
+        self.capacity.append(restaurant["seating_capacity"])
+        slots = restaurant["available_slots"]
+        grid_id, order = self._layout(tuple(slots))
+        self.grid_of.append(grid_id)
+        self.offsets.append(len(self.seats))
+        seats = array("H", slots.values())
+        self.seats.extend(seats if order is None else array("H", (seats[i] for i in order)))
+        extras = {key: value for key, value in restaurant.items() if key not in CORE_FIELDS}
+        if extras:
+            self.extras[row] = extras
+        return row
+
+    @staticmethod
+    def _intern(value, values, code_of):
+        code = code_of.get(value)
+        if code is None:
+            code = code_of[value] = len(values)
+            values.append(value)
+        return code
+
+    def _intern_grid(self, grid):
+        # Keyed by the raw bytes, which are far smaller than a tuple of int objects
+        key = grid.tobytes()
+        grid_id = self._grid_id.get(key)
+        if grid_id is None:
+            grid_id = self._grid_id[key] = len(self.grids)
+            self.grids.append(grid)
+        return grid_id
+
+    def _layout(self, keys):
+        """(grid id, order) for a restaurant's slot keys; `order` sorts its values, None if already sorted.
+
+        Catalogs repeat a few slot schedules, so layouts are memoized while building.
+        """
+        layout = self._layouts.get(keys)
+        if layout is None:
+            minutes = [self._minute(key) for key in keys]
+            order = sorted(range(len(keys)), key=minutes.__getitem__)
+            grid = array("i", (minutes[i] for i in order))
+            layout = (self._intern_grid(grid), None if order == list(range(len(keys))) else order)
+            if len(self._layouts) < 1024:
+                self._layouts[keys] = layout
+        return layout
+
+    def _minute(self, date_time):
+        # Keys repeat the same few dates, so memoize the date part while building
+        day = self._day_ordinals.get(date_time[:10])
+        if day is None:
+            day = self._day_ordinals[date_time[:10]] = slot_minute(date_time[:10] + " 00:00") // 1440
+        return day * 1440 + int(date_time[11:13]) * 60 + int(date_time[14:16])
+
+    def __len__(self):
+        return len(self.names)
+
+    def restaurant(self, row):
+        """Row -> restaurant dict in the `restaurants.json` shape."""
+        grid = self.grids[self.grid_of[row]]
+        offset = self.offsets[row]
+        restaurant = {
+            "name": self.names[row],
+            "location": self.locations[self.location_codes[row]],
+            "cuisine": self.cuisines[self.cuisine_codes[row]],
+            "seating_capacity": self.capacity[row],
+            "available_slots": {slot_key(minute): self.seats[offset + i] for i, minute in enumerate(grid)},
+        }
+        restaurant.update(self.extras.get(row, ()))
+        return restaurant
+
+    def to_restaurants(self):
+        """The whole catalog as `restaurants.json`-shaped dicts."""
+        return [self.restaurant(row) for row in range(len(self.names))]
+
+    def seats_at(self, restaurant_name, date_time):
+        """Seats left at a slot (capacity if unlisted), or None for an unknown restaurant."""
+        row = self.row_of.get(restaurant_name)
+        if row is None:
+            return None
+        grid = self.grids[self.grid_of[row]]
+        minute = slot_minute(date_time)
+        i = bisect_left(grid, minute)
+        if i < len(grid) and grid[i] == minute:
+            return self.seats[self.offsets[row] + i]
+        return self.capacity[row]
+
+    def apply(self, restaurant_name, date_time, seats):
+        """Record the new seat count for one slot after a booking."""
+        row = self.row_of.get(restaurant_name)
+        if row is None:
+            return
+        grid = self.grids[self.grid_of[row]]
+        minute = slot_minute(date_time)
+        i = bisect_left(grid, minute)
+        if i < len(grid) and grid[i] == minute:
+            self.seats[self.offsets[row] + i] = seats
+            return
+        # A slot outside the shared grid: move this row onto a grid that has it. The old
+        # run stays in `seats` unused until the catalog is rebuilt.
+        offset = self.offsets[row]
+        block = self.seats[offset:offset + len(grid)]
+        block.insert(i, seats)
+        self.grid_of[row] = self._intern_grid(grid[:i] + array("i", [minute]) + grid[i:])
+        self.offsets[row] = len(self.seats)
+        self.seats.extend(block)
+
+    def rows(self, cuisine=None, location=None):
+        """Rows matching a cuisine and/or location (case-insensitive)."""
+        tests = []
+        for value, values, codes in ((cuisine, self.cuisines, self.cuisine_codes),
+                                     (location, self.locations, self.location_codes)):
+            if value is not None:
+                wanted = {code for code, interned in enumerate(values) if interned.lower() == value.lower()}
+                if not wanted:
+                    return []
+                tests.append((codes, wanted))
+        return [row for row in range(len(self.names)) if all(codes[row] in wanted for codes, wanted in tests)]
+
+    def memory_usage(self):
+        """Approximate bytes held, by component."""
+        return {
+            "names": sys.getsizeof(self.names) + sum(sys.getsizeof(name) for name in self.names),
+            "row_of": sys.getsizeof(self.row_of),
+            "columns": sum(sys.getsizeof(column) for column in
+                           (self.location_codes, self.cuisine_codes, self.capacity, self.grid_of, self.offsets)),
+            "grids": sum(sys.getsizeof(grid) for grid in self.grids) + sum(sys.getsizeof(key) for key in self._grid_id),
+            "seats": sys.getsizeof(self.seats),
+        }
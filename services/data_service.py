@@ -1,105 +1,461 @@
 # services/data_service.py
 
-import json
+import contextlib
 import os
-from datetime import datetime  # Add this import
+import random
+import threading
+from datetime import datetime, timedelta  # Add this import
+from config import STORAGE_BACKEND, RESTAURANTS_FILE, RESERVATIONS_FILE, INVENTORY_SHARDS_PER_DATE, FUZZY_MATCH_THRESHOLD
+from config import GROUP_COMMIT, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_WAIT_MS
 
 class DataService:
-    def __init__(self, restaurants_file, reservations_file):
+    def __init__(self, restaurants_file, reservations_file, ledger_file=None,
+                 backend=None, sqlite_file=None, group_commit=None):
         self.restaurants_file = restaurants_file
         self.reservations_file = reservations_file
-        self._initialize_data()
-
-    def _initialize_data(self):
-        """Initialize restaurant and reservation data if they don't exist or are invalid."""
-        # Ensure the data directory exists
-        os.makedirs(os.path.dirname(self.restaurants_file), exist_ok=True)
-
-        # Initialize restaurants.json
-        if not os.path.exists(self.restaurants_file) or os.path.getsize(self.restaurants_file) == 0:
-            restaurants = self._generate_restaurant_data()
-            with open(self.restaurants_file, 'w') as f:
-                json.dump(restaurants, f, indent=4)
-
-        # Initialize reservations.json
-        if not os.path.exists(self.reservations_file) or os.path.getsize(self.reservations_file) == 0:
-            with open(self.reservations_file, 'w') as f:
-                json.dump([], f, indent=4)
-
-    def _generate_restaurant_data(self):
-        """Generate 20 restaurant entries programmatically."""
+        self.ledger_file = ledger_file or os.path.splitext(reservations_file)[0] + ".jsonl"
+        self.sqlite_file = sqlite_file or os.path.join(os.path.dirname(restaurants_file), "foodiespot.db")
+        self.backend = backend or STORAGE_BACKEND
+        self.storage = self._create_storage()
+        # With group commit, single bookings are batched by a writer thread (see book_reservation)
+        self.group_commit = GROUP_COMMIT if group_commit is None else group_commit
+        self._committer = None
+        self._committer_lock = threading.Lock()
+        # Derived in-memory views of slot inventory, patched after each of our own bookings
+        self._views_lock = threading.Lock()
+        self._availability = None
+        self._slot_index = None
+        self._compact = None
+        self._fuzzy = None
+        self._waitlist = None
+        self._reservations = None
+        # Context manager factory wrapped around the views' storage reads (see _refreshing)
+        self.refresh_timer = None
+
+    def _create_storage(self):
+        """Build the configured storage backend; backends are imported only when selected."""
+        if self.backend == "json":
+            from services.json_storage import JsonStorage
+            return JsonStorage(self.restaurants_file, self.reservations_file, self.ledger_file,
+                               self._generate_restaurant_data)
+        if self.backend == "sqlite":
+            from services.sqlite_storage import SqliteStorage
+            return SqliteStorage(self.sqlite_file, self._generate_restaurant_data)
+        if self.backend == "partitioned":
+            from services.partitioned_storage import PartitionedStorage
+            return PartitionedStorage(self.restaurants_file, self.reservations_file, self.ledger_file,
+                                      self._generate_restaurant_data, INVENTORY_SHARDS_PER_DATE)
+        raise ValueError(f"Unknown storage backend: {self.backend!r}")
+
+    def _generate_restaurant_data(self, count=20, slots_per_day=1, days=1, start_date="2025-05-17", seed=None):
+        """Generate restaurant entries programmatically.
+
+        The defaults produce the 20-restaurant seed catalog with one 18:00 slot. Larger
+        catalogs get `slots_per_day` half-hourly slots centred on 18:00 for `days` days;
+        with a `seed`, cuisines and locations are drawn from a seeded RNG instead of
+        cycling, so benchmark datasets are reproducible.
+        """
+        if not 1 <= slots_per_day <= 48:
+            raise ValueError("slots_per_day must be between 1 and 48")
+        rng = random.Random(seed) if seed is not None else None
         locations = ["Downtown", "Midtown", "Uptown", "Eastside", "Westside"]
         cuisines = ["Italian", "Japanese", "Mexican", "Chinese", "Indian"]
+        first_minute = min(max(0, 18 * 60 - 30 * (slots_per_day // 2)), 24 * 60 - 30 * slots_per_day)
+        start = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(minutes=first_minute)
+        slot_keys = [
+            (start + timedelta(days=day, minutes=30 * slot)).strftime("%Y-%m-%d %H:%M")
+            for day in range(days) for slot in range(slots_per_day)
+        ]
         restaurants = []
-        for i in range(20):
-            name = f"Restaurant {chr(65 + i)}"  # Restaurant A, B, ..., T
-            location = locations[i % len(locations)]
-            cuisine = cuisines[i % len(cuisines)]
+        for i in range(count):
+            name = f"Restaurant {self._letters(i)}"  # Restaurant A, B, ..., Z, AA, AB, ...
+            location = rng.choice(locations) if rng else locations[i % len(locations)]
+            cuisine = rng.choice(cuisines) if rng else cuisines[i % len(cuisines)]
             seating_capacity = (i % 3 + 1) * 20  # 20, 40, 60
             restaurants.append({
                 "name": name,
                 "location": location,
                 "cuisine": cuisine,
                 "seating_capacity": seating_capacity,
-                "available_slots": {
-                    "2025-05-17 18:00": seating_capacity
-                }
+                "available_slots": dict.fromkeys(slot_keys, seating_capacity)
             })
         return restaurants
 
+    def _generate_reservation_data(self, restaurants, count, party_sizes=(2, 4, 6), seed=None):
+        """Generate `count` reservations against `restaurants`, taking their seats in place.
+
+        Reservations only land on slots that still have room, so the result is a consistent
+        (restaurants, reservations) pair ready for `storage.import_data`.
+        """
+        rng = random.Random(seed)
+        reservations = []
+        attempts = 0
+        while len(reservations) < count and attempts < count * 10:
+            attempts += 1
+            restaurant = rng.choice(restaurants)
+            slots = restaurant["available_slots"]
+            date_time = rng.choice(list(slots))
+            party_size = rng.choice(party_sizes)
+            if slots[date_time] < party_size:
+                continue
+            slots[date_time] -= party_size
+            reservations.append({"restaurant_name": restaurant["name"], "date_time": date_time, "party_size": party_size})
+        return reservations
+
+    @staticmethod
+    def _letters(index):
+        """Spreadsheet-style column letters: 0 -> A, 25 -> Z, 26 -> AA."""
+        letters = ""
+        index += 1
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            letters = chr(65 + remainder) + letters
+        return letters
+
     def load_restaurants(self):
-        """Load restaurant data from file with error handling."""
-        try:
-            with open(self.restaurants_file, 'r') as f:
-                content = f.read().strip()
-                if not content:  # If file is empty, reinitialize
-                    restaurants = self._generate_restaurant_data()
-                    with open(self.restaurants_file, 'w') as f_write:
-                        json.dump(restaurants, f_write, indent=4)
-                    return restaurants
-                return json.loads(content)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            # Reinitialize the file if there's an error
-            restaurants = self._generate_restaurant_data()
-            with open(self.restaurants_file, 'w') as f:
-                json.dump(restaurants, f, indent=4)
+        """Return the restaurant catalog. The list is cached and must be treated as read-only."""
+        return self._with_holds(self.storage.load_restaurants())
+
+    def get_restaurant(self, restaurant_name):
+        """Return the restaurant dict with the given name, or None."""
+        committer = self._committer
+        restaurant = self.storage.get_restaurant(restaurant_name)
+        return restaurant if committer is None else committer.restaurant_with_holds(restaurant)
+
+    def find_restaurants(self, cuisine=None, location=None):
+        """Return restaurants matching a cuisine and/or location (case-insensitive)."""
+        return self._with_holds(self.storage.find_restaurants(cuisine, location))
+
+    def _with_holds(self, restaurants):
+        """In group-commit mode, show seats held for queued bookings as taken."""
+        committer = self._committer
+        held = committer.held_restaurants() if committer is not None else None
+        if not held:
             return restaurants
+        return [committer.restaurant_with_holds(r) if r["name"] in held else r for r in restaurants]
+
+    @property
+    def catalog_generation(self):
+        """Counter that changes when restaurant names, locations, cuisines or capacities change.
+
+        Bookings do not bump it, so derived structures such as the intent matcher survive them.
+        """
+        return self.storage.catalog_generation
+
+    @property
+    def inventory_generation(self):
+        """Counter that changes whenever slot availability changes."""
+        return self.storage.inventory_generation
 
     def load_reservations(self):
-        """Load reservation data from file with error handling."""
-        try:
-            with open(self.reservations_file, 'r') as f:
-                content = f.read().strip()
-                if not content:  # If file is empty, reinitialize
-                    with open(self.reservations_file, 'w') as f_write:
-                        json.dump([], f_write, indent=4)
-                    return []
-                return json.loads(content)
-        except (json.JSONDecodeError, FileNotFoundError) as e:
-            # Reinitialize the file if there's an error
-            with open(self.reservations_file, 'w') as f:
-                json.dump([], f, indent=4)
-            return []
+        """Load all stored reservations."""
+        return list(self.iter_reservations())
+
+    def iter_reservations(self):
+        """Stream reservations without holding them all in memory."""
+        return self.storage.iter_reservations()
 
     def save_reservation(self, reservation):
-        """Save a new reservation to file."""
-        reservations = self.load_reservations()
-        reservations.append(reservation)
-        with open(self.reservations_file, 'w') as f:
-            json.dump(reservations, f, indent=4)
+        """Store a new reservation."""
+        self.storage.save_reservation(self._with_id(reservation))
+        self._sync_reservations(added=[reservation], bumped=False)
+
+    @staticmethod
+    def _with_id(reservation):
+        """Give a new reservation its ID, in place; an ID it already has is kept."""
+        if "reservation_id" not in reservation:
+            reservation["reservation_id"] = os.urandom(6).hex()
+        return reservation
+
+    def get_reservation(self, reservation_id):
+        """Return the live reservation with this ID, or None."""
+        return self.storage.get_reservation(reservation_id)
+
+    def compact_reservations(self):
+        """Compact reservation storage. Returns the record count."""
+        return self.storage.compact_reservations()
 
     def update_availability(self, restaurant_name, date_time, party_size):
         """Update restaurant availability after a reservation."""
-        restaurants = self.load_restaurants()
-        for restaurant in restaurants:
-            if restaurant["name"] == restaurant_name:
-                if date_time not in restaurant["available_slots"]:
-                    restaurant["available_slots"][date_time] = restaurant["seating_capacity"]
-                available = restaurant["available_slots"][date_time]
-                if available < int(party_size):
-                    return False
-                restaurant["available_slots"][date_time] -= int(party_size)
+        updated = self.storage.update_availability(restaurant_name, date_time, party_size)
+        if updated:
+            self._sync_availability([(restaurant_name, date_time)])
+            self._sync_reservations()
+        return updated
+
+    def book_reservation(self, reservation):
+        """Atomically check capacity, decrement it and record the reservation.
+
+        Returns False if the restaurant is unknown or the slot cannot seat the party. The
+        reservation is given a "reservation_id" in place if it has none.
+
+        In group-commit mode the booking is queued with concurrent ones and this returns
+        once the batch holding it has been written and fsynced.
+        """
+        if self.group_commit:
+            return self.get_group_committer().submit(self._with_id(reservation))
+        booked = self.storage.book_reservation(self._with_id(reservation))
+        if booked:
+            self._sync_availability([(reservation["restaurant_name"], reservation["date_time"])])
+            self._sync_reservations(added=[reservation])
+        return booked
+
+    def book_reservations(self, reservations, atomic=True):
+        """Book many reservations with a single commit; returns per-item booleans.
+
+        With `atomic`, all are booked or none are; otherwise each one that fits is booked.
+        """
+        results = self.storage.book_reservations([self._with_id(r) for r in reservations], atomic)
+        booked = [r for r, ok in zip(reservations, results) if ok]
+        if booked:
+            self._sync_availability([(r["restaurant_name"], r["date_time"]) for r in booked])
+            self._sync_reservations(added=booked)
+        return results
+
+    def import_catalog(self, chunks):
+        """Replace the catalog with restaurants streamed as an iterable of lists; reservations are kept.
+
+        The derived views are dropped rather than patched row by row, so each rebuilds once
+        on next use. Returns the number of restaurants imported.
+        """
+        count = self.storage.import_catalog(chunks)
+        self._availability = self._slot_index = self._compact = self._reservations = None
+        return count
+
+    def get_group_committer(self):
+        """Return the group-commit writer (started on first use), or None when group commit is off."""
+        if not self.group_commit:
+            return None
+        if self._committer is None:
+            with self._committer_lock:
+                if self._committer is None:
+                    from services.group_commit import GroupCommitter
+                    self._committer = GroupCommitter(self.storage, GROUP_COMMIT_MAX_BATCH, GROUP_COMMIT_MAX_WAIT_MS / 1000,
+                                                     on_commit=self._after_group_commit, on_hold=self._after_hold)
+        return self._committer
+
+    def _after_hold(self, slot):
+        # Seats held for a queued booking show as taken in the views right away
+        self._sync_availability([slot], bumped=False)
+
+    def _after_group_commit(self, booked, slots):
+        # Every slot of the batch is patched, so a booking storage refused gives its hold back
+        self._sync_availability(slots, bumped=bool(booked))
+        if booked:
+            self._sync_reservations(added=booked)
+
+    def close(self):
+        """Flush any queued group-commit bookings and stop the writer thread."""
+        if self._committer is not None:
+            self._committer.close()
+            self._committer = None
+
+    def cancel_reservation(self, reservation_id):
+        """Cancel a booking, give its seats back and book waitlisted parties that now fit.
+
+        Returns (cancelled reservation, promoted reservations), or (None, []) if no live
+        reservation has this ID.
+        """
+        reservation = self.storage.cancel_reservation(reservation_id)
+        if reservation is None:
+            return None, []
+        restaurant_name, date_time = reservation["restaurant_name"], reservation["date_time"]
+        self._sync_availability([(restaurant_name, date_time)])
+        self._sync_reservations(removed=[reservation_id])
+        return reservation, self.promote_waitlist(restaurant_name, date_time)
+
+    def _refreshing(self):
+        """Context for the storage reads that keep a derived view current.
+
+        The views themselves are in memory, but checking them against storage and
+        reloading the catalog or reading the ledger tail is I/O; `refresh_timer`, if set
+        (the tool metrics set it), times it.
+        """
+        timer = self.refresh_timer
+        return contextlib.nullcontext() if timer is None else timer()
+
+    def get_reservation_index(self):
+        """Return the secondary indexes over live reservations, catching up with writes made elsewhere.
+
+        Ledger backends apply only the lines appended since the index last read the ledger,
+        and rebuild after a compaction or truncation; other backends rebuild from storage.
+        """
+        with self._refreshing():
+            generation = self.inventory_generation
+        index = self._reservations
+        if index is not None and index.inventory_generation == generation:
+            return index
+        from services.reservation_index import ReservationIndex
+        with self._refreshing():
+            changes = self.storage.reservation_changes(index.ledger_position if index is not None else None)
+            reservations = list(self.iter_reservations()) if changes is None else None
+        if changes is None:
+            index = ReservationIndex.from_reservations(reservations, generation)
+        else:
+            records, position, from_start = changes
+            if index is None or from_start:
+                index = ReservationIndex.from_ledger(records, generation)
+            else:
+                index.apply_ledger(records)
+                index.inventory_generation = generation
+            index.ledger_position = position
+        self._reservations = index
+        return index
+
+    def reservations_between(self, restaurant_name, start, end):
+        """Reservations at a restaurant with start <= date_time < end ("YYYY-MM-DD HH:MM" or a prefix), in time order."""
+        return self.get_reservation_index().reservations_between(restaurant_name, start, end)
+
+    def reservations_on(self, day):
+        """All reservations for one "YYYY-MM-DD" date."""
+        return self.get_reservation_index().on_date(day)
+
+    def by_customer(self, customer):
+        """Reservations booked under a customer name or contact."""
+        return self.get_reservation_index().by_customer(customer)
+
+    def get_waitlist(self):
+        """Return this process's waitlist of parties waiting for full slots."""
+        if self._waitlist is None:
+            from services.waitlist import Waitlist
+            self._waitlist = Waitlist()
+        return self._waitlist
+
+    def join_waitlist(self, reservation):
+        """Queue a reservation that did not fit; returns (waitlist id, position).
+
+        The party is booked by `promote_waitlist` once enough seats are freed.
+        """
+        waitlist = self.get_waitlist()
+        waitlist_id = waitlist.join(reservation)
+        return waitlist_id, waitlist.position(waitlist_id)
+
+    def promote_waitlist(self, restaurant_name, date_time):
+        """Book waitlisted parties for a slot, earliest first, while the freed seats fit them.
+
+        Returns the reservations booked. A party whose booking fails because the seats
+        were taken meanwhile keeps its place.
+        """
+        if self._waitlist is None:
+            return []
+        promoted = []
+        while True:
+            restaurant = self.get_restaurant(restaurant_name)
+            if restaurant is None:
+                break
+            seats = restaurant["available_slots"].get(date_time, restaurant["seating_capacity"])
+            entry = self._waitlist.pop(restaurant_name, date_time, seats)
+            if entry is None:
                 break
-        with open(self.restaurants_file, 'w') as f:
-            json.dump(restaurants, f, indent=4)
-        return True
\ No newline at end of file
+            if not self.book_reservation(entry.reservation):
+                self._waitlist.restore(entry)
+                break
+            promoted.append(entry.reservation)
+        return promoted
+
+    def get_availability_engine(self):
+        """Return the vectorized availability engine, rebuilding it if inventory changed elsewhere."""
+        with self._refreshing():
+            generation = self.inventory_generation
+        if self._availability is None or self._availability.inventory_generation != generation:
+            from services.availability_engine import AvailabilityEngine
+            with self._views_lock:
+                with self._refreshing():
+                    restaurants = self.load_restaurants()
+                self._availability = AvailabilityEngine.from_restaurants(restaurants, generation)
+        return self._availability
+
+    def get_slot_index(self):
+        """Return the sorted per-restaurant index of open slots, rebuilding it if inventory changed."""
+        with self._refreshing():
+            generation = self.inventory_generation
+        if self._slot_index is None or self._slot_index.inventory_generation != generation:
+            from services.slot_index import SlotIndex
+            with self._views_lock:
+                with self._refreshing():
+                    restaurants = self.load_restaurants()
+                self._slot_index = SlotIndex(restaurants, generation)
+        return self._slot_index
+
+    def get_compact_catalog(self):
+        """Return the catalog as a CompactCatalog, rebuilding it if inventory changed."""
+        with self._refreshing():
+            generation = self.inventory_generation
+        if self._compact is None or self._compact.inventory_generation != generation:
+            from services.compact_catalog import CompactCatalog
+            with self._views_lock:
+                with self._refreshing():
+                    restaurants = self.load_restaurants()
+                self._compact = CompactCatalog.from_restaurants(restaurants, generation)
+        return self._compact
+
+    def get_fuzzy_index(self):
+        """Return the trigram index over restaurant names and cuisines, updated in place when the catalog changes."""
+        with self._refreshing():
+            generation = self.catalog_generation
+        if self._fuzzy is None:
+            from services.fuzzy_index import CatalogFuzzyIndex
+            self._fuzzy = CatalogFuzzyIndex(FUZZY_MATCH_THRESHOLD)
+        if self._fuzzy.catalog_generation != generation:
+            with self._refreshing():
+                restaurants = self.load_restaurants()
+            self._fuzzy.sync(restaurants, generation)
+        return self._fuzzy
+
+    def _sync_reservations(self, added=(), removed=(), bumped=True):
+        """Patch the reservation index after our own write, which moved the inventory
+        generation on by one if `bumped`. Otherwise someone else wrote too, so the index is
+        left for `get_reservation_index` to catch up (or rebuild) on next use."""
+        index = self._reservations
+        if index is None:
+            return
+        generation = self.inventory_generation
+        if index.inventory_generation is None or generation != index.inventory_generation + bumped:
+            if index.ledger_position is None:
+                self._reservations = None
+            return
+        for reservation_id in removed:
+            index.remove(reservation_id)
+        for reservation in added:
+            # A copy, since callers own (and may go on to edit) the dicts they booked
+            index.add(dict(reservation))
+        index.inventory_generation = generation
+
+    def _sync_availability(self, slots, bumped=True):
+        """Patch derived views after our own write of (restaurant, slot) pairs, which moved the
+        inventory generation on by one if `bumped`.
+
+        Any other interleaved change leaves the views stale, so they rebuild on next use.
+        Seats are read and applied under the lock that view rebuilds also take, so the last
+        patch of a slot is the newest and no patch lands in a view that is being built.
+        """
+        views = [view for view in (self._availability, self._slot_index, self._compact) if view is not None]
+        if not views:
+            return
+        with self._views_lock:
+            generation = self.inventory_generation
+            for view in views:
+                if view.inventory_generation is not None and generation == view.inventory_generation + bumped:
+                    for restaurant_name, date_time in slots:
+                        restaurant = self.get_restaurant(restaurant_name)
+                        if restaurant is not None:
+                            seats = restaurant["available_slots"].get(date_time, restaurant["seating_capacity"])
+                            view.apply(restaurant_name, date_time, seats)
+                    view.inventory_generation = generation
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def get_data_service():
+    """Return the process-wide DataService for the configured data files.
+
+    It is created on first use rather than at import time, so importing the agents and
+    tools touches no files, and every caller in the process shares one set of caches.
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = DataService(RESTAURANTS_FILE, RESERVATIONS_FILE)
+    return _shared
@@ -0,0 +1,77 @@
+# services/datetime_parser.py
+
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+
+SLOT_FORMAT = '%Y-%m-%d %H:%M'
+# Formats accepted by the original strptime loop, tried only when the fast path misses
+FALLBACK_FORMATS = [
+    '%Y-%m-%d %H:%M',      # 2025-05-16 19:00
+    '%Y-%m-%d %H:%M:%S',   # 2025-05-16 19:00:00
+    '%Y-%m-%d %H%M'        # 2025-05-16 1900
+]
+SLOT_CACHE_SIZE = 4096
+
+_SLOT_PATTERN = r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):?(\d{2})(?::(\d{2}))?"
+_SLOT_RE = re.compile(_SLOT_PATTERN + r"$")
+# A slot introduced by "at" or "on" somewhere in free text, e.g. "... at 2025-05-17 18:00"
+_DATE_IN_TEXT_RE = re.compile(r"(?<![\d-])(\d{4}-\d{2}-\d{2})(?![\d-])")
+_SLOT_IN_TEXT_RE = re.compile(r"(?:^|\s)(?:at|on)\s+(\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:?\d{2}(?::\d{2})?)(?!\S)")
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def parse_slot(date_time_str):
+    """Parse a slot string into a naive datetime, or return None if it is not valid."""
+    if not date_time_str:
+        return None
+    date_time_str = " ".join(date_time_str.split())
+    match = _SLOT_RE.match(date_time_str)
+    if match:
+        try:
+            return datetime(*(int(part) for part in match.groups() if part is not None))
+        except ValueError:  # e.g. month 13; fall through so the result matches strptime
+            pass
+    for fmt in FALLBACK_FORMATS:
+        try:
+            return datetime.strptime(date_time_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def canonical_slot(date_time_str):
+    """Return the canonical "YYYY-MM-DD HH:MM" key for a slot string, or None if invalid.
+
+    "2025-05-17 1800", "2025-05-17 18:00" and "2025-05-17 18:00:00" all map to the same key.
+    """
+    parsed = parse_slot(date_time_str)
+    return parsed.strftime(SLOT_FORMAT) if parsed else None
+
+def find_slot(text):
+    """Find the first slot introduced by "at" or "on" in free text; returns its canonical key."""
+    for match in _SLOT_IN_TEXT_RE.finditer(text):
+        slot = canonical_slot(match.group(1))
+        if slot:
+            return slot
+    return None
+
+def find_date(text):
+    """Find the first valid "YYYY-MM-DD" date anywhere in free text."""
+    for match in _DATE_IN_TEXT_RE.finditer(text):
+        try:
+            datetime.strptime(match.group(1), "%Y-%m-%d")
+        except ValueError:
+            continue
+        return match.group(1)
+    return None
+
+@lru_cache(maxsize=None)
+def local_timezone():
+    """The restaurants' timezone (IST), created once; pytz is imported on first use."""
+    import pytz
+    return pytz.timezone("Asia/Kolkata")
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def to_utc(parsed_time):
+    """Interpret a naive local datetime as IST and convert it to UTC."""
+    return local_timezone().localize(parsed_time).astimezone(timezone.utc)
@@ -0,0 +1,212 @@
+# services/fuzzy_index.py
+
+import re
+from collections import Counter
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def trigrams(text):
+    """Set of word trigrams of `text`, each word lower-cased and padded as "  word "."""
+    grams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Inverted index from word trigrams to keys, for typo-tolerant lookups.
+
+    Similarity is the Jaccard index of the two trigram sets. Keys are added, removed and
+    renamed one at a time, so the index follows catalog edits without a rebuild.
+
+    Trigrams shared by more than `stop_fraction` of the keys (at least `min_stop` of them),
+    such as those of "restaurant" in "Restaurant A", "Restaurant B", ..., do not
+    nominate candidates: a key is only considered if it shares a rarer trigram with the
+    query. They still count when candidates are scored, and small indexes have none.
+
+    A high score alone does not make a match. Names such as "Restaurant R" and
+    "Restaurant Z" differ in one short word, so the winning key's rarest words, the ones
+    that tell it apart from the other keys, must also appear in the query: exactly, or
+    for words of `min_word_length` letters or more, within the threshold.
+    """
+
+    def __init__(self, threshold=0.5, stop_fraction=0.05, min_stop=64, min_word_length=4):
+        self.threshold = threshold
+        self.stop_fraction = stop_fraction
+        self.min_stop = min_stop
+        self.min_word_length = min_word_length
+        self._grams = {}     # Key -> frozenset of its trigrams
+        self._postings = {}  # Trigram -> set of keys
+        self._words = {}     # Key -> set of its lower-cased words
+        self._word_keys = Counter()  # Word -> number of keys containing it
+
+    def __len__(self):
+        return len(self._grams)
+
+    def __contains__(self, key):
+        return key in self._grams
+
+    def keys(self):
+        return self._grams.keys()
+
+    def add(self, key, text=None):
+        """Index `key` under the trigrams of `text` (the key itself by default)."""
+        if key in self._grams:
+            self.remove(key)
+        text = key if text is None else text
+        grams = frozenset(trigrams(text))
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+        self._words[key] = set(WORD.findall(text.lower()))
+        self._word_keys.update(self._words[key])
+
+    def remove(self, key):
+        for gram in self._grams.pop(key, ()):
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+        for word in self._words.pop(key, ()):
+            self._word_keys[word] -= 1
+            if not self._word_keys[word]:
+                del self._word_keys[word]
+
+    def rename(self, old_key, new_key):
+        self.remove(old_key)
+        self.add(new_key)
+
+    def sync(self, keys):
+        """Make the indexed keys equal `keys`, touching only the difference; returns (added, removed)."""
+        keys = set(keys)
+        removed = [key for key in self._grams if key not in keys]
+        added = [key for key in keys if key not in self._grams]
+        for key in removed:
+            self.remove(key)
+        for key in added:
+            self.add(key)
+        return len(added), len(removed)
+
+    def _distinguished(self, key, query_words, threshold):
+        """Whether the query has one of the rarest words of `key` (or a close spelling of it)."""
+        words = self._words[key]
+        if not words:
+            return True
+        rarest = min(self._word_keys[word] for word in words)
+        for word in words:
+            if self._word_keys[word] != rarest:
+                continue
+            if word in query_words:
+                return True
+            if len(word) >= self.min_word_length:
+                grams = trigrams(word)
+                for query_word in query_words:
+                    if len(query_word) >= self.min_word_length:
+                        other = trigrams(query_word)
+                        if len(grams & other) / len(grams | other) >= threshold:
+                            return True
+        return False
+
+    def best_match(self, query, threshold=None):
+        """Return (key, similarity) for the most similar key.
+
+        The key is None when nothing reaches the threshold, when two keys tie for the
+        best similarity or when the query lacks the words that set the best key apart,
+        since an ambiguous correction is worse than none.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        query_grams = trigrams(query)
+        if not query_grams:
+            return None, 0.0
+        cutoff = max(self.min_stop, int(len(self._grams) * self.stop_fraction))
+        counts = Counter()
+        common = 0
+        for gram in query_grams:
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            if len(posting) > cutoff:
+                common += 1
+            else:
+                counts.update(posting)
+        best, best_score, tied = None, 0.0, False
+        size = len(query_grams)
+        for key, shared in counts.most_common():
+            # No later key can share more than this many trigrams, so none can score higher
+            if (shared + common) / size < best_score:
+                break
+            grams = self._grams[key]
+            overlap = len(query_grams & grams)
+            score = overlap / (size + len(grams) - overlap)
+            if score > best_score:
+                best, best_score, tied = key, score, False
+            elif score == best_score:
+                tied = True
+        if best_score < threshold or tied or not self._distinguished(best, set(WORD.findall(query.lower())), threshold):
+            return None, best_score
+        return best, best_score
+
+
+class CatalogFuzzyIndex:
+    """Trigram indexes over a restaurant catalog: full names, cuisines and the words in both.
+
+    `sync(restaurants)` applies only what changed since the last call, so a catalog edit
+    costs as much as the edit rather than a rebuild.
+    """
+
+    def __init__(self, threshold=0.5, catalog_generation=None):
+        self.catalog_generation = catalog_generation
+        self.threshold = threshold
+        self.names = TrigramIndex(threshold)
+        self.cuisines = TrigramIndex(threshold)
+        self.words = TrigramIndex(threshold)
+        self._folded_names = {}  # Name lower-cased with collapsed spaces -> name
+
+    @staticmethod
+    def _fold(text):
+        return " ".join(text.casefold().split())
+
+    def sync(self, restaurants, catalog_generation=None):
+        self.catalog_generation = catalog_generation
+        self.names.sync(r["name"] for r in restaurants)
+        self._folded_names = {self._fold(name): name for name in self.names.keys()}
+        self.cuisines.sync(r["cuisine"] for r in restaurants)
+        vocabulary = set()
+        for key in list(self.names.keys()) + list(self.cuisines.keys()):
+            vocabulary.update(WORD.findall(key.lower()))
+        self.words.sync(vocabulary)
+        return self
+
+    def exact_restaurant(self, text):
+        """The restaurant named `text`, ignoring case and spacing, or None."""
+        return self._folded_names.get(self._fold(text))
+
+    def match_restaurant(self, text):
+        """(canonical restaurant name or None, similarity)."""
+        name = self.exact_restaurant(text)
+        if name is not None:
+            return name, 1.0
+        return self.names.best_match(text)
+
+    def match_cuisine(self, text):
+        """(canonical cuisine or None, similarity); exact matches ignore case."""
+        for cuisine in self.cuisines.keys():
+            if cuisine.lower() == text.lower():
+                return cuisine, 1.0
+        return self.cuisines.best_match(text)
+
+    def correct(self, text, min_length=4):
+        """Replace misspelled words of `text` with their unique closest catalog word.
+
+        Words shorter than `min_length` are left alone: a trigram or two cannot tell a
+        typo from a different short word.
+        """
+        def replace(match):
+            word = match.group(0)
+            if len(word) < min_length or word in self.words:
+                return word
+            corrected, _ = self.words.best_match(word)
+            return corrected or word
+        return WORD.sub(replace, text.lower())
@@ -0,0 +1,284 @@
+# services/group_commit.py
+
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+
+
+class _Pending:
+    __slots__ = ("reservation", "enqueued", "done", "result", "error")
+
+    def __init__(self, reservation):
+        self.reservation = reservation
+        self.enqueued = time.perf_counter()
+        self.done = threading.Event()
+        self.result = False
+        self.error = None
+
+
+class HeldSlots(Mapping):
+    """Read-only `available_slots` of one restaurant less the seats held for queued bookings."""
+
+    __slots__ = ("_slots", "_held", "_capacity")
+
+    def __init__(self, slots, held, capacity):
+        self._slots = slots
+        self._held = held  # {date_time: seats held}
+        self._capacity = capacity
+
+    def __getitem__(self, date_time):
+        if date_time in self._held:
+            return self._slots.get(date_time, self._capacity) - self._held[date_time]
+        return self._slots[date_time]
+
+    def __iter__(self):
+        yield from self._slots
+        for date_time in self._held:
+            if date_time not in self._slots:
+                yield date_time
+
+    def __len__(self):
+        return len(self._slots) + sum(1 for date_time in self._held if date_time not in self._slots)
+
+
+class GroupCommitter:
+    """Write-behind buffer that commits concurrent bookings together.
+
+    `submit` checks a booking against the slot's seats minus those already held by
+    queued bookings, holds its seats right away and queues it. One writer thread takes
+    up to `max_batch_size` queued bookings once the oldest has waited `max_wait`
+    seconds, or at once if the batch is full, and books them with a single
+    `storage.book_reservations(..., atomic=False)` call: one inventory write and one
+    ledger append for the whole batch. That is still three fsyncs on the JSON backend
+    (the new catalog file, its directory and the ledger), and two per shard touched plus
+    one on the partitioned backend; group commit shares them across the batch rather
+    than merging them. With the default `max_wait` of 0 a batch goes as soon as the
+    writer is free, so bookings arriving during one flush form the next. Each caller is
+    woken only after its batch is durable, with the storage's verdict, which stays
+    authoritative: the held seats only let callers that cannot fit fail without waiting
+    for a flush.
+
+    Reads should not offer seats a queued booking is about to take: `held_seats` and
+    `restaurant_with_holds` give the seats held by queued bookings and by the batch being
+    written, for the owner to subtract. Once storage has written a batch its seats are
+    counted twice for a moment, until the batch is released, so reads err towards fewer
+    seats rather than more.
+
+    `on_hold((restaurant_name, date_time))` runs on the submitting thread once a booking's
+    seats are held, and `on_commit(booked reservations, slots)` on the writer thread after
+    each batch, with every slot it held, booked or not, for the owner to patch its views.
+    """
+
+    def __init__(self, storage, max_batch_size=64, max_wait=0.0, on_commit=None, on_hold=None, samples=1024):
+        self.storage = storage
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.on_commit = on_commit
+        self.on_hold = on_hold
+        self._queue = deque()
+        self._held = {}  # (restaurant_name, date_time) -> seats held by queued bookings
+        self._flushing = {}  # The same, for the batch being written
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writer = None
+        # Metrics
+        self.submitted = 0
+        self.rejected = 0
+        self.committed = 0
+        self.failed = 0
+        self.flushed = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.max_queue_depth = 0
+        self.flush_seconds = 0.0
+        self.flush_max = 0.0
+        self._flush_samples = deque(maxlen=samples)
+
+    def submit(self, reservation, timeout=None):
+        """Queue one booking and block until its batch is committed; returns whether it was booked.
+
+        Raises whatever the storage raised for the batch, or TimeoutError.
+        """
+        restaurant = self.storage.get_restaurant(reservation["restaurant_name"])
+        if restaurant is None:
+            return False
+        key = (reservation["restaurant_name"], reservation["date_time"])
+        party_size = int(reservation["party_size"])
+        seats = restaurant["available_slots"].get(key[1], restaurant["seating_capacity"])
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("GroupCommitter is closed")
+            self.submitted += 1
+            if seats - self._held.get(key, 0) < party_size:
+                self.rejected += 1
+                return False
+            self._held[key] = self._held.get(key, 0) + party_size
+            pending = _Pending(reservation)
+            self._queue.append(pending)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._run, name="group-commit", daemon=True)
+                self._writer.start()
+            self._cond.notify()
+        if self.on_hold is not None:
+            try:
+                self.on_hold(key)
+            except Exception:
+                pass  # Views are only caches; a failed patch leaves them to rebuild
+        if not pending.done.wait(timeout):
+            raise TimeoutError("booking was not committed in time")
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _next_batch(self):
+        """Wait for a batch to be due and take it off the queue; None once closed and drained."""
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = self._queue[0].enqueued + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = [self._queue.popleft() for _ in range(min(self.max_batch_size, len(self._queue)))]
+            # Release the holds before the storage write rather than after it. A booking
+            # checked meanwhile may then count seats the batch is about to take, and is
+            # refused by the storage; the other order would refuse it up front while
+            # counting those seats twice. Reads still see them, through `_flushing`.
+            for pending in batch:
+                reservation = pending.reservation
+                key = (reservation["restaurant_name"], reservation["date_time"])
+                self._held[key] -= int(reservation["party_size"])
+                if not self._held[key]:
+                    del self._held[key]
+                self._flushing[key] = self._flushing.get(key, 0) + int(reservation["party_size"])
+            return batch
+
+    def held_seats(self, restaurant_name):
+        """{date_time: seats} held at a restaurant by queued bookings and the batch being written."""
+        held = {}
+        with self._cond:
+            for holds in (self._held, self._flushing):
+                for (name, date_time), seats in holds.items():
+                    if name == restaurant_name:
+                        held[date_time] = held.get(date_time, 0) + seats
+        return held
+
+    def held_restaurants(self):
+        """Names of the restaurants with seats held."""
+        with self._cond:
+            return {name for name, _ in self._held} | {name for name, _ in self._flushing}
+
+    def restaurant_with_holds(self, restaurant):
+        """`restaurant` with its held seats subtracted from `available_slots` (itself if none are held)."""
+        if restaurant is None:
+            return None
+        held = self.held_seats(restaurant["name"])
+        if not held:
+            return restaurant
+        return dict(restaurant, available_slots=HeldSlots(restaurant["available_slots"], held, restaurant["seating_capacity"]))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            reservations = [pending.reservation for pending in batch]
+            start = time.perf_counter()
+            error, results = None, [False] * len(batch)
+            try:
+                results = self.storage.book_reservations(reservations, atomic=False)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+            slots = []
+            with self._cond:
+                for reservation in reservations:
+                    key = (reservation["restaurant_name"], reservation["date_time"])
+                    self._flushing[key] -= int(reservation["party_size"])
+                    if not self._flushing[key]:
+                        del self._flushing[key]
+                        slots.append(key)
+                self.batches += 1
+                self.flushed += len(batch)
+                self.max_batch = max(self.max_batch, len(batch))
+                self.committed += sum(results)
+                self.failed += len(batch) if error else 0
+                self.flush_seconds += elapsed
+                self.flush_max = max(self.flush_max, elapsed)
+                self._flush_samples.append(elapsed)
+            booked = [r for r, ok in zip(reservations, results) if ok]
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(booked, slots)
+                except Exception:
+                    pass  # Views are only caches; a failed patch leaves them to rebuild
+            for pending, result in zip(batch, results):
+                pending.result = result
+                pending.error = error
+                pending.done.set()
+
+    @property
+    def queue_depth(self):
+        return len(self._queue)
+
+    def close(self):
+        """Commit whatever is queued and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def stats(self):
+        """Counters plus flush latency (over the last `samples` flushes for percentiles) and queue depth."""
+        with self._cond:
+            samples = sorted(self._flush_samples)
+            return {
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "committed": self.committed,
+                "failed": self.failed,
+                "unavailable": self.flushed - self.committed - self.failed,
+                "batches": self.batches,
+                "mean_batch_size": self.flushed / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "flush_seconds": {
+                    "sum": self.flush_seconds,
+                    "mean": self.flush_seconds / self.batches if self.batches else 0.0,
+                    "p50": samples[len(samples) // 2] if samples else 0.0,
+                    "p99": samples[min(len(samples) - 1, len(samples) * 99 // 100)] if samples else 0.0,
+                    "max": self.flush_max,
+                },
+            }
+
+    def to_prometheus(self, prefix="foodiespot_group_commit"):
+        """Render the stats in the Prometheus text exposition format."""
+        stats = self.stats()
+        flush = stats["flush_seconds"]
+        return "\n".join([
+            f"# HELP {prefix}_bookings_total Bookings submitted, by outcome.", f"# TYPE {prefix}_bookings_total counter",
+            f'{prefix}_bookings_total{{outcome="committed"}} {stats["committed"]}',
+            f'{prefix}_bookings_total{{outcome="rejected"}} {stats["rejected"]}',
+            f'{prefix}_bookings_total{{outcome="unavailable"}} {stats["unavailable"]}',
+            f'{prefix}_bookings_total{{outcome="failed"}} {stats["failed"]}',
+            f"# HELP {prefix}_batches_total Batches flushed.", f"# TYPE {prefix}_batches_total counter",
+            f"{prefix}_batches_total {stats['batches']}",
+            f"# HELP {prefix}_batch_size_mean Mean bookings per flushed batch.", f"# TYPE {prefix}_batch_size_mean gauge",
+            f"{prefix}_batch_size_mean {stats['mean_batch_size']:.3f}",
+            f"# HELP {prefix}_queue_depth Bookings waiting for the next flush.", f"# TYPE {prefix}_queue_depth gauge",
+            f"{prefix}_queue_depth {stats['queue_depth']}",
+            f"# HELP {prefix}_flush_seconds Batch flush latency.", f"# TYPE {prefix}_flush_seconds summary",
+            f'{prefix}_flush_seconds{{quantile="0.5"}} {flush["p50"]:.6f}',
+            f'{prefix}_flush_seconds{{quantile="0.99"}} {flush["p99"]:.6f}',
+            f"{prefix}_flush_seconds_sum {flush['sum']:.6f}",
+            f"{prefix}_flush_seconds_count {stats['batches']}",
+        ]) + "\n"
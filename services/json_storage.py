@@ -0,0 +1,227 @@
+# services/json_storage.py
+
+import json
+import os
+from services.catalog_cache import CatalogCache
+from services.locking import FileLock, atomic_write_stream, json_array_pieces
+from services.reservation_ledger import ReservationLedger
+from services.storage_backend import ChunkCounter, StorageBackend
+
+
+class JsonStorage(StorageBackend):
+    """Default backend: `restaurants.json` plus an append-only reservation ledger.
+
+    Every write rewrites the whole of restaurants.json under one catalog lock, so bookings
+    from all threads and processes serialize on it, whatever restaurant they are for. Use
+    the partitioned or SQLite backend where concurrent bookings matter.
+    """
+
+    def __init__(self, restaurants_file, reservations_file, ledger_file, seed):
+        self.restaurants_file = restaurants_file
+        # The legacy JSON array is only read once, to seed the append-only ledger
+        self.reservations_file = reservations_file
+        self.ledger_file = ledger_file
+        self._seed = seed
+        self._catalog = CatalogCache(restaurants_file)
+        self._ledger = ReservationLedger(ledger_file)
+        self._initialize_data()
+        lock_dir = os.path.join(os.path.dirname(restaurants_file), ".locks")
+        os.makedirs(lock_dir, exist_ok=True)
+        # Held for every write: check, catalog rewrite and ledger append
+        self._catalog_lock = FileLock(os.path.join(lock_dir, "catalog.lock"))
+
+    def _initialize_data(self):
+        """Initialize restaurant and reservation data if they don't exist or are invalid."""
+        # Ensure the data directory exists
+        os.makedirs(os.path.dirname(self.restaurants_file), exist_ok=True)
+
+        # Initialize restaurants.json
+        if not os.path.exists(self.restaurants_file) or os.path.getsize(self.restaurants_file) == 0:
+            restaurants = self._seed()
+            with open(self.restaurants_file, 'w') as f:
+                json.dump(restaurants, f, indent=4)
+
+        # Initialize the reservation ledger, importing reservations.json the first time
+        if not self._ledger.exists():
+            if os.path.exists(self.reservations_file):
+                self._ledger.import_legacy(self.reservations_file)
+            else:
+                self._ledger.create()
+
+    def load_restaurants(self):
+        """Return the restaurant catalog, re-parsing the file only when it has changed on disk.
+
+        The returned list is shared with the cache and must be treated as read-only.
+        """
+        return self._catalog.get(self._read_restaurants)
+
+    def get_restaurant(self, restaurant_name):
+        return self._catalog.find(restaurant_name, self._read_restaurants)
+
+    def find_restaurants(self, cuisine=None, location=None):
+        return [
+            r for r in self.load_restaurants()
+            if (cuisine is None or r["cuisine"].lower() == cuisine.lower())
+            and (location is None or r["location"].lower() == location.lower())
+        ]
+
+    @property
+    def catalog_generation(self):
+        self.load_restaurants()
+        return self._catalog.generation
+
+    @property
+    def inventory_generation(self):
+        self.load_restaurants()
+        return self._catalog.inventory_generation
+
+    def _read_restaurants(self):
+        """Load restaurant data from file with error handling."""
+        try:
+            with open(self.restaurants_file, 'r') as f:
+                content = f.read().strip()
+                if not content:  # If file is empty, reinitialize
+                    restaurants = self._seed()
+                    with open(self.restaurants_file, 'w') as f_write:
+                        json.dump(restaurants, f_write, indent=4)
+                    return restaurants
+                return json.loads(content)
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            # Reinitialize the file if there's an error
+            restaurants = self._seed()
+            with open(self.restaurants_file, 'w') as f:
+                json.dump(restaurants, f, indent=4)
+            return restaurants
+
+    def iter_reservations(self):
+        return iter(self._ledger)
+
+    def reservation_changes(self, position):
+        return self._ledger.read_since(position)
+
+    def save_reservation(self, reservation):
+        self._ledger.append(reservation)
+
+    def get_reservation(self, reservation_id):
+        return self._ledger.find(reservation_id)
+
+    def cancel_reservation(self, reservation_id):
+        """Tombstone the reservation, then put its seats back, under the catalog lock.
+
+        The tombstone goes first: a crash in between leaks seats rather than leaving a
+        live booking whose seats were already handed out again.
+        """
+        reservation = self._ledger.find(reservation_id)
+        if reservation is None:
+            return None
+        restaurant_name, date_time = reservation["restaurant_name"], reservation["date_time"]
+        with self._catalog_lock:
+            # Another thread or process may have cancelled it while we waited
+            if self._ledger.find(reservation_id) is None:
+                return None
+            self._ledger.cancel(reservation_id, durable=True)
+            restaurants = self.load_restaurants()
+            restaurant = self._catalog.find(restaurant_name, self._read_restaurants)
+            if restaurant is not None:
+                slots = dict(restaurant["available_slots"])
+                capacity = restaurant["seating_capacity"]
+                slots[date_time] = min(capacity, slots.get(date_time, capacity) + int(reservation["party_size"]))
+                self._catalog.write(self._with_slots(restaurants, {restaurant_name: slots}))
+        return reservation
+
+    def compact_reservations(self):
+        """Rewrite the ledger, dropping torn or malformed lines and cancelled bookings."""
+        return self._ledger.compact()
+
+    def update_availability(self, restaurant_name, date_time, party_size):
+        with self._catalog_lock:
+            return self._decrement_availability(restaurant_name, date_time, party_size)
+
+    def book_reservation(self, reservation):
+        """Atomically check capacity, decrement it and record the reservation.
+
+        The catalog lock is held for the whole booking, so concurrent bookings (from any
+        process) cannot overbook a slot; they also wait for each other whatever slot they
+        are for. Seats are taken before the ledger append: a crash in between leaks seats
+        rather than recording an unbacked booking.
+        """
+        restaurant_name = reservation["restaurant_name"]
+        date_time = reservation["date_time"]
+        with self._catalog_lock:
+            if not self._decrement_availability(restaurant_name, date_time, reservation["party_size"]):
+                return False
+            self._ledger.append(reservation, durable=True)
+        return True
+
+    def book_reservations(self, reservations, atomic=True):
+        """Book a batch under the catalog lock with one catalog write and one ledger append."""
+        with self._catalog_lock:
+            restaurants = self.load_restaurants()
+            results, changed = [], {}
+            for reservation in reservations:
+                restaurant_name = reservation["restaurant_name"]
+                restaurant = self._catalog.find(restaurant_name, self._read_restaurants)
+                booked = False
+                if restaurant is not None:
+                    if restaurant_name not in changed:
+                        changed[restaurant_name] = dict(restaurant["available_slots"])
+                    slots = changed[restaurant_name]
+                    date_time = reservation["date_time"]
+                    available = slots.get(date_time, restaurant["seating_capacity"])
+                    if available >= int(reservation["party_size"]):
+                        slots[date_time] = available - int(reservation["party_size"])
+                        booked = True
+                results.append(booked)
+            if atomic and not all(results):
+                # Only the copies were edited; the cached catalog is untouched
+                return [False] * len(reservations)
+            if any(results):
+                self._catalog.write(self._with_slots(restaurants, changed))
+            self._ledger.append_many([r for r, booked in zip(reservations, results) if booked], durable=True)
+            return results
+
+    def _decrement_availability(self, restaurant_name, date_time, party_size):
+        """Take seats from a slot and persist the catalog; the caller holds the catalog lock."""
+        # Re-validates the cache against disk, so writes from other processes are seen
+        restaurants = self.load_restaurants()
+        restaurant = self._catalog.find(restaurant_name, self._read_restaurants)
+        if restaurant is None:
+            return False
+        available = restaurant["available_slots"].get(date_time, restaurant["seating_capacity"])
+        if available < int(party_size):
+            return False
+        slots = dict(restaurant["available_slots"])
+        slots[date_time] = available - int(party_size)
+        # Write through the cache so the next load does not re-parse the file
+        self._catalog.write(self._with_slots(restaurants, {restaurant_name: slots}))
+        return True
+
+    @staticmethod
+    def _with_slots(restaurants, slots_by_name):
+        """Return a copy of the catalog with new slot dicts for the named restaurants.
+
+        The cached list and dicts are never edited: the cache only adopts the copy once it
+        is on disk, so a failed write leaves it as it was and readers never see a dict change
+        under them.
+        """
+        return [
+            dict(r, available_slots=slots_by_name[r["name"]]) if r["name"] in slots_by_name else r
+            for r in restaurants
+        ]
+
+    def import_data(self, restaurants, reservations):
+        with self._catalog_lock:
+            self._catalog.write(list(restaurants))
+        tmp_path = self.ledger_file + ".import"
+        open(tmp_path, 'w').close()
+        ReservationLedger(tmp_path).append_many(reservations, durable=True)
+        os.replace(tmp_path, self.ledger_file)
+
+    def import_catalog(self, chunks):
+        """Stream the restaurants into a new restaurants.json, one array item per line."""
+        restaurants = ChunkCounter(chunks)
+        with self._catalog_lock:
+            atomic_write_stream(self.restaurants_file, json_array_pieces(restaurants))
+            # Parsed once, by whichever access comes next
+            self._catalog.invalidate()
+        return restaurants.count
@@ -0,0 +1,73 @@
+# services/llm_backend.py
+
+import re
+import threading
+import time
+from agents.prompt_templates import ERROR_PROMPT
+
+
+class LLMBackend:
+    """Interface for language model backends.
+
+    A request is a (kind, user_input) pair, where kind is one of the agent's steps
+    ("tool_decision", "general_response", "error"). Backends implement
+    `generate_batch`, which answers many requests in one model call; `generate` is the
+    single-request form FoodieSpotAgent uses directly.
+    """
+
+    def generate_batch(self, requests):
+        """Return one result per (kind, user_input) request, in order."""
+        raise NotImplementedError
+
+    def generate(self, kind, user_input=None):
+        return self.generate_batch([(kind, user_input)])[0]
+
+
+BOOKING_WORDS = re.compile(r"\b(book|reserve|reservation|table)\b")
+RESTAURANT = re.compile(r"\brestaurant ([a-z]{1,3})\b")
+DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+TIME = re.compile(r"\b(\d{1,2}:\d{2})\b")
+PARTY = re.compile(r"\bfor (\d+)\b")
+
+
+class RuleBasedLLM(LLMBackend):
+    """Deterministic stand-in model for tests and benchmarks.
+
+    Each batch sleeps `batch_latency` plus `item_latency` per request, mimicking a model
+    whose cost is dominated by a fixed per-call overhead. Tool decisions come from
+    regular expressions: booking words trigger check_availability with whatever of
+    restaurant_id, date, time_slot and party_size the message contains.
+    """
+
+    def __init__(self, batch_latency=0.02, item_latency=0.001):
+        self.batch_latency = batch_latency
+        self.item_latency = item_latency
+        self.batches = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def generate_batch(self, requests):
+        with self._lock:
+            self.batches += 1
+            self.requests += len(requests)
+        time.sleep(self.batch_latency + self.item_latency * len(requests))
+        return [self._answer(kind, user_input) for kind, user_input in requests]
+
+    def _answer(self, kind, user_input):
+        text = (user_input or "").lower()
+        if kind == "tool_decision":
+            if not BOOKING_WORDS.search(text):
+                return {"requires_tool": False}
+            arguments = {}
+            for name, pattern in (("restaurant_id", RESTAURANT), ("date", DATE), ("time_slot", TIME), ("party_size", PARTY)):
+                match = pattern.search(text)
+                if match:
+                    arguments[name] = match.group(1)
+            if "restaurant_id" in arguments:
+                arguments["restaurant_id"] = f"Restaurant {arguments['restaurant_id'].upper()}"
+            if "party_size" in arguments:
+                arguments["party_size"] = int(arguments["party_size"])
+            return {"requires_tool": True, "tool_name": "check_availability", "arguments": arguments}
+        if kind == "error":
+            return ERROR_PROMPT.strip()
+        return "I can help you book a table, recommend a restaurant or look up restaurant details."
@@ -0,0 +1,131 @@
+# services/llm_scheduler.py
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BatchingScheduler:
+    """Micro-batches concurrent `generate` calls into `backend.generate_batch` calls.
+
+    The first request of a batch starts a `max_wait` window; the batch is dispatched
+    when the window closes or `max_batch_size` requests are waiting, whichever comes
+    first. Identical (kind, user_input) requests that are waiting or in flight share
+    one slot in the batch and each caller gets its own copy of the result. Batches run
+    on `executor` (one worker by default, like a single model instance), so requests
+    arriving while a batch runs gather into the next one.
+    """
+
+    def __init__(self, backend, max_batch_size=16, max_wait=0.005, timeout=30.0, executor=None):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self._executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-batch")
+        self._pending = []   # Keys waiting for the next batch, in arrival order
+        self._futures = {}   # Key -> future, for waiting and in-flight requests
+        self._flush_handle = None
+        self._tasks = set()
+        self.requests = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.timeouts = 0
+
+    async def generate(self, kind, user_input=None, timeout=None):
+        """Answer one request through the next batch; raises TimeoutError after `timeout` seconds."""
+        loop = asyncio.get_running_loop()
+        key = (kind, user_input)
+        self.requests += 1
+        future = self._futures.get(key)
+        if future is None:
+            future = self._futures[key] = loop.create_future()
+            self._pending.append(key)
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        else:
+            self.deduplicated += 1
+        try:
+            # Shielded so one caller timing out does not cancel the result for the others
+            result = await asyncio.wait_for(asyncio.shield(future), timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"LLM request {kind!r} timed out") from None
+        return copy.deepcopy(result)
+
+    def _flush(self):
+        """Dispatch up to max_batch_size waiting requests; anything left starts the next window."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if not batch:
+            return
+        loop = asyncio.get_running_loop()
+        task = loop.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        if self._pending:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+    async def _run(self, batch):
+        self.batches += 1
+        self.batched_requests += len(batch)
+        loop = asyncio.get_running_loop()
+        futures = [self._futures[key] for key in batch]
+        try:
+            results = await loop.run_in_executor(self._executor, self.backend.generate_batch, batch)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            results = list(results)
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+            # A short batch must not leave the unanswered requests waiting forever
+            for future in futures[len(results):]:
+                if not future.done():
+                    future.set_exception(RuntimeError(f"Backend returned {len(results)} results for a batch of {len(futures)}."))
+        finally:
+            for key in batch:
+                self._futures.pop(key, None)
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_requests / self.batches if self.batches else 0.0,
+            "timeouts": self.timeouts,
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+class ThreadedLLMClient:
+    """Blocking `generate(kind, user_input)` client over a BatchingScheduler.
+
+    The scheduler runs on a background event loop, so synchronous callers on many
+    threads (e.g. FoodieSpotAgent in a threaded server) still get batched together.
+    """
+
+    def __init__(self, backend, **options):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-scheduler", daemon=True)
+        self._thread.start()
+        self.scheduler = BatchingScheduler(backend, **options)
+
+    def generate(self, kind, user_input=None, timeout=None):
+        return asyncio.run_coroutine_threadsafe(self.scheduler.generate(kind, user_input, timeout), self._loop).result()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.scheduler.close()
@@ -0,0 +1,102 @@
+# services/locking.py
+
+import json
+import os
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; fall back to in-process locking only
+    fcntl = None
+
+
+class FileLock:
+    """Exclusive inter-process lock backed by `flock` on a lock file."""
+
+    _thread_locks = {}
+    _thread_locks_guard = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        with self._thread_locks_guard:
+            self._thread_lock = self._thread_locks.setdefault(path, threading.Lock())
+
+    def acquire(self):
+        # The thread lock keeps one FileLock object safe to share between threads
+        self._thread_lock.acquire()
+        if fcntl is None:
+            return
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def atomic_write_json(path, data, indent=4):
+    """Write JSON to a temp file in the same directory, fsync it and rename it over `path`."""
+    _atomic_write(path, lambda f: json.dump(data, f, indent=indent))
+
+
+def atomic_write_stream(path, pieces):
+    """Like atomic_write_json, but writes an iterable of text pieces, so the content is never held whole."""
+    _atomic_write(path, lambda f: f.writelines(pieces))
+
+
+def json_array_pieces(items):
+    """Text pieces of a JSON array with one item per line, for atomic_write_stream."""
+    yield "["
+    separator = "\n"
+    for item in items:
+        yield separator + json.dumps(item)
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def _atomic_write(path, write):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, 0o644)  # mkstemp creates files as 0600
+        with os.fdopen(fd, 'w') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_dir(directory)
+
+
+def _fsync_dir(directory):
+    """Persist a rename by syncing the containing directory (no-op where unsupported)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,40 @@
+# services/migrate.py
+"""Copy the catalog and reservations from one storage backend to another.
+
+Usage: python -m services.migrate [--from json] [--to sqlite]
+
+The target backend's existing catalog and reservations are replaced.
+"""
+
+import argparse
+from config import RESTAURANTS_FILE, RESERVATIONS_FILE, SQLITE_FILE
+from services.data_service import DataService
+
+BACKENDS = ["json", "sqlite", "partitioned"]
+
+def migrate(source_backend, target_backend, restaurants_file=RESTAURANTS_FILE,
+            reservations_file=RESERVATIONS_FILE, sqlite_file=SQLITE_FILE):
+    """Copy all data from `source_backend` into `target_backend`; returns (restaurants, reservations) counts."""
+    if source_backend == target_backend:
+        raise ValueError("Source and target backends must differ.")
+    source = DataService(restaurants_file, reservations_file, backend=source_backend, sqlite_file=sqlite_file)
+    target = DataService(restaurants_file, reservations_file, backend=target_backend, sqlite_file=sqlite_file)
+    # Copy the slots out, since the partitioned backend's restaurants carry lazy views
+    restaurants = [dict(r, available_slots=dict(r["available_slots"])) for r in source.load_restaurants()]
+    reservations = source.load_reservations()
+    target.storage.import_data(restaurants, reservations)
+    return len(restaurants), len(reservations)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="source", choices=BACKENDS, default="json")
+    parser.add_argument("--to", dest="target", choices=BACKENDS, default="sqlite")
+    parser.add_argument("--restaurants", default=RESTAURANTS_FILE, help="restaurants.json path")
+    parser.add_argument("--reservations", default=RESERVATIONS_FILE, help="reservations.json path (ledger is alongside)")
+    parser.add_argument("--sqlite", default=SQLITE_FILE, help="SQLite database path")
+    args = parser.parse_args()
+    restaurants, reservations = migrate(args.source, args.target, args.restaurants, args.reservations, args.sqlite)
+    print(f"Migrated {restaurants} restaurants and {reservations} reservations from {args.source} to {args.target}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+# services/partitioned_storage.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+from collections.abc import Mapping
+from datetime import date
+from services.catalog_cache import CatalogCache
+from services.locking import FileLock, atomic_write_json, atomic_write_stream, json_array_pieces
+from services.reservation_ledger import ReservationLedger
+from services.storage_backend import ChunkCounter, StorageBackend
+
+STATIC_FIELDS = ("name", "location", "cuisine", "seating_capacity")
+
+
+class LazySlots(Mapping):
+    """Read-only `available_slots` mapping of one restaurant, backed by inventory shards.
+
+    Looking up a slot reads only the shard for its date; iterating reads every date.
+    """
+
+    __slots__ = ("_storage", "_restaurant_name")
+
+    def __init__(self, storage, restaurant_name):
+        self._storage = storage
+        self._restaurant_name = restaurant_name
+
+    def __getitem__(self, date_time):
+        slots = self._storage._slots_for(date_time[:10], self._restaurant_name)
+        return slots[date_time]
+
+    def __iter__(self):
+        for day in self._storage.partition_dates():
+            yield from self._storage._slots_for(day, self._restaurant_name)
+
+    def __len__(self):
+        return sum(len(self._storage._slots_for(day, self._restaurant_name)) for day in self._storage.partition_dates())
+
+    def __repr__(self):
+        return f"LazySlots({self._restaurant_name!r})"
+
+
+class PartitionedStorage(StorageBackend):
+    """JSON backend with slot inventory split into per-date shard files.
+
+    Static restaurant data lives in `catalog.json`. Seats live under `inventory/` as
+    `<date>.json` files, or `<date>.<bucket>.json` when `shards_per_date` > 1 spreads a
+    day's restaurants over buckets by name hash. A booking locks, reads and rewrites
+    only its own shard, so its I/O does not grow with the number of days kept. Shards
+    for past dates are moved into `inventory/archive/` and made read-only, on startup,
+    after an import and on the first booking of each new day.
+
+    `load_restaurants()` keeps the `restaurants.json` shape: each restaurant is a dict
+    whose `available_slots` is a LazySlots view. An existing `restaurants.json` is
+    split into this layout the first time the backend is used.
+    """
+
+    def __init__(self, restaurants_file, reservations_file, ledger_file, seed, shards_per_date=1, archive_past=True):
+        data_dir = os.path.dirname(restaurants_file)
+        self.restaurants_file = restaurants_file
+        self.reservations_file = reservations_file
+        self.ledger_file = ledger_file
+        self.catalog_file = os.path.join(data_dir, "catalog.json")
+        self.inventory_dir = os.path.join(data_dir, "inventory")
+        self.archive_dir = os.path.join(self.inventory_dir, "archive")
+        self.shards_per_date = shards_per_date
+        self.archive_past = archive_past
+        # A counter bumped under its lock on every inventory write, by any process
+        self._changes_file = os.path.join(self.inventory_dir, ".changes")
+        self._lock_dir = os.path.join(data_dir, ".locks")
+        self._seed = seed
+        self._catalog = CatalogCache(self.catalog_file)
+        self._ledger = ReservationLedger(ledger_file)
+        self._shards = {}  # Shard path -> (stat signature, {restaurant: {date_time: seats}})
+        self._shards_lock = threading.Lock()
+        self._dates = None  # (inventory generation, sorted partition dates)
+        self._archived_for = None  # The day archive() last ran for from _archive_past
+        self._initialize_data()
+        self._archive_past()
+
+    def _initialize_data(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        os.makedirs(self._lock_dir, exist_ok=True)
+        with self._changes_lock():
+            try:
+                with open(self._changes_file, 'rb') as f:
+                    content = f.read()
+            except FileNotFoundError:
+                content = b""
+            # Older layouts appended one byte per write; the count carries over
+            if not content.isdigit():
+                self._write_changes(len(content))
+        if not os.path.exists(self.catalog_file):
+            with FileLock(os.path.join(self._lock_dir, "catalog.lock")):
+                if not os.path.exists(self.catalog_file):
+                    self._split(self._read_legacy_catalog())
+        if not self._ledger.exists():
+            if os.path.exists(self.reservations_file):
+                self._ledger.import_legacy(self.reservations_file)
+            else:
+                self._ledger.create()
+
+    def _read_legacy_catalog(self):
+        """The catalog to start from: an existing restaurants.json, else the seed data."""
+        try:
+            with open(self.restaurants_file, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return self._seed()
+
+    def _split(self, restaurants):
+        """Write `restaurants` (in the restaurants.json shape) as inventory shards plus catalog.json."""
+        shards = {}
+        for restaurant in restaurants:
+            name = restaurant["name"]
+            for date_time, seats in restaurant.get("available_slots", {}).items():
+                path = self._shard_path(date_time[:10], name)
+                shards.setdefault(path, {}).setdefault(name, {})[date_time] = seats
+        self._remove_shards()
+        for path, shard in shards.items():
+            atomic_write_json(path, shard, indent=None)
+        # The catalog goes last: its presence marks a completed split
+        atomic_write_json(self.catalog_file, [{field: r[field] for field in STATIC_FIELDS} for r in restaurants])
+        self._reset_caches()
+
+    def _remove_shards(self):
+        for directory in (self.inventory_dir, self.archive_dir):
+            for entry in self._shard_entries(directory):
+                path = os.path.join(directory, entry)
+                os.chmod(path, 0o644)
+                os.remove(path)
+
+    def _reset_caches(self):
+        with self._shards_lock:
+            self._shards.clear()
+        self._catalog.invalidate()
+        self._bump_inventory()
+
+    def _stage(self, chunks, staging_dir):
+        """Spill the restaurants as JSON lines: static fields to one file, slots to one file per shard."""
+        with open(os.path.join(staging_dir, "catalog.jsonl"), 'w') as catalog:
+            for chunk in chunks:
+                lines = {}
+                for restaurant in chunk:
+                    name = restaurant["name"]
+                    catalog.write(json.dumps({field: restaurant[field] for field in STATIC_FIELDS}) + "\n")
+                    days = {}
+                    for date_time, seats in restaurant.get("available_slots", {}).items():
+                        days.setdefault(self._shard_name(date_time[:10], name), {})[date_time] = seats
+                    for shard_name, slots in days.items():
+                        lines.setdefault(shard_name, []).append(json.dumps([name, slots]) + "\n")
+                for shard_name, shard_lines in lines.items():
+                    with open(os.path.join(staging_dir, shard_name + "l"), 'a') as f:
+                        f.writelines(shard_lines)
+
+    @staticmethod
+    def _read_lines(path):
+        with open(path, 'r') as f:
+            for line in f:
+                yield json.loads(line)
+
+    # Catalog
+
+    def _read_catalog(self):
+        with open(self.catalog_file, 'r') as f:
+            static = json.load(f)
+        return [dict(r, available_slots=LazySlots(self, r["name"])) for r in static]
+
+    def load_restaurants(self):
+        """Return the catalog; `available_slots` of each restaurant reads its shards on demand."""
+        return self._catalog.get(self._read_catalog)
+
+    def get_restaurant(self, restaurant_name):
+        return self._catalog.find(restaurant_name, self._read_catalog)
+
+    def find_restaurants(self, cuisine=None, location=None):
+        return [
+            r for r in self.load_restaurants()
+            if (cuisine is None or r["cuisine"].lower() == cuisine.lower())
+            and (location is None or r["location"].lower() == location.lower())
+        ]
+
+    @property
+    def catalog_generation(self):
+        self.load_restaurants()
+        return self._catalog.generation
+
+    @property
+    def inventory_generation(self):
+        with open(self._changes_file, 'rb') as f:
+            return int(f.read())
+
+    def _changes_lock(self):
+        return FileLock(os.path.join(self._lock_dir, "changes.lock"))
+
+    def _write_changes(self, count):
+        # Replaced rather than rewritten in place, so a reader never sees a half-written
+        # count; not fsynced, since it only tells caches to reload
+        tmp_path = self._changes_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(count))
+        os.replace(tmp_path, self._changes_file)
+
+    def _bump_inventory(self):
+        with self._changes_lock():
+            self._write_changes(self.inventory_generation + 1)
+
+    # Inventory shards
+
+    def _shard_name(self, day, restaurant_name):
+        if self.shards_per_date == 1:
+            return f"{day}.json"
+        # crc32 rather than hash() so every process picks the same bucket
+        return f"{day}.{zlib.crc32(restaurant_name.encode('utf-8')) % self.shards_per_date}.json"
+
+    def _shard_path(self, day, restaurant_name):
+        return os.path.join(self.inventory_dir, self._shard_name(day, restaurant_name))
+
+    @staticmethod
+    def _shard_entries(directory):
+        """Shard file names in `directory`, skipping in-progress atomic writes (.tmp-*)."""
+        return [entry for entry in os.listdir(directory) if entry.endswith(".json") and not entry.startswith(".")]
+
+    def _shard_lock(self, path):
+        return FileLock(os.path.join(self._lock_dir, "shard-" + os.path.basename(path) + ".lock"))
+
+    def _load_shard(self, path):
+        """Return the parsed shard at `path`, re-reading it only if it changed on disk; {} if absent."""
+        signature = CatalogCache._stat_signature(path)
+        with self._shards_lock:
+            cached = self._shards.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+        if signature is None:
+            shard = {}
+        else:
+            with open(path, 'r') as f:
+                shard = json.load(f)
+        with self._shards_lock:
+            self._shards[path] = (signature, shard)
+        return shard
+
+    def _write_shard(self, path, shard):
+        atomic_write_json(path, shard, indent=None)
+        with self._shards_lock:
+            self._shards[path] = (CatalogCache._stat_signature(path), shard)
+
+    def _slots_for(self, day, restaurant_name):
+        """The {date_time: seats} of one restaurant on one day, from the live or archived shard."""
+        name = self._shard_name(day, restaurant_name)
+        live = os.path.join(self.inventory_dir, name)
+        shard = self._load_shard(live)
+        if not shard and day < self._today():
+            shard = self._load_shard(os.path.join(self.archive_dir, name))
+        return shard.get(restaurant_name, {})
+
+    def partition_dates(self):
+        """Sorted dates that have live or archived inventory."""
+        generation = self.inventory_generation
+        if self._dates is None or self._dates[0] != generation:
+            days = {entry[:10] for directory in (self.inventory_dir, self.archive_dir)
+                    for entry in self._shard_entries(directory)}
+            self._dates = (generation, sorted(days))
+        return self._dates[1]
+
+    @staticmethod
+    def _today():
+        return date.today().isoformat()
+
+    def _archive_past(self):
+        """Archive the dates before today, once per day (when enabled)."""
+        today = self._today()
+        if self.archive_past and self._archived_for != today:
+            self.archive(today)
+            self._archived_for = today
+
+    def archive(self, before):
+        """Move the shards of dates before `before` (YYYY-MM-DD) into the read-only archive.
+
+        Returns the number of shards moved. Archived slots can still be read, but no
+        longer booked.
+        """
+        moved = 0
+        for entry in sorted(self._shard_entries(self.inventory_dir)):
+            if entry[:10] >= before:
+                continue
+            path = os.path.join(self.inventory_dir, entry)
+            with self._shard_lock(path):
+                if not os.path.exists(path):
+                    continue
+                target = os.path.join(self.archive_dir, entry)
+                os.chmod(path, 0o444)
+                os.replace(path, target)
+                moved += 1
+        if moved:
+            with self._shards_lock:
+                self._shards.clear()
+            self._bump_inventory()
+        return moved
+
+    # Reservations
+
+    def iter_reservations(self):
+        return iter(self._ledger)
+
+    def reservation_changes(self, position):
+        return self._ledger.read_since(position)
+
+    def save_reservation(self, reservation):
+        self._ledger.append(reservation)
+
+    def get_reservation(self, reservation_id):
+        return self._ledger.find(reservation_id)
+
+    def cancel_reservation(self, reservation_id):
+        """Tombstone the reservation, then put its seats back, under its shard's lock.
+
+        Cancelling a booking on an archived date only tombstones it: archived seats are
+        never handed out again.
+        """
+        reservation = self._ledger.find(reservation_id)
+        if reservation is None:
+            return None
+        restaurant = self.get_restaurant(reservation["restaurant_name"])
+        date_time = reservation["date_time"]
+        path = self._shard_path(date_time[:10], reservation["restaurant_name"])
+        with self._shard_lock(path):
+            if self._ledger.find(reservation_id) is None:
+                return None
+            self._ledger.cancel(reservation_id, durable=True)
+            if restaurant is not None and os.path.exists(path):
+                # A copy: readers may be iterating the cached shard's dicts
+                shard = dict(self._load_shard(path))
+                slots = shard[restaurant["name"]] = dict(shard.get(restaurant["name"], {}))
+                capacity = restaurant["seating_capacity"]
+                slots[date_time] = min(capacity, slots.get(date_time, capacity) + int(reservation["party_size"]))
+                self._write_shard(path, shard)
+                self._bump_inventory()
+        return reservation
+
+    def compact_reservations(self):
+        """Rewrite the ledger, dropping torn or malformed lines and cancelled bookings."""
+        return self._ledger.compact()
+
+    def update_availability(self, restaurant_name, date_time, party_size):
+        return self.book_reservations([{"restaurant_name": restaurant_name, "date_time": date_time,
+                                        "party_size": party_size}], record=False)[0]
+
+    def book_reservation(self, reservation):
+        """Take seats in the slot's shard and record the reservation.
+
+        The shard's lock is held for the whole booking, so concurrent bookings of any slot
+        in it (from any process) cannot overbook. As in JsonStorage, seats are taken before
+        the ledger append.
+        """
+        return self.book_reservations([reservation])[0]
+
+    def book_reservations(self, reservations, atomic=True, record=True):
+        """Book a batch under the locks of the shards it touches, writing each of them once."""
+        self._archive_past()  # Before taking shard locks, which archive() takes itself
+        restaurants = [self.get_restaurant(r["restaurant_name"]) for r in reservations]
+        paths = {}
+        for reservation, restaurant in zip(reservations, restaurants):
+            if restaurant is not None:
+                paths[id(reservation)] = self._shard_path(reservation["date_time"][:10], restaurant["name"])
+        locks = [self._shard_lock(path) for path in sorted(set(paths.values()))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            shards = {}
+            results = []
+            for reservation, restaurant in zip(reservations, restaurants):
+                path = paths.get(id(reservation))
+                # Archived dates are read-only: their live shard is gone for good
+                if path is None or reservation["date_time"][:10] < self._today() and \
+                        os.path.exists(os.path.join(self.archive_dir, os.path.basename(path))):
+                    results.append(False)
+                    continue
+                if path not in shards:
+                    # Edit copies: the cache adopts a shard only once it is on disk, and
+                    # readers never see its dicts change under them
+                    shards[path] = {name: dict(slots) for name, slots in self._load_shard(path).items()}
+                slots = shards[path].setdefault(restaurant["name"], {})
+                date_time = reservation["date_time"]
+                available = slots.get(date_time, restaurant["seating_capacity"])
+                if available < int(reservation["party_size"]):
+                    results.append(False)
+                    continue
+                slots[date_time] = available - int(reservation["party_size"])
+                results.append(True)
+            if any(results) and (not atomic or all(results)):
+                for path, shard in shards.items():
+                    self._write_shard(path, shard)
+                self._bump_inventory()
+                if record:
+                    self._ledger.append_many([r for r, booked in zip(reservations, results) if booked], durable=True)
+                return results
+            return [False] * len(reservations) if atomic else results
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def import_catalog(self, chunks):
+        """Stage the feed on disk, then build each shard and catalog.json from the staged lines.
+
+        Only one chunk, and then one shard, is held in memory at a time.
+        """
+        restaurants = ChunkCounter(chunks)
+        staging_dir = tempfile.mkdtemp(dir=os.path.dirname(self.catalog_file), prefix=".import-")
+        try:
+            self._stage(restaurants.iter_chunks(), staging_dir)
+            with FileLock(os.path.join(self._lock_dir, "catalog.lock")):
+                self._remove_shards()
+                for entry in sorted(os.listdir(staging_dir)):
+                    if entry == "catalog.jsonl":
+                        continue
+                    atomic_write_json(os.path.join(self.inventory_dir, entry[:-1]),
+                                      dict(self._read_lines(os.path.join(staging_dir, entry))), indent=None)
+                atomic_write_stream(self.catalog_file, json_array_pieces(self._read_lines(os.path.join(staging_dir, "catalog.jsonl"))))
+                self._reset_caches()
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        if self.archive_past:
+            self.archive(self._today())
+        return restaurants.count
+
+    def import_data(self, restaurants, reservations):
+        with FileLock(os.path.join(self._lock_dir, "catalog.lock")):
+            self._split(list(restaurants))
+        if self.archive_past:
+            self.archive(self._today())
+        tmp_path = self.ledger_file + ".import"
+        open(tmp_path, 'w').close()
+        ReservationLedger(tmp_path).append_many(reservations, durable=True)
+        os.replace(tmp_path, self.ledger_file)
@@ -0,0 +1,116 @@
+# services/ranking.py
+
+import heapq
+import math
+from collections import OrderedDict
+from weakref import WeakKeyDictionary
+import numpy as np
+
+# Score contributions; callers can override any of them per request
+DEFAULT_WEIGHTS = {
+    "cuisine_match": 1.0,    # Every candidate matches the cuisine filter
+    "ideal_fit": 0.5,        # Free seats are 1x-2x the party size
+    "roomy": 0.3,            # More than 2x the party size (less cozy)
+    "same_location": 0.4,
+    "nearby_location": 0.2,
+}
+
+# Locations considered close to each user location
+NEARBY_LOCATIONS = {
+    "Downtown": {"Midtown", "Uptown"},
+    "Midtown": {"Downtown", "Uptown"},
+    "Uptown": {"Midtown", "Downtown"},
+    "Eastside": {"Downtown", "Midtown"},
+    "Westside": {"Downtown", "Midtown"},
+}
+
+DEFAULT_USER_LOCATION = "Downtown"
+
+# Rankers kept per engine; each request can bring its own weights
+RANKER_CACHE_SIZE = 32
+
+
+class Ranker:
+    """Scores restaurants from an AvailabilityEngine and selects the top results with a bounded heap.
+
+    Location proximity depends only on the user's location, so it is computed once per
+    (engine, location, weights) as a lookup table over the engine's interned location codes.
+    """
+
+    def __init__(self, engine, user_location=DEFAULT_USER_LOCATION, weights=None):
+        self.engine = engine
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        nearby = {location.lower() for location in NEARBY_LOCATIONS.get(user_location, ())}
+        table = np.zeros(max(len(engine.location_of), 1), dtype=np.float64)
+        for location, code in engine.location_of.items():
+            if location == user_location.lower():
+                table[code] = self.weights["same_location"]
+            elif location in nearby:
+                table[code] = self.weights["nearby_location"]
+        # Static per-restaurant feature: proximity score for this user location
+        self.location_score = table[engine.location_codes]
+
+    def scores(self, rows, seats, party_size):
+        """Score candidate rows given their free seats at the requested slot."""
+        ratio = seats[rows] / party_size
+        fit = np.where(ratio <= 2.0, self.weights["ideal_fit"], self.weights["roomy"])
+        # Rounded so equal weight sums tie exactly (0.3 + 0.4 != 0.5 + 0.2 in floating point)
+        return np.round(self.weights["cuisine_match"] + fit + self.location_score[rows], 9)
+
+    def top(self, party_size, date_time, cuisine=None, offset=0, limit=3):
+        """Return (total candidates, [(row, score, seats), ...]) for one page of results.
+
+        The full candidate list is never sorted: a partition finds the score cutoff, and only
+        the offset + limit survivors go through the heap.
+        """
+        engine = self.engine
+        seats = engine.seats_at(date_time)
+        rows = engine.restaurants_with_seats(party_size, date_time, cuisine=cuisine)
+        scores = self.scores(rows, seats, party_size)
+        wanted = offset + limit
+        keep = np.arange(len(rows))
+        if len(rows) > wanted:
+            cutoff = np.partition(scores, len(rows) - wanted)[len(rows) - wanted]
+            above = np.flatnonzero(scores > cutoff)
+            # Ties at the cutoff are taken in catalog order, like the original stable sort
+            keep = np.sort(np.concatenate([above, np.flatnonzero(scores == cutoff)[:wanted - len(above)]]))
+        best = heapq.nlargest(wanted, keep.tolist(), key=scores.__getitem__)[offset:]
+        return len(rows), [(int(rows[i]), float(scores[i]), int(seats[rows[i]])) for i in best]
+
+
+_rankers = WeakKeyDictionary()  # engine -> OrderedDict {(location, weights): Ranker}, in LRU order
+
+
+def _checked_weights(weights):
+    """`weights` as {name: float}; raises ValueError for an unknown name or a non-finite weight."""
+    checked = {}
+    for name, value in (weights or {}).items():
+        if name not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown weight {name!r}; expected one of {', '.join(DEFAULT_WEIGHTS)}.")
+        try:
+            checked[name] = float(value)
+        except (TypeError, ValueError):
+            checked[name] = math.nan
+        if isinstance(value, bool) or not math.isfinite(checked[name]):
+            raise ValueError(f"Weight {name!r} must be a finite number.")
+    return checked
+
+
+def get_ranker(engine, user_location=DEFAULT_USER_LOCATION, weights=None):
+    """Return a cached Ranker for this engine, location and weights.
+
+    Bookings only change seat counts, never rows, so a ranker lives as long as its engine,
+    or until RANKER_CACHE_SIZE more recently used ones push it out. Raises ValueError for
+    invalid weights.
+    """
+    weights = _checked_weights(weights)
+    cache = _rankers.setdefault(engine, OrderedDict())
+    key = (user_location, tuple(sorted(weights.items())))
+    ranker = cache.get(key)
+    if ranker is None:
+        ranker = cache[key] = Ranker(engine, user_location, weights)
+        while len(cache) > RANKER_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return ranker
@@ -0,0 +1,127 @@
+# services/reservation_index.py
+
+from bisect import bisect_left, insort
+from itertools import count
+
+
+def customer_key(customer):
+    """Normalized lookup key for a customer name or contact ("Ann@Example.com " -> "ann@example.com")."""
+    return " ".join(str(customer).casefold().split())
+
+
+class ReservationIndex:
+    """In-memory secondary indexes over live reservations.
+
+    - per restaurant, (date_time, seq) keys sorted by time, so a time-range lookup is
+      two bisections plus the size of the answer;
+    - per date ("YYYY-MM-DD"), the reservations made for that day;
+    - per customer (the record's optional "customer" field, normalized), their bookings;
+    - by reservation ID.
+
+    `add` and `remove` keep every index current after a write. `inventory_generation`
+    records the storage state the index reflects, as for the other derived views, and
+    `ledger_position` how far into the reservation ledger it has read, if there is one.
+    """
+
+    def __init__(self, inventory_generation=None):
+        self.inventory_generation = inventory_generation
+        self.ledger_position = None
+        self._records = {}  # seq -> record
+        self._seq = count()
+        self._by_restaurant = {}  # restaurant_name -> sorted [(date_time, seq)]
+        self._by_date = {}  # "YYYY-MM-DD" -> {seq: None}, in insertion order
+        self._by_customer = {}  # customer key -> {seq: None}
+        self._by_id = {}  # reservation_id -> seq
+
+    @classmethod
+    def from_reservations(cls, reservations, inventory_generation=None):
+        index = cls(inventory_generation)
+        by_restaurant = index._by_restaurant
+        for reservation in reservations:
+            seq = index._insert(reservation)
+            by_restaurant.setdefault(reservation["restaurant_name"], []).append((reservation["date_time"], seq))
+        # One sort per restaurant instead of an insort per record
+        for keys in by_restaurant.values():
+            keys.sort()
+        return index
+
+    @classmethod
+    def from_ledger(cls, records, inventory_generation=None):
+        """Build from ledger records in file order, tombstones included."""
+        live = {}
+        for line, record in enumerate(records):
+            if "cancelled" in record:
+                live.pop(record["cancelled"], None)
+            else:
+                live[record.get("reservation_id", line)] = record
+        return cls.from_reservations(live.values(), inventory_generation)
+
+    def __len__(self):
+        return len(self._records)
+
+    def _insert(self, reservation):
+        """Register a record in every index except the per-restaurant lists; returns its seq."""
+        seq = next(self._seq)
+        self._records[seq] = reservation
+        self._by_date.setdefault(reservation["date_time"][:10], {})[seq] = None
+        if reservation.get("customer"):
+            self._by_customer.setdefault(customer_key(reservation["customer"]), {})[seq] = None
+        if "reservation_id" in reservation:
+            self._by_id[reservation["reservation_id"]] = seq
+        return seq
+
+    def add(self, reservation):
+        seq = self._insert(reservation)
+        insort(self._by_restaurant.setdefault(reservation["restaurant_name"], []), (reservation["date_time"], seq))
+
+    def remove(self, reservation_id):
+        """Drop a reservation by ID; returns the record, or None if it is not indexed."""
+        seq = self._by_id.pop(reservation_id, None)
+        if seq is None:
+            return None
+        reservation = self._records.pop(seq)
+        keys = self._by_restaurant[reservation["restaurant_name"]]
+        del keys[bisect_left(keys, (reservation["date_time"], seq))]
+        day = self._by_date[reservation["date_time"][:10]]
+        del day[seq]
+        if not day:
+            del self._by_date[reservation["date_time"][:10]]
+        if reservation.get("customer"):
+            key = customer_key(reservation["customer"])
+            del self._by_customer[key][seq]
+            if not self._by_customer[key]:
+                del self._by_customer[key]
+        return reservation
+
+    def apply_ledger(self, records):
+        """Apply ledger records appended since the index was built, tombstones included.
+
+        Records already indexed, because our own writes were patched in, are skipped.
+        """
+        for record in records:
+            if "cancelled" in record:
+                self.remove(record["cancelled"])
+            elif record.get("reservation_id") not in self._by_id:
+                self.add(record)
+
+    def get(self, reservation_id):
+        seq = self._by_id.get(reservation_id)
+        return None if seq is None else self._records[seq]
+
+    def reservations_between(self, restaurant_name, start, end):
+        """Reservations at a restaurant with start <= date_time < end, in time order.
+
+        `start` and `end` are "YYYY-MM-DD HH:MM" strings (or any prefix, e.g. a date).
+        """
+        keys = self._by_restaurant.get(restaurant_name, [])
+        lo = bisect_left(keys, (start,))
+        hi = bisect_left(keys, (end,), lo)
+        return [self._records[seq] for _, seq in keys[lo:hi]]
+
+    def on_date(self, day):
+        """All reservations for one "YYYY-MM-DD" date, in booking order."""
+        return [self._records[seq] for seq in self._by_date.get(day, ())]
+
+    def by_customer(self, customer):
+        """A customer's reservations in booking order; names and contacts match ignoring case and spacing."""
+        return [self._records[seq] for seq in self._by_customer.get(customer_key(customer), ())]
@@ -0,0 +1,170 @@
+# services/reservation_ledger.py
+
+import json
+import os
+import threading
+from services.locking import FileLock, _fsync_dir
+
+
+class ReservationLedger:
+    """Append-only JSON-lines store for reservations.
+
+    Each booking is one line appended to the end of the file, so saving a reservation
+    costs the same no matter how many are already stored. A cancellation appends a
+    tombstone line, {"cancelled": <reservation_id>}, which hides the original record.
+
+    `find` serves lookups by reservation ID from an in-memory index that is built on
+    first use and then only reads lines appended since, by this or any other process;
+    `read_since` gives other indexes the same tail reads.
+
+    Appends and compaction take the same exclusive lock (`.locks/<ledger>.lock`), so a
+    compaction never replaces the file under an append it did not copy.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock_path = os.path.join(os.path.dirname(path) or ".", ".locks", os.path.basename(path) + ".lock")
+        self._index = {}  # reservation_id -> record, for live records that have one
+        self._indexed = None  # (inode, byte offset) of the file read into the index so far
+        self._index_lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def create(self):
+        """Create an empty ledger file if none exists."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        if not self.exists():
+            open(self.path, 'a').close()
+
+    def append(self, record, durable=False):
+        """Append a single record as one JSON line."""
+        self.append_many([record], durable)
+
+    def append_many(self, records, durable=False):
+        """Append several records with a single write; `durable` also fsyncs before returning."""
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        if not lines:
+            return
+        with self._lock(), open(self.path, 'a+b') as f:
+            # Start on a fresh line if a previous append was cut short
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines = "\n" + lines
+            f.write(lines.encode("utf-8"))
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _lock(self):
+        os.makedirs(os.path.dirname(self._lock_path), exist_ok=True)
+        return FileLock(self._lock_path)
+
+    def cancel(self, reservation_id, durable=False):
+        """Append a tombstone for `reservation_id`; the caller checks it is live first."""
+        self.append({"cancelled": reservation_id}, durable)
+
+    def find(self, reservation_id):
+        """Return the live record with this reservation ID, or None."""
+        with self._index_lock:
+            self._refresh_index()
+            return self._index.get(reservation_id)
+
+    def _refresh_index(self):
+        """Read lines appended since the last refresh; a replaced file (compaction) is re-read whole."""
+        records, self._indexed, from_start = self.read_since(self._indexed)
+        if from_start:
+            self._index = {}
+        for record in records:
+            if "cancelled" in record:
+                self._index.pop(record["cancelled"], None)
+            elif "reservation_id" in record:
+                self._index[record["reservation_id"]] = record
+
+    def read_since(self, position):
+        """Return (records, position, from_start) for the lines appended after `position`.
+
+        Records come in file order with tombstones included. Pass the returned position
+        next time. If `position` is None, or the file was replaced (compacted) or truncated
+        since, the whole file is read and `from_start` is True.
+        """
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return [], None, True
+        with f:
+            stat = os.fstat(f.fileno())
+            from_start = position is None or position[0] != stat.st_ino or position[1] > stat.st_size
+            offset = 0 if from_start else position[1]
+            f.seek(offset)
+            lines = []
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # A torn tail is read again once its append finishes
+                lines.append(line.decode("utf-8"))
+                offset += len(line)
+        return list(self._parse(lines)), (stat.st_ino, offset), from_start
+
+    @staticmethod
+    def _parse(lines):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # A partially written trailing line from an interrupted append
+                continue
+
+    def _lines(self):
+        try:
+            with open(self.path, 'r') as f:
+                yield from f
+        except FileNotFoundError:
+            return
+
+    def __iter__(self):
+        """Stream live records back from disk, skipping blank or torn lines and cancelled bookings."""
+        # A first pass collects only the (few) tombstones, so memory stays bounded
+        cancelled = {record["cancelled"] for record in self._parse(line for line in self._lines() if '"cancelled"' in line)
+                     if "cancelled" in record}
+        for record in self._parse(self._lines()):
+            if "cancelled" in record or record.get("reservation_id") in cancelled:
+                continue
+            yield record
+
+    def compact(self):
+        """Rewrite the ledger keeping only well-formed, live records; returns the record count.
+
+        Appends wait for the whole rewrite, and the new file is fsynced before it replaces
+        the old one, so no acknowledged booking is lost.
+        """
+        tmp_path = self.path + ".compact"
+        count = 0
+        with self._lock():
+            with open(tmp_path, 'w') as f:
+                for record in self:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            _fsync_dir(os.path.dirname(self.path) or ".")
+        return count
+
+    def import_legacy(self, json_path):
+        """One-time import of a legacy `reservations.json` array; returns the number imported."""
+        try:
+            with open(json_path, 'r') as f:
+                content = f.read().strip()
+            reservations = json.loads(content) if content else []
+        except (json.JSONDecodeError, FileNotFoundError):
+            reservations = []
+        tmp_path = self.path + ".import"
+        with open(tmp_path, 'w') as f:
+            for record in reservations:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self.path)
+        return len(reservations)
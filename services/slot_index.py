@@ -0,0 +1,114 @@
+# services/slot_index.py
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from itertools import islice
+from services.datetime_parser import SLOT_FORMAT, local_timezone, parse_slot
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _minutes(date_time):
+    parsed = parse_slot(date_time)
+    return None if parsed is None else int((parsed - EPOCH).total_seconds()) // 60
+
+
+class SlotIndex:
+    """Per-restaurant sorted lists of the listed slots that still have seats.
+
+    Finding the nearest open slots is a bisect followed by walking outward in both
+    directions, so it costs O(log n + k) instead of scanning every slot. Unlisted slots
+    are not indexed: with no opening hours in the catalog there is nothing to bound them.
+    """
+
+    def __init__(self, restaurants, inventory_generation=None):
+        self.inventory_generation = inventory_generation
+        self._open = {}   # restaurant name -> sorted slot keys with seats left
+        self._seats = {}  # restaurant name -> {slot key: seats}
+        for restaurant in restaurants:
+            seats = dict(restaurant["available_slots"])
+            self._seats[restaurant["name"]] = seats
+            self._open[restaurant["name"]] = sorted(key for key, left in seats.items() if left > 0)
+
+    def apply(self, restaurant_name, date_time, seats):
+        """Record the new seat count for a slot, adding or dropping it from the open list."""
+        slots = self._seats.get(restaurant_name)
+        if slots is None:
+            return
+        was_open = slots.get(date_time, 0) > 0
+        slots[date_time] = seats
+        open_slots = self._open[restaurant_name]
+        if seats > 0 and not was_open:
+            insort(open_slots, date_time)
+        elif seats <= 0 and was_open:
+            del open_slots[bisect_left(open_slots, date_time)]
+
+    def nearest(self, restaurant_name, date_time, party_size, k=3, now=None):
+        """Return up to k (slot key, seats) pairs closest in time to `date_time` that fit the party.
+
+        The requested slot itself is excluded, as are slots at or before `now` if given.
+        """
+        open_slots = self._open.get(restaurant_name, [])
+        slots = self._seats.get(restaurant_name, {})
+        target = _minutes(date_time)
+        if target is None:
+            return []
+        floor = bisect_right(open_slots, now) if now else 0
+        before = bisect_left(open_slots, date_time) - 1
+        after = max(before + 1, floor)
+        if after < len(open_slots) and open_slots[after] == date_time:
+            after += 1
+        found = []
+        # Merge the two directions by distance; slots too small for the party are skipped
+        while len(found) < k and (before >= floor or after < len(open_slots)):
+            before_gap = target - _minutes(open_slots[before]) if before >= floor else None
+            after_gap = _minutes(open_slots[after]) - target if after < len(open_slots) else None
+            if after_gap is None or (before_gap is not None and before_gap <= after_gap):
+                key, before = open_slots[before], before - 1
+            else:
+                key, after = open_slots[after], after + 1
+            if slots[key] >= party_size:
+                found.append((key, slots[key]))
+        return found
+
+
+def _local_now():
+    return datetime.now(local_timezone()).strftime(SLOT_FORMAT)
+
+
+def find_alternatives(data_service, restaurant_name, date_time, party_size, k=3, now=None):
+    """Suggest other options when `restaurant_name` cannot seat the party at `date_time`.
+
+    Returns {"same_restaurant": [...], "nearby": [...]}, each a list of up to k dicts with
+    "restaurant_name", "date_time" and "seats". Nearby options are same-cuisine restaurants,
+    those in the same location first, at the requested time or their nearest open slot.
+    Only listed slots after `now` (by default the current local time) are suggested, so a
+    restaurant with no listed slot left is offered only at the requested time.
+    """
+    restaurant = data_service.get_restaurant(restaurant_name)
+    if restaurant is None:
+        return {"same_restaurant": [], "nearby": []}
+    now = now or _local_now()
+    index = data_service.get_slot_index()
+    same_restaurant = [
+        {"restaurant_name": restaurant_name, "date_time": key, "seats": seats}
+        for key, seats in index.nearest(restaurant_name, date_time, party_size, k, now)
+    ]
+
+    engine = data_service.get_availability_engine()
+    seats_now = engine.seats_at(date_time)
+    same_cuisine = engine.mask(cuisine=restaurant["cuisine"])
+    same_cuisine[engine.row_of[restaurant_name]] = False
+    same_location = engine.mask(location=restaurant["location"])
+
+    def candidates():
+        for rows in (same_cuisine & same_location, same_cuisine & ~same_location):
+            # Restaurants free at the requested time first, then each one's nearest open slot
+            fits_now = rows & (seats_now >= party_size) & (date_time > now)
+            for row in fits_now.nonzero()[0]:
+                yield {"restaurant_name": engine.names[row], "date_time": date_time, "seats": int(seats_now[row])}
+            for row in (rows & ~fits_now).nonzero()[0]:
+                for key, seats in index.nearest(engine.names[row], date_time, party_size, 1, now):
+                    yield {"restaurant_name": engine.names[row], "date_time": key, "seats": seats}
+
+    return {"same_restaurant": same_restaurant, "nearby": list(islice(candidates(), k))}
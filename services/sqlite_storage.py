@@ -0,0 +1,357 @@
+# services/sqlite_storage.py
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from services.storage_backend import StorageBackend
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS restaurants (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    cuisine TEXT NOT NULL,
+    seating_capacity INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_restaurants_name ON restaurants (name);
+CREATE INDEX IF NOT EXISTS idx_restaurants_cuisine ON restaurants (cuisine COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_restaurants_location ON restaurants (location COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS slots (
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants (id) ON DELETE CASCADE,
+    date_time TEXT NOT NULL,
+    available INTEGER NOT NULL,
+    PRIMARY KEY (restaurant_id, date_time)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    restaurant_name TEXT NOT NULL,
+    date_time TEXT NOT NULL,
+    party_size INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    reservation_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_slot ON reservations (restaurant_name, date_time);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('catalog_version', 0), ('inventory_version', 0);
+"""
+
+
+class SqliteStorage(StorageBackend):
+    """SQLite backend with indexed restaurant and slot lookups, running in WAL mode."""
+
+    def __init__(self, db_file, seed):
+        self.db_file = db_file
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._restaurants = None
+        self._by_name = {}
+        self._cached_version = None
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        # Databases created before reservation IDs get the column added in place
+        if "reservation_id" not in {row[1] for row in conn.execute("PRAGMA table_info(reservations)")}:
+            conn.execute("ALTER TABLE reservations ADD COLUMN reservation_id TEXT")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_reservations_id ON reservations (reservation_id)")
+        if conn.execute("SELECT COUNT(*) FROM restaurants").fetchone()[0] == 0:
+            self._write_catalog(conn, seed())
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: transactions are opened explicitly with BEGIN
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def _write_transaction(conn):
+        """Run a block inside BEGIN IMMEDIATE ... COMMIT, rolling back on error."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _versions(conn):
+        """Return (catalog_version, inventory_version)."""
+        return tuple(row[0] for row in conn.execute(
+            "SELECT value FROM meta WHERE key IN ('catalog_version', 'inventory_version') ORDER BY key"))
+
+    @staticmethod
+    def _bump_version(conn, key):
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = ?", (key,))
+
+    def load_restaurants(self):
+        """Return the catalog as `restaurants.json`-shaped dicts, rebuilt only when it changed.
+
+        The returned list is shared with the cache and must be treated as read-only.
+        """
+        conn = self._connection()
+        version = self._versions(conn)
+        with self._cache_lock:
+            if self._restaurants is None or version != self._cached_version:
+                restaurants = []
+                by_id = {}
+                for row in conn.execute("SELECT id, name, location, cuisine, seating_capacity FROM restaurants ORDER BY id"):
+                    restaurant = {
+                        "name": row[1],
+                        "location": row[2],
+                        "cuisine": row[3],
+                        "seating_capacity": row[4],
+                        "available_slots": {}
+                    }
+                    by_id[row[0]] = restaurant
+                    restaurants.append(restaurant)
+                for restaurant_id, date_time, available in conn.execute("SELECT restaurant_id, date_time, available FROM slots"):
+                    by_id[restaurant_id]["available_slots"][date_time] = available
+                self._restaurants = restaurants
+                self._by_name = {r["name"]: r for r in restaurants}
+                self._cached_version = version
+            return self._restaurants
+
+    def _cached(self, conn):
+        """The cached {name: restaurant} if it is current, else None."""
+        version = self._versions(conn)
+        with self._cache_lock:
+            if self._restaurants is not None and version == self._cached_version:
+                return self._by_name
+        return None
+
+    def _select_restaurants(self, conn, where, args):
+        """Restaurants matching `where`, with their slots, read by one indexed query."""
+        restaurants = {}
+        for row in conn.execute(
+            "SELECT r.id, r.name, r.location, r.cuisine, r.seating_capacity, s.date_time, s.available FROM restaurants r "
+            f"LEFT JOIN slots s ON s.restaurant_id = r.id WHERE {where} ORDER BY r.id", args
+        ):
+            restaurant = restaurants.get(row[0])
+            if restaurant is None:
+                restaurant = restaurants[row[0]] = {"name": row[1], "location": row[2], "cuisine": row[3],
+                                                    "seating_capacity": row[4], "available_slots": {}}
+            if row[5] is not None:
+                restaurant["available_slots"][row[5]] = row[6]
+        return list(restaurants.values())
+
+    def get_restaurant(self, restaurant_name):
+        """One restaurant from the cache if it is current, else by name from the indexed tables.
+
+        Another process's booking only costs this one restaurant's rows, not a catalog reload.
+        """
+        conn = self._connection()
+        cached = self._cached(conn)
+        if cached is not None:
+            return cached.get(restaurant_name)
+        found = self._select_restaurants(conn, "r.name = ?", (restaurant_name,))
+        return found[0] if found else None
+
+    def find_restaurants(self, cuisine=None, location=None):
+        conn = self._connection()
+        clauses, args = [], []
+        if cuisine is not None:
+            clauses.append("cuisine = ? COLLATE NOCASE")
+            args.append(cuisine)
+        if location is not None:
+            clauses.append("location = ? COLLATE NOCASE")
+            args.append(location)
+        where = " AND ".join(clauses) or "1"
+        cached = self._cached(conn)
+        if cached is None:
+            return self._select_restaurants(conn, where, args)
+        names = [row[0] for row in conn.execute(f"SELECT name FROM restaurants WHERE {where} ORDER BY id", args)]
+        return [cached[name] for name in names if name in cached]
+
+    @property
+    def catalog_generation(self):
+        return self._versions(self._connection())[0]
+
+    @property
+    def inventory_generation(self):
+        return self._versions(self._connection())[1]
+
+    def iter_reservations(self):
+        for (record,) in self._connection().execute("SELECT record FROM reservations ORDER BY id"):
+            yield json.loads(record)
+
+    def save_reservation(self, reservation):
+        self._insert_reservation(self._connection(), reservation)
+
+    @staticmethod
+    def _insert_reservation(conn, reservation):
+        conn.execute(
+            "INSERT INTO reservations (restaurant_name, date_time, party_size, record, reservation_id) VALUES (?, ?, ?, ?, ?)",
+            (reservation["restaurant_name"], reservation["date_time"], int(reservation["party_size"]), json.dumps(reservation),
+             reservation.get("reservation_id"))
+        )
+
+    def get_reservation(self, reservation_id):
+        row = self._connection().execute("SELECT record FROM reservations WHERE reservation_id = ?", (reservation_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def cancel_reservation(self, reservation_id):
+        """Delete the reservation and put its seats back in one write transaction."""
+        conn = self._connection()
+        with self._write_transaction(conn):
+            row = conn.execute("SELECT id, record FROM reservations WHERE reservation_id = ?", (reservation_id,)).fetchone()
+            if row is None:
+                return None
+            reservation = json.loads(row[1])
+            conn.execute("DELETE FROM reservations WHERE id = ?", (row[0],))
+            restaurant_name, date_time = reservation["restaurant_name"], reservation["date_time"]
+            slot = conn.execute(
+                "SELECT r.id, r.seating_capacity, COALESCE(s.available, r.seating_capacity) FROM restaurants r "
+                "LEFT JOIN slots s ON s.restaurant_id = r.id AND s.date_time = ? WHERE r.name = ?",
+                (date_time, restaurant_name)
+            ).fetchone()
+            if slot is None:
+                return reservation
+            remaining = min(slot[1], slot[2] + int(reservation["party_size"]))
+            conn.execute(
+                "INSERT INTO slots (restaurant_id, date_time, available) VALUES (?, ?, ?) "
+                "ON CONFLICT (restaurant_id, date_time) DO UPDATE SET available = excluded.available",
+                (slot[0], date_time, remaining)
+            )
+            self._bump_version(conn, "inventory_version")
+            version = self._versions(conn)
+        self._apply_local_write(restaurant_name, date_time, remaining, version)
+        return reservation
+
+    def update_availability(self, restaurant_name, date_time, party_size):
+        return self._transaction(restaurant_name, date_time, party_size, None)
+
+    def book_reservation(self, reservation):
+        return self._transaction(reservation["restaurant_name"], reservation["date_time"], reservation["party_size"], reservation)
+
+    def _transaction(self, restaurant_name, date_time, party_size, reservation):
+        """Check and take seats (and optionally store the reservation) in one write transaction."""
+        conn = self._connection()
+        with self._write_transaction(conn):
+            # Served by the restaurants name index and the slots primary key
+            row = conn.execute(
+                "SELECT r.id, COALESCE(s.available, r.seating_capacity) FROM restaurants r "
+                "LEFT JOIN slots s ON s.restaurant_id = r.id AND s.date_time = ? WHERE r.name = ?",
+                (date_time, restaurant_name)
+            ).fetchone()
+            if row is None or row[1] < int(party_size):
+                return False
+            remaining = row[1] - int(party_size)
+            conn.execute(
+                "INSERT INTO slots (restaurant_id, date_time, available) VALUES (?, ?, ?) "
+                "ON CONFLICT (restaurant_id, date_time) DO UPDATE SET available = excluded.available",
+                (row[0], date_time, remaining)
+            )
+            if reservation is not None:
+                self._insert_reservation(conn, reservation)
+            self._bump_version(conn, "inventory_version")
+            version = self._versions(conn)
+        self._apply_local_write(restaurant_name, date_time, remaining, version)
+        return True
+
+    def book_reservations(self, reservations, atomic=True):
+        """Book a batch in a single write transaction."""
+        conn = self._connection()
+        results, writes = [], {}
+        with self._write_transaction(conn):
+            conn.execute("SAVEPOINT batch")
+            for reservation in reservations:
+                restaurant_name, date_time = reservation["restaurant_name"], reservation["date_time"]
+                row = conn.execute(
+                    "SELECT r.id, COALESCE(s.available, r.seating_capacity) FROM restaurants r "
+                    "LEFT JOIN slots s ON s.restaurant_id = r.id AND s.date_time = ? WHERE r.name = ?",
+                    (date_time, restaurant_name)
+                ).fetchone()
+                if row is None or row[1] < int(reservation["party_size"]):
+                    results.append(False)
+                    if atomic:
+                        break
+                    continue
+                remaining = row[1] - int(reservation["party_size"])
+                conn.execute(
+                    "INSERT INTO slots (restaurant_id, date_time, available) VALUES (?, ?, ?) "
+                    "ON CONFLICT (restaurant_id, date_time) DO UPDATE SET available = excluded.available",
+                    (row[0], date_time, remaining)
+                )
+                self._insert_reservation(conn, reservation)
+                writes[(restaurant_name, date_time)] = remaining
+                results.append(True)
+            if atomic and not all(results):
+                conn.execute("ROLLBACK TO batch")
+                return [False] * len(reservations)
+            if writes:
+                self._bump_version(conn, "inventory_version")
+            version = self._versions(conn)
+        if writes:
+            self._apply_local_writes(writes, version)
+        return results
+
+    def _apply_local_write(self, restaurant_name, date_time, remaining, version):
+        self._apply_local_writes({(restaurant_name, date_time): remaining}, version)
+
+    def _apply_local_writes(self, writes, version):
+        """Patch the cached catalog so our own write does not force a rebuild.
+
+        Each touched restaurant gets a new slots dict rather than an edit of the old one,
+        which other threads may be iterating.
+        """
+        with self._cache_lock:
+            if self._restaurants is not None and self._cached_version == (version[0], version[1] - 1):
+                slots_by_name = {}
+                for (restaurant_name, date_time), remaining in writes.items():
+                    if restaurant_name not in slots_by_name:
+                        slots_by_name[restaurant_name] = dict(self._by_name[restaurant_name]["available_slots"])
+                    slots_by_name[restaurant_name][date_time] = remaining
+                for restaurant_name, slots in slots_by_name.items():
+                    self._by_name[restaurant_name]["available_slots"] = slots
+                self._cached_version = version
+
+    def _write_catalog(self, conn, restaurants):
+        self._import_chunks(conn, [restaurants])
+
+    def _import_chunks(self, conn, chunks):
+        """Replace restaurants and slots with the given chunks in one write transaction; returns the count."""
+        count = 0
+        with self._write_transaction(conn):
+            conn.execute("DELETE FROM slots")
+            conn.execute("DELETE FROM restaurants")
+            for chunk in chunks:
+                for restaurant in chunk:
+                    cursor = conn.execute(
+                        "INSERT INTO restaurants (name, location, cuisine, seating_capacity) VALUES (?, ?, ?, ?)",
+                        (restaurant["name"], restaurant["location"], restaurant["cuisine"], restaurant["seating_capacity"])
+                    )
+                    conn.executemany(
+                        "INSERT INTO slots (restaurant_id, date_time, available) VALUES (?, ?, ?)",
+                        [(cursor.lastrowid, date_time, available) for date_time, available in restaurant.get("available_slots", {}).items()]
+                    )
+                count += len(chunk)
+            self._bump_version(conn, "catalog_version")
+            self._bump_version(conn, "inventory_version")
+        return count
+
+    def import_catalog(self, chunks):
+        """Insert the restaurants chunk by chunk; readers see the old catalog until the single commit."""
+        return self._import_chunks(self._connection(), chunks)
+
+    def import_data(self, restaurants, reservations):
+        conn = self._connection()
+        self._write_catalog(conn, restaurants)
+        with self._write_transaction(conn):
+            conn.execute("DELETE FROM reservations")
+            for reservation in reservations:
+                self._insert_reservation(conn, reservation)
@@ -0,0 +1,101 @@
+# services/storage_backend.py
+
+
+class StorageBackend:
+    """Interface every DataService storage backend implements.
+
+    Restaurants are exchanged as dicts in the `restaurants.json` shape and reservations
+    as plain dicts, whatever the backend stores internally.
+    """
+
+    def load_restaurants(self):
+        """Return the full catalog as a list of restaurant dicts (read-only)."""
+        raise NotImplementedError
+
+    def get_restaurant(self, restaurant_name):
+        """Return one restaurant dict by exact name, or None."""
+        raise NotImplementedError
+
+    def find_restaurants(self, cuisine=None, location=None):
+        """Return the restaurants matching the given cuisine and/or location."""
+        raise NotImplementedError
+
+    @property
+    def catalog_generation(self):
+        """Counter that changes when restaurants are added, removed or edited."""
+        raise NotImplementedError
+
+    @property
+    def inventory_generation(self):
+        """Counter that changes whenever any slot availability changes."""
+        raise NotImplementedError
+
+    def iter_reservations(self):
+        """Stream stored reservations in booking order."""
+        raise NotImplementedError
+
+    def reservation_changes(self, position):
+        """Return (records, position, from_start) for reservation writes after `position`, as
+        ReservationLedger.read_since does, or None if the backend cannot tell; callers then
+        re-read every reservation."""
+        return None
+
+    def save_reservation(self, reservation):
+        """Store a reservation without touching availability."""
+        raise NotImplementedError
+
+    def update_availability(self, restaurant_name, date_time, party_size):
+        """Take seats from a slot; returns False if there are not enough."""
+        raise NotImplementedError
+
+    def book_reservation(self, reservation):
+        """Atomically take seats and store the reservation; returns False if full."""
+        raise NotImplementedError
+
+    def book_reservations(self, reservations, atomic=True):
+        """Book many reservations with one commit; returns a list of per-item booleans.
+
+        With `atomic`, either every reservation is booked or none is.
+        """
+        raise NotImplementedError
+
+    def get_reservation(self, reservation_id):
+        """Return the live reservation with this ID, or None."""
+        raise NotImplementedError
+
+    def cancel_reservation(self, reservation_id):
+        """Delete a reservation and give its seats back; returns the cancelled record or None."""
+        raise NotImplementedError
+
+    def compact_reservations(self):
+        """Reclaim space in reservation storage; returns the number of live records."""
+        return sum(1 for _ in self.iter_reservations())
+
+    def import_data(self, restaurants, reservations):
+        """Replace the catalog and reservations with the given data."""
+        raise NotImplementedError
+
+    def import_catalog(self, chunks):
+        """Replace the catalog with restaurants streamed as an iterable of lists; reservations are kept.
+
+        Chunks are consumed one at a time, so the feed is never held whole. Returns the
+        number of restaurants written.
+        """
+        raise NotImplementedError
+
+
+class ChunkCounter:
+    """Iterates the items of an iterable of chunks, counting them as it goes."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.count = 0
+
+    def iter_chunks(self):
+        for chunk in self.chunks:
+            self.count += len(chunk)
+            yield chunk
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
@@ -1,7 +1,7 @@
 # services/validation_service.py
 
-from datetime import datetime
-import pytz  # Add pytz for timezone handling
+from datetime import datetime, timezone
+from services.datetime_parser import parse_slot, to_utc
 
 class ValidationService:
     @staticmethod
@@ -10,38 +10,20 @@ class ValidationService:
         if not date_time_str:
             return False
 
-        # Clean the input: remove extra spaces
-        date_time_str = date_time_str.strip()
-
-        # Supported formats
-        formats = [
-            '%Y-%m-%d %H:%M',      # 2025-05-16 19:00
-            '%Y-%m-%d %H:%M:%S',   # 2025-05-16 19:00:00
-            '%Y-%m-%d %H%M'        # 2025-05-16 1900
-        ]
-
-        parsed_time = None
-        for fmt in formats:
-            try:
-                parsed_time = datetime.strptime(date_time_str, fmt)
-                break
-            except ValueError:
-                continue
+        # Regex fast path with strptime fallback; repeated slot strings hit an LRU cache
+        parsed_time = parse_slot(date_time_str.strip())
 
         if parsed_time is None:
-            print(f"Date-time validation failed for '{date_time_str}'")  # Debug
             return False
 
         # Convert parsed time to UTC (assume input is in IST)
-        ist = pytz.timezone("Asia/Kolkata")
-        parsed_time = ist.localize(parsed_time).astimezone(pytz.UTC)
+        parsed_time = to_utc(parsed_time)
 
         # Get current time in UTC
-        current_time = datetime.now(pytz.UTC)
+        current_time = datetime.now(timezone.utc)
 
         # Ensure the date-time is in the future
         if parsed_time <= current_time:
-            print(f"Date-time '{date_time_str}' is in the past: {parsed_time} <= {current_time}")  # Debug
             return False
 
         return True
@@ -56,11 +38,57 @@ class ValidationService:
             return False
 
     @staticmethod
-    def validate_restaurant_name(restaurant_name, restaurants):
-        """Validate restaurant name exists."""
+    def validate_restaurant_name(restaurant_name, restaurants, fuzzy_index=None):
+        """Validate restaurant name exists; with a fuzzy index, a close enough unique match also counts."""
+        if fuzzy_index is not None:
+            return ValidationService.resolve_restaurant_name(restaurant_name, fuzzy_index) is not None
         return any(r["name"] == restaurant_name for r in restaurants)
 
     @staticmethod
-    def validate_cuisine(cuisine, restaurants):
+    def validate_cuisine(cuisine, restaurants, fuzzy_index=None):
         """Validate cuisine exists."""
-        return any(r["cuisine"] == cuisine for r in restaurants)
\ No newline at end of file
+        if fuzzy_index is not None:
+            return ValidationService.resolve_cuisine(cuisine, fuzzy_index) is not None
+        return any(r["cuisine"] == cuisine for r in restaurants)
+
+    @staticmethod
+    def restaurant_problems(restaurant):
+        """List what is wrong with a catalog entry in the restaurants.json shape; empty if it is valid."""
+        problems = []
+        for field in ("name", "location", "cuisine"):
+            value = restaurant.get(field)
+            if not isinstance(value, str) or not value.strip():
+                problems.append(f"{field} is missing")
+        capacity = restaurant.get("seating_capacity")
+        if not isinstance(capacity, int) or isinstance(capacity, bool) or not ValidationService.validate_party_size(capacity):
+            problems.append("seating_capacity must be a positive integer")
+            capacity = None
+        slots = restaurant.get("available_slots", {})
+        if not isinstance(slots, dict):
+            problems.append("available_slots must map slots to seats")
+            return problems
+        for date_time, seats in slots.items():
+            if not isinstance(date_time, str) or parse_slot(date_time.strip()) is None:
+                problems.append(f"invalid slot {date_time!r}")
+            elif not isinstance(seats, int) or isinstance(seats, bool) or seats < 0 or (capacity is not None and seats > capacity):
+                problems.append(f"seats at {date_time} must be between 0 and seating_capacity")
+        return problems
+
+    @staticmethod
+    def resolve_restaurant_name(restaurant_name, fuzzy_index, exact=False):
+        """Return the catalog name `restaurant_name` refers to, allowing typos, or None.
+
+        With `exact`, for bookings, only case and spacing may differ from the catalog name.
+        """
+        if not isinstance(restaurant_name, str) or not restaurant_name.strip():
+            return None
+        if exact:
+            return fuzzy_index.exact_restaurant(restaurant_name)
+        return fuzzy_index.match_restaurant(restaurant_name.strip())[0]
+
+    @staticmethod
+    def resolve_cuisine(cuisine, fuzzy_index):
+        """Return the catalog cuisine `cuisine` refers to, allowing typos, or None."""
+        if not isinstance(cuisine, str) or not cuisine.strip():
+            return None
+        return fuzzy_index.match_cuisine(cuisine.strip())[0]
\ No newline at end of file
@@ -0,0 +1,126 @@
+# services/waitlist.py
+
+import heapq
+import itertools
+import threading
+import time
+
+
+class WaitlistEntry:
+    """One party waiting for a slot; `reservation` is what gets booked when it is promoted."""
+
+    __slots__ = ("waitlist_id", "reservation", "requested_at", "seq", "active")
+
+    def __init__(self, waitlist_id, reservation, requested_at, seq):
+        self.waitlist_id = waitlist_id
+        self.reservation = reservation
+        self.requested_at = requested_at
+        self.seq = seq
+        self.active = True
+
+    def __lt__(self, other):
+        return (self.requested_at, self.seq) < (other.requested_at, other.seq)
+
+
+class Waitlist:
+    """Parties waiting for fully booked (restaurant, slot) pairs, in request-time order.
+
+    Each slot keeps one min-heap per party size, ordered by request time. Promoting for
+    `seats` free seats compares the heads of the heaps whose party size fits and pops
+    the earliest, so it costs O(P + log n) for P distinct party sizes: a large party at
+    the front never blocks smaller ones behind it that fit. Ties in request time go to
+    the smaller party. Removed entries are dropped lazily when they reach a heap's head.
+
+    The waitlist lives in memory in one process; it is not persisted with the bookings.
+    """
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._slots = {}  # (restaurant_name, date_time) -> {party_size: heap of WaitlistEntry}
+        self._entries = {}  # waitlist_id -> active WaitlistEntry
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def join(self, reservation, requested_at=None):
+        """Queue `reservation` for its slot in O(log n); returns its waitlist id."""
+        with self._lock:
+            seq = next(self._seq)
+            entry = WaitlistEntry(f"w{seq}", reservation, self._clock() if requested_at is None else requested_at, seq)
+            self._push(entry)
+            return entry.waitlist_id
+
+    def _push(self, entry):
+        key = (entry.reservation["restaurant_name"], entry.reservation["date_time"])
+        heaps = self._slots.setdefault(key, {})
+        heapq.heappush(heaps.setdefault(int(entry.reservation["party_size"]), []), entry)
+        self._entries[entry.waitlist_id] = entry
+
+    def position(self, waitlist_id):
+        """1-based place of an entry among those waiting for its slot, or None if it is gone.
+
+        Counts the parties ahead, so it is linear in the slot's waitlist.
+        """
+        with self._lock:
+            entry = self._entries.get(waitlist_id)
+            return None if entry is None else self._position(entry)
+
+    def _position(self, entry):
+        key = (entry.reservation["restaurant_name"], entry.reservation["date_time"])
+        heaps = self._slots.get(key, {})
+        ahead = sum(1 for heap in heaps.values() for other in heap
+                    if other.active and (other.requested_at, other.reservation["party_size"], other.seq)
+                    < (entry.requested_at, entry.reservation["party_size"], entry.seq))
+        return ahead + 1
+
+    def remove(self, waitlist_id):
+        """Take an entry off the waitlist; returns its reservation, or None if it was not waiting."""
+        with self._lock:
+            entry = self._entries.pop(waitlist_id, None)
+            if entry is None:
+                return None
+            entry.active = False
+            return entry.reservation
+
+    def waiting(self, restaurant_name, date_time):
+        """Number of parties waiting for one slot."""
+        with self._lock:
+            heaps = self._slots.get((restaurant_name, date_time), {})
+            return sum(1 for heap in heaps.values() for entry in heap if entry.active)
+
+    def pop(self, restaurant_name, date_time, seats):
+        """Remove and return the earliest entry for the slot whose party fits in `seats`, or None."""
+        key = (restaurant_name, date_time)
+        with self._lock:
+            heaps = self._slots.get(key)
+            if not heaps:
+                return None
+            best = None
+            for party_size in list(heaps):
+                heap = heaps[party_size]
+                while heap and not heap[0].active:
+                    heapq.heappop(heap)
+                if not heap:
+                    del heaps[party_size]
+                    continue
+                if party_size > seats:
+                    continue
+                head = heap[0]
+                if best is None or (head.requested_at, party_size) < (best.requested_at, int(best.reservation["party_size"])):
+                    best = head
+            if best is None:
+                if not heaps:
+                    del self._slots[key]
+                return None
+            heapq.heappop(heaps[int(best.reservation["party_size"])])
+            del self._entries[best.waitlist_id]
+            best.active = False
+            return best
+
+    def restore(self, entry):
+        """Put back an entry returned by `pop` whose booking did not go through, keeping its place."""
+        with self._lock:
+            entry.active = True
+            self._push(entry)
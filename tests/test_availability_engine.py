@@ -0,0 +1,49 @@
+# tests/test_availability_engine.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from services.availability_engine import AvailabilityEngine
+from services.data_service import DataService
+from tools.recommendation_tools import recommend_restaurant
+
+class TestAvailabilityEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_filters_by_cuisine_location_and_seats(self):
+        restaurants = [
+            {"name": "A", "cuisine": "Italian", "location": "Downtown", "seating_capacity": 20,
+             "available_slots": {"2030-01-01 19:00": 3}},
+            {"name": "B", "cuisine": "Italian", "location": "Uptown", "seating_capacity": 40,
+             "available_slots": {"2030-01-01 18:00": 0}},
+            {"name": "C", "cuisine": "Mexican", "location": "Downtown", "seating_capacity": 60, "available_slots": {}},
+        ]
+        engine = AvailabilityEngine.from_restaurants(restaurants)
+        names = lambda rows: [engine.names[row] for row in rows]
+        self.assertEqual(names(engine.restaurants_with_seats(4, "2030-01-01 19:00", cuisine="italian")), ["B"])
+        self.assertEqual(names(engine.restaurants_with_seats(4, "2030-01-02 12:00", location="Downtown")), ["A", "C"])
+        self.assertEqual(len(engine.restaurants_with_seats(1, "2030-01-01 19:00", cuisine="Thai")), 0)
+        # A never listed 18:00, so it counts as fully available there
+        rows, cols = engine.slots_with_seats(1, "2030-01-01 17:00", "2030-01-01 23:59", cuisine="Italian")
+        self.assertEqual(sorted(zip(names(rows), [engine.slot_keys[col] for col in cols])),
+                         [("A", "2030-01-01 18:00"), ("A", "2030-01-01 19:00"), ("B", "2030-01-01 19:00")])
+
+    def test_engine_follows_bookings(self):
+        engine = self.data_service.get_availability_engine()
+        row = engine.row_of["Restaurant A"]
+        self.assertTrue(self.data_service.book_reservation(
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 18}))
+        self.assertIs(self.data_service.get_availability_engine(), engine)
+        self.assertEqual(engine.seats_at("2030-01-01 19:00")[row], 2)
+        self.assertNotIn("Restaurant A", recommend_restaurant(
+            {"cuisine": "Italian", "party_size": "4", "date_time": "2030-01-01 19:00"}, self.data_service))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_booking_concurrency.py
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from services.data_service import DataService
+
+HOT_SLOT = "2030-01-01 19:00"
+
+def _hammer(restaurants_file, reservations_file, backend, attempts, results):
+    """Worker: try to book one seat at the hot slot `attempts` times."""
+    data_service = DataService(restaurants_file, reservations_file, backend=backend)
+    booked = 0
+    for _ in range(attempts):
+        if data_service.book_reservation({"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": 1}):
+            booked += 1
+    results.put(booked)
+
+class TestBookingConcurrency(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_hot_slot_is_never_overbooked(self):
+        self._hammer_hot_slot("json")
+
+    def test_hot_slot_is_never_overbooked_sqlite(self):
+        self._hammer_hot_slot("sqlite")
+
+    def test_hot_slot_is_never_overbooked_partitioned(self):
+        self._hammer_hot_slot("partitioned")
+
+    def _hammer_hot_slot(self, backend):
+        self.data_service = DataService(self.restaurants_file, self.reservations_file, backend=backend)
+        capacity = self.data_service.get_restaurant("Restaurant A")["seating_capacity"]
+        processes, attempts = 8, 10  # 80 attempts against 20 seats
+        results = multiprocessing.Queue()
+        workers = [
+            multiprocessing.Process(target=_hammer, args=(self.restaurants_file, self.reservations_file, backend, attempts, results))
+            for _ in range(processes)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        booked = sum(results.get(timeout=60) for _ in workers)
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        print(f"\n{backend}: {processes * attempts} attempts, {booked} booked, {processes * attempts / elapsed:.0f} bookings/sec")
+
+        reopened = DataService(self.restaurants_file, self.reservations_file, backend=backend)
+        seats_booked = sum(r["party_size"] for r in reopened.iter_reservations())
+        self.assertEqual(booked, capacity)
+        self.assertEqual(seats_booked, capacity)
+        self.assertEqual(reopened.get_restaurant("Restaurant A")["available_slots"][HOT_SLOT], 0)
+
+if __name__ == "__main__":
+    unittest.main()
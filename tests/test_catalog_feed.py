@@ -0,0 +1,106 @@
+# tests/test_catalog_feed.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from services.catalog_feed import export_feed, import_feed
+from services.data_service import DataService
+from services.validation_service import ValidationService
+
+FEED_CSV = """name,location,cuisine,seating_capacity,available_slots
+Bistro Uno,Downtown,French,30,2030-01-01 19:00=10;2030-01-02 1930
+Nameless,,French,x,
+Bistro Uno,Uptown,French,30,
+Cafe Due,Uptown,Thai,10,2030-01-02 18:00=11
+Cafe Tre,Eastside,Thai,10,2030-01-03 18:00=0
+"""
+
+class TestCatalogFeed(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _check_import_and_round_trip(self, backend):
+        data_service = DataService(self.restaurants_file, self.reservations_file, backend=backend)
+        self.assertTrue(data_service.book_reservation({"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00",
+                                                       "party_size": 2}))
+        data_service.get_slot_index()
+        report = import_feed(data_service, self._write("feed.csv", FEED_CSV), chunk_size=2)
+        self.assertEqual((report["imported"], report["rejected"]), (2, 3))
+        self.assertEqual([error["line"] for error in report["errors"]], [3, 4, 5])
+        self.assertIn("duplicate name 'Bistro Uno'", report["errors"][1]["problems"])
+        with open(report["errors_path"]) as f:
+            self.assertEqual([json.loads(line)["line"] for line in f], [3, 4, 5])
+
+        restaurants = data_service.load_restaurants()
+        self.assertEqual([r["name"] for r in restaurants], ["Bistro Uno", "Cafe Tre"])
+        self.assertEqual(dict(restaurants[0]["available_slots"]), {"2030-01-01 19:00": 10, "2030-01-02 19:30": 30})
+        # Reservations are kept; the derived views follow the new catalog
+        self.assertEqual(len(data_service.load_reservations()), 1)
+        self.assertEqual(data_service.get_slot_index().nearest("Bistro Uno", "2030-01-02 19:00", 2, k=1)[0][0],
+                         "2030-01-02 19:30")
+        self.assertEqual(data_service.get_fuzzy_index().match_restaurant("bistro uno")[0], "Bistro Uno")
+
+        for feed in ("out.csv", "out.jsonl"):
+            path = os.path.join(self.tmp_dir, feed)
+            self.assertEqual(export_feed(data_service, path), 2)
+            other = DataService(os.path.join(self.tmp_dir, feed + "-data", "restaurants.json"),
+                                os.path.join(self.tmp_dir, feed + "-data", "reservations.json"), backend=backend)
+            self.assertEqual(import_feed(other, path)["rejected"], 0)
+            self.assertFalse(os.path.exists(path + ".errors.jsonl"))
+            self.assertEqual([dict(r, available_slots=dict(r["available_slots"])) for r in other.load_restaurants()],
+                             [dict(r, available_slots=dict(r["available_slots"])) for r in restaurants])
+
+    def test_json(self):
+        self._check_import_and_round_trip("json")
+
+    def test_sqlite(self):
+        self._check_import_and_round_trip("sqlite")
+
+    def test_partitioned(self):
+        self._check_import_and_round_trip("partitioned")
+
+    def test_slots_that_name_the_same_time_are_rejected(self):
+        data_service = DataService(self.restaurants_file, self.reservations_file)
+        feed = ("name,location,cuisine,seating_capacity,available_slots\n"
+                "Bistro Uno,Downtown,French,30,2030-01-01 19:00=10;2030-01-01 1900=5\n"
+                "Cafe Due,Uptown,Thai,10,2030-01-01 19:00=4;2030-01-01 20:00\n")
+        report = import_feed(data_service, self._write("feed.csv", feed))
+        self.assertEqual((report["imported"], report["rejected"]), (1, 1))
+        self.assertEqual(report["errors"], [{"line": 2, "problems": ["duplicate slot '2030-01-01 19:00'"]}])
+        self.assertEqual([r["name"] for r in data_service.load_restaurants()], ["Cafe Due"])
+
+    def test_feed_without_valid_rows_leaves_the_catalog_alone(self):
+        data_service = DataService(self.restaurants_file, self.reservations_file)
+        path = self._write("feed.jsonl", '{"name": "Broken"\n[1, 2]\n\n{"name": "X", "location": "Y", "cuisine": "Z"}\n')
+        with self.assertRaises(ValueError):
+            import_feed(data_service, path)
+        self.assertEqual(len(data_service.load_restaurants()), 20)
+        with open(path + ".errors.jsonl") as f:
+            errors = [json.loads(line) for line in f]
+        self.assertEqual([error["line"] for error in errors], [1, 2, 4])
+        self.assertIn("seating_capacity must be a positive integer", errors[2]["problems"])
+
+    def test_restaurant_problems(self):
+        restaurant = {"name": "A", "location": "B", "cuisine": "C", "seating_capacity": 10,
+                      "available_slots": {"2025-05-17 18:00": 10}}
+        self.assertEqual(ValidationService.restaurant_problems(restaurant), [])
+        restaurant.update(seating_capacity=True, available_slots={"tomorrow": 1, "2025-05-17 18:00": -1})
+        self.assertEqual(ValidationService.restaurant_problems(restaurant), [
+            "seating_capacity must be a positive integer", "invalid slot 'tomorrow'",
+            "seats at 2025-05-17 18:00 must be between 0 and seating_capacity"])
+
+if __name__ == "__main__":
+    unittest.main()
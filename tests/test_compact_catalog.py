@@ -0,0 +1,64 @@
+# tests/test_compact_catalog.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from services.compact_catalog import CompactCatalog, slot_key, slot_minute
+from services.data_service import DataService
+
+class TestCompactCatalog(unittest.TestCase):
+    def setUp(self):
+        generator = DataService.__new__(DataService)
+        self.restaurants = generator._generate_restaurant_data(10, slots_per_day=4, days=2, start_date="2030-01-01")
+        self.restaurants[1]["features"] = ["patio"]
+        self.restaurants[2]["available_slots"]["2030-01-01 18:00"] = 7
+        self.catalog = CompactCatalog.from_restaurants(self.restaurants)
+
+    def test_slot_minutes_round_trip(self):
+        self.assertEqual(slot_minute("2000-01-02 00:30"), 1470)
+        self.assertEqual(slot_key(slot_minute("2030-12-31 23:59")), "2030-12-31 23:59")
+
+    def test_json_shape_round_trip(self):
+        self.assertEqual(self.catalog.to_restaurants(), self.restaurants)
+        self.assertEqual(json.loads(json.dumps(self.catalog.to_restaurants())), self.restaurants)
+        self.assertEqual(len(self.catalog.grids), 1)  # Every restaurant shares one slot schedule
+        self.assertEqual((self.catalog.locations, self.catalog.cuisines),
+                         (["Downtown", "Midtown", "Uptown", "Eastside", "Westside"],
+                          ["Italian", "Japanese", "Mexican", "Chinese", "Indian"]))
+
+    def test_seat_lookup_and_updates(self):
+        self.assertEqual(self.catalog.seats_at("Restaurant C", "2030-01-01 18:00"), 7)
+        self.assertEqual(self.catalog.seats_at("Restaurant C", "2031-01-01 18:00"), 60)
+        self.assertIsNone(self.catalog.seats_at("Nowhere", "2030-01-01 18:00"))
+        self.catalog.apply("Restaurant A", "2030-01-02 17:00", 5)
+        self.catalog.apply("Restaurant A", "2031-01-01 12:00", 9)  # Not in the shared schedule
+        self.assertEqual(self.catalog.seats_at("Restaurant A", "2030-01-02 17:00"), 5)
+        self.assertEqual(self.catalog.seats_at("Restaurant A", "2031-01-01 12:00"), 9)
+        self.assertEqual(self.catalog.seats_at("Restaurant B", "2030-01-02 17:00"), 40)
+        self.assertEqual(len(self.catalog.restaurant(0)["available_slots"]), 9)
+        self.assertEqual(self.catalog.to_restaurants()[1:], self.restaurants[1:])
+
+    def test_rows_filter_on_interned_codes(self):
+        self.assertEqual(self.catalog.rows(cuisine="italian"), [0, 5])
+        self.assertEqual(self.catalog.rows(cuisine="Italian", location="Downtown"), [0, 5])
+        self.assertEqual(self.catalog.rows(location="Nowhere"), [])
+
+class TestDataServiceCompactCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_catalog_is_patched_after_bookings(self):
+        catalog = self.data_service.get_compact_catalog()
+        self.data_service.book_reservation({"restaurant_name": "Restaurant B", "date_time": "2025-05-17 18:00", "party_size": 4})
+        self.assertIs(self.data_service.get_compact_catalog(), catalog)
+        self.assertEqual(catalog.seats_at("Restaurant B", "2025-05-17 18:00"), 36)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,278 @@
+# tests/test_data_service.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from services.data_service import DataService
+from services.reservation_ledger import ReservationLedger
+from services.migrate import migrate
+
+class TestDataService(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+        self.data_service = DataService(self.restaurants_file, self.reservations_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_catalog_is_cached_between_loads(self):
+        first = self.data_service.load_restaurants()
+        self.assertIs(self.data_service.load_restaurants(), first)
+
+    def test_catalog_reloads_after_external_write(self):
+        generation = self.data_service.catalog_generation
+        restaurants = json.loads(json.dumps(self.data_service.load_restaurants()))
+        restaurants[0]["name"] = "Renamed Restaurant"
+        with open(self.restaurants_file, 'w') as f:
+            json.dump(restaurants, f, indent=4)
+        self.assertEqual(self.data_service.load_restaurants()[0]["name"], "Renamed Restaurant")
+        self.assertGreater(self.data_service.catalog_generation, generation)
+
+    def test_generator_scales_and_is_seeded(self):
+        generate = self.data_service._generate_restaurant_data
+        self.assertEqual(generate(), self.data_service.load_restaurants())
+        restaurants = generate(30, slots_per_day=4, days=2, start_date="2030-01-01", seed=7)
+        self.assertEqual([r["name"] for r in restaurants[25:28]], ["Restaurant Z", "Restaurant AA", "Restaurant AB"])
+        self.assertEqual(sorted(restaurants[0]["available_slots"]),
+                         ["2030-01-01 17:00", "2030-01-01 17:30", "2030-01-01 18:00", "2030-01-01 18:30",
+                          "2030-01-02 17:00", "2030-01-02 17:30", "2030-01-02 18:00", "2030-01-02 18:30"])
+        self.assertEqual(restaurants, generate(30, slots_per_day=4, days=2, start_date="2030-01-01", seed=7))
+
+        reservations = self.data_service._generate_reservation_data(restaurants, 100, seed=7)
+        self.assertEqual(len(reservations), 100)
+        booked = sum(r["party_size"] for r in reservations)
+        free = sum(sum(r["available_slots"].values()) for r in restaurants)
+        self.assertEqual(free + booked, sum(r["seating_capacity"] * 8 for r in restaurants))
+
+    def test_update_availability_writes_through_cache(self):
+        storage = self.data_service.storage
+        cached = self.data_service.load_restaurants()
+        storage._read_restaurants = lambda: self.fail("the catalog was re-parsed")
+        self.assertTrue(self.data_service.update_availability("Restaurant A", "2030-01-01 19:00", 5))
+        self.assertEqual(self.data_service.get_restaurant("Restaurant A")["available_slots"]["2030-01-01 19:00"], 15)
+        # Earlier snapshots are never edited in place
+        self.assertNotIn("2030-01-01 19:00", cached[0]["available_slots"])
+        with open(self.restaurants_file) as f:
+            on_disk = json.load(f)
+        self.assertEqual(on_disk[0]["available_slots"]["2030-01-01 19:00"], 15)
+
+    def test_failed_catalog_write_leaves_the_cache_unchanged(self):
+        self.data_service.load_restaurants()
+        with open(self.restaurants_file, 'rb') as f:
+            before = f.read()
+        with mock.patch("services.catalog_cache.atomic_write_json", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.data_service.update_availability("Restaurant A", "2030-01-01 19:00", 5)
+            with self.assertRaises(OSError):
+                self.data_service.storage.book_reservations([{"restaurant_name": "Restaurant A",
+                                                              "date_time": "2030-01-01 19:00", "party_size": 5}])
+        self.assertNotIn("2030-01-01 19:00", self.data_service.get_restaurant("Restaurant A")["available_slots"])
+        with open(self.restaurants_file, 'rb') as f:
+            self.assertEqual(f.read(), before)
+
+    def test_save_reservation_appends_to_ledger(self):
+        self.data_service.save_reservation({"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 2})
+        self.data_service.save_reservation({"restaurant_name": "Restaurant B", "date_time": "2030-01-01 19:00", "party_size": 4})
+        names = [r["restaurant_name"] for r in self.data_service.iter_reservations()]
+        self.assertEqual(names, ["Restaurant A", "Restaurant B"])
+        with open(self.data_service.ledger_file) as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_legacy_reservations_are_imported_once(self):
+        legacy = [{"restaurant_name": "Restaurant C", "date_time": "2030-01-01 19:00", "party_size": 3}]
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        reservations_file = os.path.join(tmp_dir, "reservations.json")
+        with open(reservations_file, 'w') as f:
+            json.dump(legacy, f)
+        data_service = DataService(os.path.join(tmp_dir, "restaurants.json"), reservations_file)
+        self.assertEqual(data_service.load_reservations(), legacy)
+        data_service.save_reservation({"restaurant_name": "Restaurant D", "date_time": "2030-01-01 19:00", "party_size": 1})
+        reopened = DataService(os.path.join(tmp_dir, "restaurants.json"), reservations_file)
+        self.assertEqual(len(reopened.load_reservations()), 2)
+
+    def test_compaction_drops_torn_lines(self):
+        self.data_service.save_reservation({"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 2})
+        with open(self.data_service.ledger_file, 'a') as f:
+            f.write('{"restaurant_name": "Restau')
+        self.assertEqual(len(self.data_service.load_reservations()), 1)
+        self.assertEqual(self.data_service.compact_reservations(), 1)
+        with open(self.data_service.ledger_file) as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def test_appends_during_compaction_are_kept(self):
+        scanning, resume = threading.Event(), threading.Event()
+
+        class SlowLedger(ReservationLedger):
+            def __iter__(self):
+                scanning.set()
+                resume.wait()
+                yield from super().__iter__()
+        ledger = SlowLedger(os.path.join(self.tmp_dir, "ledger.jsonl"))
+        ledger.append({"reservation_id": "a"})
+        compaction = threading.Thread(target=ledger.compact)
+        compaction.start()
+        scanning.wait()
+        append = threading.Thread(target=ledger.append, args=({"reservation_id": "b"},))
+        append.start()
+        append.join(0.1)
+        self.assertTrue(append.is_alive())  # Waiting for the compaction's lock
+        resume.set()
+        compaction.join()
+        append.join()
+        self.assertEqual([r["reservation_id"] for r in ReservationLedger(ledger.path)], ["a", "b"])
+
+class TestSqliteStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+        self.data_service = DataService(self.restaurants_file, self.reservations_file, backend="sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_catalog_keeps_json_shape(self):
+        restaurant = self.data_service.get_restaurant("Restaurant A")
+        self.assertEqual(restaurant["cuisine"], "Italian")
+        self.assertEqual(restaurant["seating_capacity"], 20)
+        self.assertEqual(len(self.data_service.load_restaurants()), 20)
+        self.assertEqual([r["name"] for r in self.data_service.find_restaurants(cuisine="italian", location="Downtown")],
+                         ["Restaurant A", "Restaurant F", "Restaurant K", "Restaurant P"])
+
+    def test_booking_takes_seats_and_stores_reservation(self):
+        reservation = {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 15}
+        self.assertTrue(self.data_service.book_reservation(reservation))
+        self.assertFalse(self.data_service.book_reservation(reservation))
+        self.assertFalse(self.data_service.book_reservation(dict(reservation, restaurant_name="Nowhere")))
+        self.assertEqual(self.data_service.get_restaurant("Restaurant A")["available_slots"]["2030-01-01 19:00"], 5)
+        self.assertEqual(self.data_service.load_reservations(), [reservation])
+        reopened = DataService(self.restaurants_file, self.reservations_file, backend="sqlite")
+        self.assertEqual(reopened.get_restaurant("Restaurant A")["available_slots"]["2030-01-01 19:00"], 5)
+
+    def test_lookups_after_a_foreign_booking_do_not_reload_the_catalog(self):
+        storage = self.data_service.storage
+        cached = self.data_service.load_restaurants()
+        other = DataService(self.restaurants_file, self.reservations_file, backend="sqlite")
+        self.assertTrue(other.book_reservation({"restaurant_name": "Restaurant B", "date_time": "2030-01-01 19:00", "party_size": 4}))
+        self.assertEqual(self.data_service.get_restaurant("Restaurant B")["available_slots"]["2030-01-01 19:00"], 36)
+        self.assertIsNone(self.data_service.get_restaurant("Nowhere"))
+        self.assertEqual([r["name"] for r in self.data_service.find_restaurants(cuisine="italian", location="Downtown")],
+                         ["Restaurant A", "Restaurant F", "Restaurant K", "Restaurant P"])
+        self.assertIs(storage._restaurants, cached)  # Only load_restaurants rebuilds it
+        self.assertEqual(self.data_service.load_restaurants()[1]["available_slots"]["2030-01-01 19:00"], 36)
+
+    def test_batch_booking_is_all_or_nothing(self):
+        batch = [
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 15},
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 10},
+        ]
+        self.assertEqual(self.data_service.book_reservations(batch), [False, False])
+        self.assertEqual(self.data_service.load_reservations(), [])
+        self.assertEqual(self.data_service.book_reservations(batch, atomic=False), [True, False])
+        self.assertEqual(self.data_service.get_restaurant("Restaurant A")["available_slots"]["2030-01-01 19:00"], 5)
+
+    def test_migration_from_json(self):
+        json_service = DataService(self.restaurants_file, self.reservations_file, backend="json")
+        json_service.book_reservation({"restaurant_name": "Restaurant B", "date_time": "2030-01-01 19:00", "party_size": 4})
+        sqlite_file = os.path.join(self.tmp_dir, "migrated.db")
+        self.assertEqual(migrate("json", "sqlite", self.restaurants_file, self.reservations_file, sqlite_file), (20, 1))
+        migrated = DataService(self.restaurants_file, self.reservations_file, backend="sqlite", sqlite_file=sqlite_file)
+        self.assertEqual(migrated.get_restaurant("Restaurant B")["available_slots"]["2030-01-01 19:00"], 36)
+        self.assertEqual(migrated.load_reservations(), json_service.load_reservations())
+
+class TestPartitionedStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+        generator = DataService.__new__(DataService)
+        catalog = generator._generate_restaurant_data(20, slots_per_day=2, days=3, start_date="2030-01-01")
+        catalog[0]["available_slots"]["2020-01-01 18:00"] = 20  # A past date, archived on startup
+        with open(self.restaurants_file, 'w') as f:
+            json.dump(catalog, f)
+        self.data_service = DataService(self.restaurants_file, self.reservations_file, backend="partitioned")
+        self.inventory_dir = os.path.join(self.tmp_dir, "inventory")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_restaurants_json_is_split_into_date_shards(self):
+        self.assertEqual(sorted(os.listdir(self.inventory_dir)),
+                         [".changes", "2030-01-01.json", "2030-01-02.json", "2030-01-03.json", "archive"])
+        restaurant = self.data_service.get_restaurant("Restaurant A")
+        self.assertEqual(restaurant["cuisine"], "Italian")
+        self.assertEqual(restaurant["available_slots"]["2030-01-02 18:00"], 20)
+        self.assertEqual(restaurant["available_slots"].get("2031-01-01 18:00", "missing"), "missing")
+        self.assertEqual(len(dict(restaurant["available_slots"])), 7)
+        self.assertEqual([r["name"] for r in self.data_service.find_restaurants(cuisine="italian", location="Downtown")],
+                         ["Restaurant A", "Restaurant F", "Restaurant K", "Restaurant P"])
+
+    def test_booking_rewrites_only_its_shard(self):
+        def signatures():
+            paths = [os.path.join(self.inventory_dir, name) for name in ("2030-01-01.json", "2030-01-03.json")]
+            return [os.stat(path).st_ino for path in paths + [os.path.join(self.tmp_dir, "catalog.json")]]
+        before = signatures()
+        reservation = {"restaurant_name": "Restaurant A", "date_time": "2030-01-02 18:00", "party_size": 15}
+        self.assertTrue(self.data_service.book_reservation(reservation))
+        self.assertFalse(self.data_service.book_reservation(reservation))
+        self.assertEqual(signatures(), before)
+        self.assertEqual(self.data_service.load_reservations(), [reservation])
+        reopened = DataService(self.restaurants_file, self.reservations_file, backend="partitioned")
+        self.assertEqual(reopened.get_restaurant("Restaurant A")["available_slots"]["2030-01-02 18:00"], 5)
+
+    def test_batch_booking_is_all_or_nothing(self):
+        batch = [
+            {"restaurant_name": "Restaurant B", "date_time": "2030-01-01 18:00", "party_size": 30},
+            {"restaurant_name": "Restaurant B", "date_time": "2030-01-03 18:00", "party_size": 50},
+        ]
+        self.assertEqual(self.data_service.book_reservations(batch), [False, False])
+        self.assertEqual(self.data_service.get_restaurant("Restaurant B")["available_slots"]["2030-01-01 18:00"], 40)
+        self.assertEqual(self.data_service.book_reservations(batch, atomic=False), [True, False])
+        self.assertEqual(self.data_service.get_restaurant("Restaurant B")["available_slots"]["2030-01-01 18:00"], 10)
+
+    def test_past_dates_are_archived_read_only(self):
+        archived = os.path.join(self.inventory_dir, "archive", "2020-01-01.json")
+        self.assertFalse(os.stat(archived).st_mode & 0o222)
+        slots = self.data_service.get_restaurant("Restaurant A")["available_slots"]
+        self.assertEqual(slots["2020-01-01 18:00"], 20)
+        self.assertFalse(self.data_service.book_reservation(
+            {"restaurant_name": "Restaurant A", "date_time": "2020-01-01 18:00", "party_size": 2}))
+
+    def test_change_counter_does_not_grow(self):
+        changes = os.path.join(self.inventory_dir, ".changes")
+        generation = self.data_service.inventory_generation
+        for _ in range(20):
+            self.data_service.book_reservation({"restaurant_name": "Restaurant C", "date_time": "2030-01-02 18:00", "party_size": 1})
+        self.assertEqual(self.data_service.inventory_generation, generation + 20)
+        self.assertEqual(os.path.getsize(changes), len(str(generation + 20)))
+        # A marker from the older one-byte-per-write layout keeps its count
+        with open(changes, 'w') as f:
+            f.write("." * 50)
+        reopened = DataService(self.restaurants_file, self.reservations_file, backend="partitioned")
+        self.assertEqual(reopened.inventory_generation, 50)
+
+    def test_first_booking_of_a_new_day_archives_the_day_before(self):
+        self.data_service.storage._today = lambda: "2030-01-02"
+        self.assertTrue(self.data_service.book_reservation(
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-02 18:00", "party_size": 2}))
+        self.assertTrue(os.path.exists(os.path.join(self.inventory_dir, "archive", "2030-01-01.json")))
+        self.assertFalse(os.path.exists(os.path.join(self.inventory_dir, "2030-01-01.json")))
+        self.assertFalse(self.data_service.book_reservation(
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 18:00", "party_size": 2}))
+
+    def test_migration_to_json(self):
+        self.data_service.book_reservation({"restaurant_name": "Restaurant B", "date_time": "2030-01-01 18:00", "party_size": 4})
+        os.remove(self.restaurants_file)
+        self.assertEqual(migrate("partitioned", "json", self.restaurants_file, self.reservations_file), (20, 1))
+        with open(self.restaurants_file) as f:
+            self.assertEqual(json.load(f)[1]["available_slots"]["2030-01-01 18:00"], 36)
+
+if __name__ == "__main__":
+    unittest.main()
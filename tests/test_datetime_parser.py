@@ -0,0 +1,27 @@
+# tests/test_datetime_parser.py
+
+import unittest
+from services.datetime_parser import canonical_slot, find_slot, parse_slot
+from services.validation_service import ValidationService
+
+class TestDateTimeParser(unittest.TestCase):
+    def test_supported_formats_share_one_canonical_key(self):
+        for text in ["2030-05-17 18:00", "2030-05-17 1800", "2030-05-17 18:00:00", " 2030-05-17  18:00 "]:
+            self.assertEqual(canonical_slot(text), "2030-05-17 18:00")
+
+    def test_invalid_strings(self):
+        for text in ["", None, "2030-13-01 18:00", "2030-05-17 25:00", "tomorrow at six"]:
+            self.assertIsNone(parse_slot(text))
+
+    def test_find_slot_in_text(self):
+        self.assertEqual(find_slot("book restaurant a for 2 people at 2030-05-17 1930"), "2030-05-17 19:30")
+        self.assertEqual(find_slot("dinner on 2030-05-17 19:30:00 for 2"), "2030-05-17 19:30")
+        self.assertIsNone(find_slot("book restaurant a for 2 people"))
+
+    def test_validation_requires_future_slot(self):
+        self.assertTrue(ValidationService.validate_date_time("2099-01-01 1800"))
+        self.assertFalse(ValidationService.validate_date_time("2000-01-01 18:00"))
+        self.assertFalse(ValidationService.validate_date_time("not a date"))
+
+if __name__ == "__main__":
+    unittest.main()
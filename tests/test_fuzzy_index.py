@@ -0,0 +1,104 @@
+# tests/test_fuzzy_index.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from agents.tool_registry import detect_intent, extract_field
+from services.data_service import DataService
+from services.fuzzy_index import TrigramIndex, trigrams
+from services.validation_service import ValidationService
+from tools.query_tools import query_restaurant
+from tools.reservation_tools import make_reservation
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TrigramIndex(threshold=0.5)
+        for name in ("Restaurant A", "Restaurant AB", "Restaurant B", "Sushi Bar"):
+            self.index.add(name)
+
+    def test_trigrams_are_padded_per_word(self):
+        self.assertEqual(trigrams("Ab c"), {"  a", " ab", "ab ", "  c", " c "})
+
+    def test_best_match_tolerates_typos(self):
+        self.assertEqual(self.index.best_match("resturant ab")[0], "Restaurant AB")
+        name, score = self.index.best_match("Sushi Bra")
+        self.assertEqual(name, "Sushi Bar")
+        self.assertTrue(0.5 <= score < 1.0)
+        self.assertEqual(self.index.best_match("pizza place"), (None, 0.0))
+
+    def test_names_that_differ_in_their_rare_words_do_not_match(self):
+        for name in ("Restaurant R", "Restaurant 9"):
+            self.index.add(name)
+        for query in ("Restaurant Z", "Restaurant AA", "Restaurant", "Restaurant 8", "Sushi Cafe"):
+            self.assertIsNone(self.index.best_match(query)[0], query)
+        self.assertEqual(self.index.best_match("Restuarant R")[0], "Restaurant R")
+
+    def test_ties_and_weak_matches_resolve_to_nothing(self):
+        self.index.add("Restaurant C")
+        self.assertIsNone(self.index.best_match("resturant")[0])  # Every "Restaurant X" scores the same
+        self.assertIsNone(self.index.best_match("sushi bar", threshold=1.01)[0])
+
+    def test_incremental_updates(self):
+        self.index.rename("Sushi Bar", "Ramen Bar")
+        self.assertEqual(self.index.best_match("ramen bra")[0], "Ramen Bar")
+        self.assertNotIn("Sushi Bar", self.index)
+        self.assertEqual(self.index.sync(["Restaurant A", "Ramen Bar", "Taco Stand"]), (1, 2))
+        self.assertEqual(sorted(self.index.keys()), ["Ramen Bar", "Restaurant A", "Taco Stand"])
+        self.assertEqual(self.index.best_match("taco stnd")[0], "Taco Stand")
+
+    def test_common_trigrams_do_not_nominate_candidates(self):
+        index = TrigramIndex(threshold=0.5, min_stop=2)
+        for name in ("Restaurant A", "Restaurant B", "Restaurant C", "Cafe Restaurant"):
+            index.add(name)
+        self.assertEqual(index.best_match("resturant b")[0], "Restaurant B")
+        self.assertEqual(index.best_match("restaurant"), (None, 0.0))
+
+class TestFuzzyCatalogLookups(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_intent_detection_corrects_typos(self):
+        self.assertEqual(detect_intent("tell me about resturant b", self.data_service, use_cache=False),
+                         ("query_restaurant", {"restaurant_name": "Restaurant B"}))
+        self.assertEqual(extract_field("any itlian places?", "cuisine", self.data_service), "Italian")
+        self.assertIsNone(extract_field("recommend a restaurant with good food", "restaurant", self.data_service))
+
+    def test_validation_and_tools_resolve_misspelled_names(self):
+        fuzzy_index = self.data_service.get_fuzzy_index()
+        restaurants = self.data_service.load_restaurants()
+        self.assertTrue(ValidationService.validate_restaurant_name("Restaurant A", restaurants, fuzzy_index))
+        self.assertTrue(ValidationService.validate_restaurant_name("Restuarant C", restaurants, fuzzy_index))
+        self.assertFalse(ValidationService.validate_restaurant_name("Restuarant C", restaurants))
+        self.assertFalse(ValidationService.validate_restaurant_name("Nowhere", restaurants, fuzzy_index))
+        for name in ("Restaurant Z", "Restaurant AA", "Restaurant", "Restaurant 9"):
+            self.assertIsNone(ValidationService.resolve_restaurant_name(name, fuzzy_index), name)
+            self.assertEqual(query_restaurant({"restaurant_name": name}, self.data_service), "Restaurant not found.")
+            self.assertEqual(make_reservation({"restaurant_name": name, "date_time": "2030-01-01 19:00", "party_size": "2"},
+                                              self.data_service), "Invalid restaurant name.")
+        self.assertEqual(ValidationService.resolve_cuisine("japanse", fuzzy_index), "Japanese")
+        self.assertIn("- Name: Restaurant C", query_restaurant({"restaurant_name": "Restuarant C"}, self.data_service))
+        self.assertEqual(query_restaurant({"restaurant_name": "Nowhere"}, self.data_service), "Restaurant not found.")
+        # Bookings need the exact name: a typo is answered with a suggestion, not booked
+        params = {"restaurant_name": "resturant d", "date_time": "2030-01-01 19:00", "party_size": "2"}
+        self.assertEqual(make_reservation(params, self.data_service), "Invalid restaurant name. Did you mean Restaurant D?")
+        self.assertEqual(self.data_service.load_reservations(), [])
+        self.assertIn("Restaurant D", make_reservation(dict(params, restaurant_name=" restaurant  d"), self.data_service))
+        self.assertEqual(self.data_service.load_reservations()[0]["restaurant_name"], "Restaurant D")
+
+    def test_index_follows_catalog_edits_in_place(self):
+        fuzzy_index = self.data_service.get_fuzzy_index()
+        restaurants = [dict(r) for r in self.data_service.load_restaurants()]
+        restaurants[0]["name"] = "Trattoria Roma"
+        self.data_service.storage.import_data(restaurants, [])
+        self.assertIs(self.data_service.get_fuzzy_index(), fuzzy_index)
+        self.assertEqual(fuzzy_index.match_restaurant("trattoria rome")[0], "Trattoria Roma")
+        self.assertNotIn("Restaurant A", fuzzy_index.names)
+
+if __name__ == "__main__":
+    unittest.main()
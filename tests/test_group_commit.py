@@ -0,0 +1,134 @@
+# tests/test_group_commit.py
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from services.data_service import DataService
+from tools.reservation_tools import check_availability
+
+HOT_SLOT = "2030-01-01 19:00"
+
+class TestGroupCommit(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _book_concurrently(self, data_service, count, party_size=1):
+        results = []
+        barrier = threading.Barrier(count)
+
+        def book():
+            barrier.wait()
+            results.append(data_service.book_reservation(
+                {"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": party_size}))
+        threads = [threading.Thread(target=book) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _check_batches_fill_the_slot_exactly(self, backend):
+        data_service = DataService(self.restaurants_file, self.reservations_file, backend=backend, group_commit=True)
+        data_service.get_slot_index()
+        results = self._book_concurrently(data_service, 30)  # 30 one-seat bookings against 20 seats
+        self.assertEqual(sum(results), 20)
+        stats = data_service.get_group_committer().stats()
+        self.assertEqual(stats["committed"], 20)
+        self.assertEqual(stats["submitted"], 30)
+        self.assertLess(stats["batches"], 20)
+        self.assertEqual(stats["queue_depth"], 0)
+        # The derived views were kept current as batches committed
+        index = data_service.get_slot_index()
+        self.assertEqual(index.inventory_generation, data_service.inventory_generation)
+        self.assertNotIn(HOT_SLOT, [slot for slot, _ in index.nearest("Restaurant A", "2030-01-01 19:30", 1, k=10)])
+        data_service.close()
+        # Acknowledged bookings are already durable: a fresh reader sees all of them
+        reopened = DataService(self.restaurants_file, self.reservations_file, backend=backend)
+        self.assertEqual(sum(r["party_size"] for r in reopened.iter_reservations()), 20)
+        self.assertEqual(reopened.get_restaurant("Restaurant A")["available_slots"][HOT_SLOT], 0)
+
+    def test_json(self):
+        self._check_batches_fill_the_slot_exactly("json")
+
+    def test_sqlite(self):
+        self._check_batches_fill_the_slot_exactly("sqlite")
+
+    def test_partitioned(self):
+        self._check_batches_fill_the_slot_exactly("partitioned")
+
+    def test_storage_errors_reach_every_caller_in_the_batch(self):
+        data_service = DataService(self.restaurants_file, self.reservations_file, group_commit=True)
+
+        def fail(reservations, atomic=True):
+            raise OSError("disk full")
+        data_service.storage.book_reservations = fail
+        errors = []
+
+        def book():
+            try:
+                data_service.book_reservation({"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": 2})
+            except OSError as e:
+                errors.append(e)
+        threads = [threading.Thread(target=book) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 4)
+        committer = data_service.get_group_committer()
+        self.assertEqual(committer.stats()["failed"], 4)
+        self.assertIn('foodiespot_group_commit_bookings_total{outcome="failed"} 4', committer.to_prometheus())
+        data_service.close()
+
+    def test_reads_see_held_seats_before_the_flush(self):
+        data_service = DataService(self.restaurants_file, self.reservations_file, group_commit=True)
+        engine, index = data_service.get_availability_engine(), data_service.get_slot_index()
+        row = engine.row_of["Restaurant A"]
+        book_reservations = data_service.storage.book_reservations
+        writing, release = threading.Event(), threading.Event()
+
+        def slow_then_refuse(reservations, atomic=True):
+            writing.set()
+            release.wait()
+            return [False] * len(reservations)  # As if another process took the seats first
+        data_service.storage.book_reservations = slow_then_refuse
+
+        def seats():
+            # The slot is not listed, so it starts at the full capacity of 20
+            return (data_service.get_restaurant("Restaurant A")["available_slots"].get(HOT_SLOT, 20),
+                    int(engine.seats_at(HOT_SLOT)[row]), index._seats["Restaurant A"].get(HOT_SLOT, 20))
+        self.assertEqual(seats(), (20, 20, 20))
+        results = []
+        thread = threading.Thread(target=lambda: results.append(data_service.book_reservation(
+            {"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": 15})))
+        thread.start()
+        writing.wait()
+        # The booking is being written: every read already counts its seats as taken
+        self.assertEqual(seats(), (5, 5, 5))
+        check = {"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": 10}
+        self.assertFalse(check_availability(check, data_service)["available"])
+        self.assertEqual([r["available_slots"][HOT_SLOT] for r in data_service.load_restaurants() if r["name"] == "Restaurant A"], [5])
+        release.set()
+        thread.join()
+        # Storage refused it, so the hold is given back everywhere
+        self.assertEqual(results, [False])
+        self.assertEqual(seats(), (20, 20, 20))
+        self.assertTrue(check_availability(check, data_service)["available"])
+        data_service.storage.book_reservations = book_reservations
+        self.assertTrue(data_service.book_reservation({"restaurant_name": "Restaurant A", "date_time": HOT_SLOT, "party_size": 15}))
+        self.assertEqual(seats(), (5, 5, 5))
+        data_service.close()
+
+    def test_off_by_default(self):
+        data_service = DataService(self.restaurants_file, self.reservations_file)
+        self.assertIsNone(data_service.get_group_committer())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_intent_cache.py
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from agents.intent_cache import IntentCache
+from agents.tool_registry import detect_intent, get_intent_cache
+from services.data_service import DataService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestIntentCache(unittest.TestCase):
+    def test_lru_eviction_ttl_and_copies(self):
+        clock = FakeClock()
+        cache = IntentCache(maxsize=2, ttl=10, clock=clock)
+        cache.put("a", "query_restaurant", {"restaurant_name": "restaurant a"})
+        cache.put("b", None, {})
+        self.assertEqual(cache.get("a"), ("query_restaurant", {"restaurant_name": "restaurant a"}))
+        cache.put("c", None, {})  # "b" is the least recently used
+        self.assertIsNone(cache.get("b"))
+        cache.get("a")[1]["restaurant_name"] = "corrupted"
+        self.assertEqual(cache.get("a")[1], {"restaurant_name": "restaurant a"})
+        clock.now = 10
+        self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["expirations"], stats["size"]),
+                         (3, 2, 1, 1, 1))
+
+    def test_zero_size_disables_cache(self):
+        cache = IntentCache(maxsize=0)
+        cache.put("a", None, {})
+        self.assertIsNone(cache.get("a"))
+
+class TestDetectIntentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.data_service = DataService(self.restaurants_file, os.path.join(self.tmp_dir, "reservations.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_normalized_inputs_share_entries_until_the_catalog_changes(self):
+        cache = get_intent_cache(self.data_service)
+        intent, params = detect_intent("Tell me the details of Restaurant B", self.data_service)
+        self.assertEqual((intent, params), ("query_restaurant", {"restaurant_name": "Restaurant B"}))
+        params["restaurant_name"] = "corrupted"
+        self.assertEqual(detect_intent("  tell me the DETAILS of   restaurant b ", self.data_service)[1],
+                         {"restaurant_name": "Restaurant B"})
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # Renaming the restaurant bumps the catalog generation, so the cached answer is not reused
+        restaurants = json.loads(json.dumps(self.data_service.load_restaurants()))
+        restaurants[1]["name"] = "Bistro Bravo"
+        with open(self.restaurants_file, 'w') as f:
+            json.dump(restaurants, f)
+        intent, params = detect_intent("tell me the details of restaurant b", self.data_service)
+        self.assertEqual(params, {"restaurant_name": None})
+        self.assertEqual(cache.misses, 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/test_llm_scheduler.py
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from agents.core_agent import FoodieSpotAgent
+from services.data_service import DataService
+from services.llm_backend import RuleBasedLLM
+from services.llm_scheduler import BatchingScheduler, ThreadedLLMClient
+
+class FailingLLM(RuleBasedLLM):
+    def generate_batch(self, requests):
+        raise RuntimeError("model crashed")
+
+class ShortLLM(RuleBasedLLM):
+    def generate_batch(self, requests):
+        return super().generate_batch(requests)[:1]
+
+class TestBatchingScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_requests_are_batched(self):
+        backend = RuleBasedLLM(batch_latency=0.01, item_latency=0)
+        scheduler = BatchingScheduler(backend, max_batch_size=4, max_wait=0.01)
+        messages = [f"book restaurant {c} for {i + 1}" for i, c in enumerate("abcdefghij")]
+        results = await asyncio.gather(*(scheduler.generate("tool_decision", m) for m in messages))
+        self.assertEqual([r["arguments"]["party_size"] for r in results], list(range(1, 11)))
+        self.assertEqual(results[2]["arguments"]["restaurant_id"], "Restaurant C")
+        self.assertEqual(backend.batches, 3)
+        self.assertEqual(scheduler.stats()["mean_batch_size"], 10 / 3)
+
+    async def test_identical_requests_are_deduplicated_and_copied(self):
+        backend = RuleBasedLLM(batch_latency=0.01, item_latency=0)
+        scheduler = BatchingScheduler(backend)
+        results = await asyncio.gather(*(scheduler.generate("tool_decision", "book a table for 2") for _ in range(5)))
+        self.assertEqual(backend.requests, 1)
+        self.assertEqual(scheduler.stats()["deduplicated"], 4)
+        results[0]["arguments"]["party_size"] = 99
+        self.assertEqual(results[1]["arguments"]["party_size"], 2)
+
+    async def test_timeouts_and_errors(self):
+        scheduler = BatchingScheduler(RuleBasedLLM(batch_latency=0.2), timeout=0.02)
+        with self.assertRaises(TimeoutError):
+            await scheduler.generate("general_response", "hi")
+        self.assertEqual(scheduler.stats()["timeouts"], 1)
+        scheduler = BatchingScheduler(FailingLLM())
+        outcomes = await asyncio.gather(scheduler.generate("error"), scheduler.generate("general_response", "hi"),
+                                        return_exceptions=True)
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes))
+
+    async def test_short_batch_fails_the_unanswered_requests(self):
+        scheduler = BatchingScheduler(ShortLLM(batch_latency=0, item_latency=0), max_batch_size=3, max_wait=0.01, timeout=1)
+        outcomes = await asyncio.gather(*(scheduler.generate("tool_decision", f"book a table for {i}") for i in (2, 3, 4)),
+                                        return_exceptions=True)
+        self.assertEqual(outcomes[0]["arguments"]["party_size"], 2)
+        self.assertTrue(all(isinstance(outcome, RuntimeError) for outcome in outcomes[1:]))
+        self.assertEqual(scheduler.stats()["timeouts"], 0)
+
+class TestThreadedLLMClient(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_agent_threads_share_batches(self):
+        data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"), os.path.join(self.tmp_dir, "reservations.json"))
+        backend = RuleBasedLLM(batch_latency=0.05, item_latency=0)
+        llm = ThreadedLLMClient(backend, max_wait=0.02)
+        try:
+            agent = FoodieSpotAgent(llm, data_service)
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                responses = list(pool.map(
+                    lambda i: agent.process_message(f"book restaurant a on 2030-01-01 at 18:00 for {i + 1}", session_id=str(i)),
+                    range(8)))
+        finally:
+            llm.close()
+        self.assertTrue(all(response.startswith("Great news! Restaurant A") for response in responses))
+        self.assertEqual(backend.requests, 8)
+        self.assertLess(backend.batches, 8)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/test_matcher.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from agents.matcher import CatalogMatcher, MultiPatternMatcher
+from agents.tool_registry import TOOLS, get_matcher
+from services.data_service import DataService
+
+class TestMatcher(unittest.TestCase):
+    def setUp(self):
+        self.restaurants = [
+            {"name": "Restaurant A", "cuisine": "Italian"},
+            {"name": "Restaurant AB", "cuisine": "Japanese"},
+        ]
+        self.matcher = CatalogMatcher(self.restaurants, TOOLS)
+
+    def test_finds_overlapping_patterns(self):
+        automaton = MultiPatternMatcher([("he", 1), ("she", 2), ("hers", 3)])
+        self.assertEqual(sorted(automaton.find_all("ushers")), [(1, 4, 2), (2, 4, 1), (2, 6, 3)])
+
+    def test_longest_restaurant_name_wins(self):
+        self.assertEqual(self.matcher.scan("book Restaurant AB tonight")["restaurant"], "Restaurant AB")
+        self.assertEqual(self.matcher.scan("book restaurant a tonight")["restaurant"], "Restaurant A")
+
+    def test_names_need_word_boundaries_but_keywords_do_not(self):
+        result = self.matcher.scan("booking a table at restaurant abc")
+        self.assertIsNone(result["restaurant"])
+        self.assertIn(("make_reservation", "book"), result["keywords"])
+        self.assertIn(("make_reservation", "table"), result["keywords"])
+
+    def test_cuisine_is_capitalized(self):
+        self.assertEqual(self.matcher.scan("any ITALIAN place?")["cuisine"], "Italian")
+
+    def test_matcher_survives_bookings_but_not_catalog_edits(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        data_service = DataService(os.path.join(tmp_dir, "restaurants.json"), os.path.join(tmp_dir, "reservations.json"))
+        matcher = get_matcher(data_service)
+        data_service.book_reservation({"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": 2})
+        self.assertIs(get_matcher(data_service), matcher)
+        restaurants = [dict(r) for r in data_service.load_restaurants()]
+        restaurants.append(dict(restaurants[0], name="Restaurant Z"))
+        data_service.storage.import_data(restaurants, [])
+        self.assertIsNot(get_matcher(data_service), matcher)
+        self.assertEqual(get_matcher(data_service).scan("info on restaurant z")["restaurant"], "Restaurant Z")
+
+if __name__ == "__main__":
+    unittest.main()
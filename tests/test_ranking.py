@@ -0,0 +1,95 @@
+# tests/test_ranking.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from services.availability_engine import AvailabilityEngine
+from services.data_service import DataService
+from services.ranking import RANKER_CACHE_SIZE, Ranker, get_ranker
+from tools.recommendation_tools import recommend_restaurant
+
+SLOT = "2030-01-01 19:00"
+
+def _restaurant(name, location, seats, cuisine="Italian"):
+    return {"name": name, "location": location, "cuisine": cuisine, "seating_capacity": 50,
+            "available_slots": {SLOT: seats}}
+
+RESTAURANTS = [
+    _restaurant("Roomy Eastside", "Eastside", 40),     # 1.0 + 0.3 + 0.0
+    _restaurant("Cozy Midtown", "Midtown", 6),         # 1.0 + 0.5 + 0.2
+    _restaurant("Roomy Downtown", "Downtown", 40),     # 1.0 + 0.3 + 0.4, ties with the cozy nearby ones
+    _restaurant("Cozy Downtown", "Downtown", 6),       # 1.0 + 0.5 + 0.4
+    _restaurant("Full Downtown", "Downtown", 2),
+    _restaurant("Cozy Uptown", "Uptown", 5),           # 1.0 + 0.5 + 0.2
+    _restaurant("Taqueria", "Downtown", 6, "Mexican"),
+]
+
+class TestRanker(unittest.TestCase):
+    def setUp(self):
+        self.engine = AvailabilityEngine.from_restaurants(RESTAURANTS)
+
+    def _names(self, page):
+        return [self.engine.names[row] for row, _, _ in page]
+
+    def test_top_k_matches_full_sort_and_keeps_catalog_order_on_ties(self):
+        total, page = Ranker(self.engine).top(4, SLOT, cuisine="Italian", limit=10)
+        self.assertEqual(total, 5)
+        self.assertEqual(self._names(page), ["Cozy Downtown", "Cozy Midtown", "Roomy Downtown", "Cozy Uptown", "Roomy Eastside"])
+        self.assertAlmostEqual(page[0][1], 1.9)
+        self.assertEqual(page[0][2], 6)
+
+    def test_pagination_and_user_location(self):
+        ranker = Ranker(self.engine, user_location="Eastside")
+        _, first = ranker.top(4, SLOT, cuisine="Italian", limit=2)
+        _, second = ranker.top(4, SLOT, cuisine="Italian", offset=2, limit=2)
+        self.assertEqual(self._names(first), ["Roomy Eastside", "Cozy Midtown"])
+        self.assertEqual(self._names(second), ["Cozy Downtown", "Roomy Downtown"])
+
+    def test_weights_override_and_rankers_are_cached(self):
+        ranker = get_ranker(self.engine, weights={"roomy": 1.0})
+        self.assertIs(ranker, get_ranker(self.engine, weights={"roomy": 1.0}))
+        self.assertIsNot(ranker, get_ranker(self.engine))
+        _, page = ranker.top(4, SLOT, cuisine="Italian", limit=1)
+        self.assertEqual(self._names(page), ["Roomy Downtown"])
+        self.assertIs(ranker, get_ranker(self.engine, weights={"roomy": "1"}))
+
+    def test_ranker_cache_is_bounded_lru(self):
+        first = get_ranker(self.engine, weights={"roomy": 0.0})
+        for i in range(1, RANKER_CACHE_SIZE):
+            get_ranker(self.engine, weights={"roomy": float(i)})
+            self.assertIs(first, get_ranker(self.engine, weights={"roomy": 0.0}))
+        get_ranker(self.engine, weights={"roomy": -1.0})
+        get_ranker(self.engine, weights={"roomy": -2.0})
+        self.assertIs(first, get_ranker(self.engine, weights={"roomy": 0.0}))
+        self.assertIsNot(get_ranker(self.engine, weights={"roomy": 1.0}), get_ranker(self.engine, weights={"roomy": 1.0001}))
+
+    def test_bad_weights_are_rejected(self):
+        for weights in ({"roomy": float("nan")}, {"roomy": "inf"}, {"roomy": "a lot"}, {"roomy": True}, {"tastiness": 1}):
+            with self.assertRaises(ValueError):
+                get_ranker(self.engine, weights=weights)
+
+class TestRecommendRestaurant(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+        self.data_service.storage.import_data(RESTAURANTS, [])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_pages_through_recommendations(self):
+        params = {"cuisine": "Italian", "party_size": "4", "date_time": SLOT}
+        response = recommend_restaurant(params, self.data_service)
+        self.assertIn("1. **Cozy Downtown** (Italian) - Downtown", response)
+        self.assertIn("3. **Roomy Downtown**", response)
+        self.assertIn("Showing 1-3 of 5", response)
+        response = recommend_restaurant(dict(params, offset=3), self.data_service)
+        self.assertIn("4. **Cozy Uptown**", response)
+        self.assertNotIn("Showing", response)
+        self.assertEqual(recommend_restaurant(dict(params, offset=5), self.data_service), "No more recommendations.")
+        self.assertEqual(recommend_restaurant(dict(params, cuisine="Greek"), self.data_service), "No suitable restaurants found.")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# tests/test_reservation_index.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from agents.tool_registry import create_registry, detect_intent
+from services.data_service import DataService
+from services.reservation_index import ReservationIndex
+from tools.reservation_tools import make_reservation
+
+def _reservation(reservation_id, restaurant_name, date_time, customer=None):
+    reservation = {"reservation_id": reservation_id, "restaurant_name": restaurant_name,
+                   "date_time": date_time, "party_size": 2}
+    if customer:
+        reservation["customer"] = customer
+    return reservation
+
+class TestReservationIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = ReservationIndex.from_reservations([
+            _reservation("a", "Restaurant C", "2030-01-02 19:00", "Ann"),
+            _reservation("b", "Restaurant C", "2030-01-01 18:00"),
+            _reservation("c", "Restaurant D", "2030-01-02 18:30", "ann "),
+            _reservation("d", "Restaurant C", "2030-01-02 17:00"),
+        ])
+
+    def test_time_range_is_half_open_and_sorted(self):
+        between = self.index.reservations_between("Restaurant C", "2030-01-02 17:00", "2030-01-02 19:00")
+        self.assertEqual([r["reservation_id"] for r in between], ["d"])
+        evening = self.index.reservations_between("Restaurant C", "2030-01-02", "2030-01-03")
+        self.assertEqual([r["reservation_id"] for r in evening], ["d", "a"])
+        self.assertEqual(self.index.reservations_between("Restaurant Z", "2030", "2031"), [])
+
+    def test_date_and_customer_lookups_follow_adds_and_removes(self):
+        self.assertEqual([r["reservation_id"] for r in self.index.on_date("2030-01-02")], ["a", "c", "d"])
+        self.assertEqual([r["reservation_id"] for r in self.index.by_customer("ANN")], ["a", "c"])
+        self.index.add(_reservation("e", "Restaurant C", "2030-01-02 18:00", "Ann"))
+        self.assertEqual(self.index.remove("a")["restaurant_name"], "Restaurant C")
+        self.assertIsNone(self.index.remove("a"))
+        self.assertEqual([r["reservation_id"] for r in self.index.by_customer("ann")], ["c", "e"])
+        self.assertEqual([r["reservation_id"] for r in self.index.reservations_between("Restaurant C", "2030-01-02", "2030-01-03")],
+                         ["d", "e"])
+        self.assertEqual(self.index.get("e")["customer"], "Ann")
+        self.assertEqual(len(self.index), 4)
+
+class TestDataServiceReservationIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.restaurants_file = os.path.join(self.tmp_dir, "restaurants.json")
+        self.reservations_file = os.path.join(self.tmp_dir, "reservations.json")
+        self.data_service = DataService(self.restaurants_file, self.reservations_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_index_is_patched_on_writes_and_catches_up_with_external_ones(self):
+        self.data_service.book_reservation({"restaurant_name": "Restaurant C", "date_time": "2030-01-01 18:00",
+                                            "party_size": 2, "customer": "Ann"})
+        index = self.data_service.get_reservation_index()
+        late = {"restaurant_name": "Restaurant C", "date_time": "2030-01-01 21:00", "party_size": 4, "customer": "Ann"}
+        self.data_service.book_reservation(late)
+        self.assertIs(self.data_service.get_reservation_index(), index)
+        self.assertEqual(len(self.data_service.reservations_between("Restaurant C", "2030-01-01 19:00", "2030-01-02")), 1)
+        self.data_service.cancel_reservation(late["reservation_id"])
+        self.assertIs(self.data_service.get_reservation_index(), index)
+        self.assertEqual([r["party_size"] for r in self.data_service.by_customer("ann")], [2])
+
+        # Another process's writes are read from the ledger tail into the same index
+        other = DataService(self.restaurants_file, self.reservations_file)
+        first = {"restaurant_name": "Restaurant C", "date_time": "2030-01-01 20:00", "party_size": 6}
+        other.book_reservation(first)
+        self.assertIs(self.data_service.get_reservation_index(), index)
+        self.assertEqual([r["party_size"] for r in self.data_service.reservations_on("2030-01-01")], [2, 6])
+        other.cancel_reservation(first["reservation_id"])
+        self.data_service.book_reservation({"restaurant_name": "Restaurant C", "date_time": "2030-01-01 19:00", "party_size": 3})
+        self.assertIs(self.data_service.get_reservation_index(), index)
+        self.assertEqual([r["party_size"] for r in self.data_service.reservations_on("2030-01-01")], [2, 3])
+
+        # A compaction replaces the ledger, so the next change rebuilds the index
+        other.compact_reservations()
+        other.book_reservation({"restaurant_name": "Restaurant C", "date_time": "2030-01-01 22:00", "party_size": 1})
+        self.assertIsNot(self.data_service.get_reservation_index(), index)
+        self.assertEqual([r["party_size"] for r in self.data_service.reservations_on("2030-01-01")], [2, 3, 1])
+
+    def test_find_reservations_tool(self):
+        for customer, date_time in (("Ann", "2030-01-01 18:00"), ("Bo", "2030-01-01 19:00"), ("Ann", "2030-01-02 18:00")):
+            make_reservation({"restaurant_name": "Restaurant C", "date_time": date_time, "party_size": "2",
+                              "customer": customer}, self.data_service)
+        registry = create_registry(self.data_service)
+        intent, params = detect_intent("show reservations at restaurant c on 2030-01-01", self.data_service, use_cache=False)
+        self.assertEqual((intent, params), ("find_reservations", {"restaurant_name": "Restaurant C", "date": "2030-01-01"}))
+        message = registry.execute_tool(intent, params)
+        self.assertIn("Found 2 reservations", message)
+        self.assertNotIn("2030-01-02", message)
+        message = registry.execute_tool("find_reservations", {"customer": "ann"})
+        self.assertIn("2030-01-02 18:00 at Restaurant C", message)
+        self.assertNotIn("19:00", message)
+        self.assertIn("No reservations", registry.execute_tool("find_reservations", {"date": "2031-01-01"}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# tests/test_server.py
+
+import asyncio
+import http.client
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from server import ReservationServer, create_data_service
+
+class TestReservationServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.app = ReservationServer(create_data_service(self.tmp_dir), threads=4)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server = self._run(asyncio.start_server(self.app.handle_connection, "127.0.0.1", 0))
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+        self._run(self.server.wait_closed())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.app.executor.shutdown()
+        shutil.rmtree(self.tmp_dir)
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout=10)
+
+    def _request(self, conn, method, path, body=None):
+        conn.request(method, path, body=json.dumps(body) if body is not None else None,
+                     headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if response.getheader("Content-Type") == "application/json" else data.decode()
+
+    def test_endpoints_over_one_keep_alive_connection(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+        try:
+            status, body = self._request(conn, "POST", "/intent", {"message": "Tell me about Restaurant B"})
+            self.assertEqual((status, body), (200, {"intent": "query_restaurant", "params": {"restaurant_name": "Restaurant B"}}))
+            status, body = self._request(conn, "POST", "/query", {"restaurant_name": "Restaurant B"})
+            self.assertIn("Location: Midtown", body["message"])
+            status, body = self._request(conn, "POST", "/reservations",
+                                         {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 18:00", "party_size": "4"})
+            self.assertIn("Reservation successful", body["message"])
+            status, body = self._request(conn, "POST", "/recommendations", {"cuisine": "Italian", "party_size": 4})
+            self.assertEqual(status, 422)
+            self.assertIn("missing required parameter 'date_time'", body["error"])
+            self.assertEqual(self._request(conn, "GET", "/nowhere")[0], 404)
+            status, text = self._request(conn, "GET", "/metrics")
+            self.assertIn('foodiespot_tool_calls_total{tool="make_reservation"} 1', text)
+        finally:
+            conn.close()
+
+    def test_identical_concurrent_reads_are_coalesced(self):
+        body = json.dumps({"cuisine": "Italian", "party_size": "4", "date_time": "2030-01-01 18:00"}).encode()
+
+        async def burst():
+            return await asyncio.gather(*(self.app.dispatch("POST", "/recommendations", body) for _ in range(5)))
+
+        results = self._run(burst())
+        self.assertEqual(len({json.dumps(payload) for _, payload, _ in results}), 1)
+        self.assertEqual(self.app.coalesced, 4)
+        self.assertEqual(self.app.registry.metrics.snapshot()["recommend_restaurant"]["calls"], 1)
+
+    def test_invalid_content_length_is_a_bad_request(self):
+        for length in ("abc", "-1", "+5", "1e3"):
+            with socket.create_connection(("127.0.0.1", self.port), timeout=10) as sock:
+                sock.sendall(f"POST /query HTTP/1.1\r\nHost: x\r\nContent-Length: {length}\r\n\r\n".encode())
+                status_line = sock.makefile("rb").readline()
+            self.assertTrue(status_line.startswith(b"HTTP/1.1 400 "), (length, status_line))
+
+    def test_reads_run_safely_alongside_bookings(self):
+        async def burst():
+            requests = []
+            for i in range(40):
+                # New slot keys, so bookings add entries to the slot dicts being read
+                date_time = f"2030-02-{i % 28 + 1:02d} {17 + i % 5}:00"
+                requests.append(self.app.dispatch("POST", "/reservations", json.dumps(
+                    {"restaurant_name": "Restaurant A", "date_time": date_time, "party_size": "2"}).encode()))
+                requests.append(self.app.dispatch("POST", "/recommendations", json.dumps(
+                    {"cuisine": "Italian", "party_size": "2", "date_time": date_time}).encode()))
+            return await asyncio.gather(*requests)
+
+        results = self._run(burst())
+        self.assertEqual({status for status, _, _ in results}, {200})
+        self.assertEqual(sum("Reservation successful" in payload["message"] for _, payload, _ in results), 40)
+
+if __name__ == "__main__":
+    unittest.main()
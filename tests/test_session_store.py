@@ -0,0 +1,85 @@
+# tests/test_session_store.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from agents.core_agent import FoodieSpotAgent
+from agents.session_store import InMemorySessionStore, SqliteSessionStore
+from services.data_service import DataService
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeLLM:
+    def generate(self, kind, user_input=None):
+        if kind == "tool_decision":
+            if "book" in user_input:
+                return {"requires_tool": True, "tool_name": "check_availability", "arguments": {"restaurant_id": "Restaurant A"}}
+            return {"requires_tool": False}
+        return "Happy to help."
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_ring_buffer_summarizes_older_turns(self):
+        store = InMemorySessionStore(history_size=3)
+        session = store.get("s1")
+        for i in range(5):
+            store.append(session, "user", f"message {i}")
+        self.assertEqual([content for _, content in session.history], ["message 2", "message 3", "message 4"])
+        self.assertEqual(session.summary, "message 0 | message 1")
+        self.assertEqual(session.turn_count, 5)
+        self.assertEqual(session.messages()[0]["content"], "Earlier in this conversation: message 0 | message 1")
+
+    def test_lru_and_idle_eviction(self):
+        store = InMemorySessionStore(max_sessions=2, idle_timeout=60, clock=self.clock)
+        store.get("a").pending_reservation = {"restaurant_id": "Restaurant A"}
+        store.get("b")
+        store.get("a")
+        store.get("c")  # Evicts "b", the least recently used
+        self.assertEqual(store.get("a").pending_reservation, {"restaurant_id": "Restaurant A"})
+        self.assertEqual(len(store), 2)
+        self.clock.now += 61
+        self.assertEqual(store.evict_idle(), 2)
+        self.assertIsNone(store.get("a").pending_reservation)
+        self.assertEqual(store.evictions, 3)
+
+    def test_sqlite_store_is_shared_between_instances(self):
+        path = os.path.join(self.tmp_dir, "sessions.db")
+        worker_1 = SqliteSessionStore(path, history_size=2, idle_timeout=60, clock=self.clock)
+        worker_2 = SqliteSessionStore(path, history_size=2, idle_timeout=60, clock=self.clock)
+        session = worker_1.get("s1")
+        for content in ["hi", "book a table", "for 4"]:
+            worker_1.append(session, "user", content)
+        session.pending_reservation = {"party_size": 4}
+        worker_1.save(session)
+        restored = worker_2.get("s1")
+        self.assertEqual(list(restored.history), [("user", "book a table"), ("user", "for 4")])
+        self.assertEqual((restored.summary, restored.pending_reservation), ("hi", {"party_size": 4}))
+        self.clock.now += 61
+        self.assertIsNone(worker_2.get("s1").pending_reservation)
+        self.assertEqual(worker_2.evict_idle(), 1)
+        self.assertEqual(len(worker_1), 0)
+
+    def test_agent_keeps_conversations_apart(self):
+        data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"), os.path.join(self.tmp_dir, "reservations.json"))
+        agent = FoodieSpotAgent(FakeLLM(), data_service)
+        self.assertIn("To make your reservation", agent.process_message("book a table", session_id="alice"))
+        self.assertEqual(agent.process_message("hello", session_id="bob"), "Happy to help.")
+        # Alice's pending reservation survives Bob's turn
+        self.assertEqual(agent.process_message("tomorrow", session_id="alice"), "What date would you like to book for?")
+        self.assertEqual(len(agent.sessions.get("alice").history), 4)
+        self.assertEqual(agent.sessions.get("bob").pending_reservation, None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_slot_index.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from services.data_service import DataService
+from services.slot_index import SlotIndex, find_alternatives
+from tools.reservation_tools import check_availability, make_reservation
+
+SLOTS = {"2030-01-01 17:00": 4, "2030-01-01 18:00": 10, "2030-01-01 19:00": 0, "2030-01-01 20:30": 10, "2030-01-01 21:00": 1}
+
+class TestSlotIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+        restaurants = [
+            {"name": "Restaurant A", "location": "Downtown", "cuisine": "Italian", "seating_capacity": 10, "available_slots": dict(SLOTS)},
+            {"name": "Restaurant B", "location": "Uptown", "cuisine": "Italian", "seating_capacity": 10,
+             "available_slots": {"2030-01-01 19:00": 0, "2030-01-01 19:30": 6}},
+            {"name": "Restaurant C", "location": "Downtown", "cuisine": "Italian", "seating_capacity": 10, "available_slots": {}},
+            {"name": "Restaurant D", "location": "Downtown", "cuisine": "Mexican", "seating_capacity": 10, "available_slots": {}},
+        ]
+        self.data_service.storage.import_data(restaurants, [])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_nearest_slots_alternate_by_distance_and_skip_small_ones(self):
+        index = SlotIndex([{"name": "A", "available_slots": SLOTS}])
+        self.assertEqual([key for key, _ in index.nearest("A", "2030-01-01 19:00", 2, k=3)],
+                         ["2030-01-01 18:00", "2030-01-01 20:30", "2030-01-01 17:00"])
+        index.apply("A", "2030-01-01 18:00", 0)
+        index.apply("A", "2030-01-01 19:00", 3)
+        self.assertEqual([key for key, _ in index.nearest("A", "2030-01-01 18:15", 2, k=2)],
+                         ["2030-01-01 19:00", "2030-01-01 17:00"])
+
+    def test_full_slot_suggests_alternatives(self):
+        result = check_availability({"restaurant_id": "Restaurant A", "date": "2030-01-01", "time_slot": "19:00",
+                                     "party_size": 2}, self.data_service)
+        self.assertFalse(result["available"])
+        self.assertEqual(result["alternative_times"], ["2030-01-01 18:00", "2030-01-01 20:30", "2030-01-01 17:00"])
+        # Same location first; Mexican restaurants are never suggested
+        self.assertEqual(result["alternative_restaurants"], ["Restaurant C at 2030-01-01 19:00", "Restaurant B at 2030-01-01 19:30"])
+
+    def test_past_slots_are_never_suggested(self):
+        alternatives = find_alternatives(self.data_service, "Restaurant A", "2030-01-01 19:00", 2, now="2030-01-01 18:00")
+        self.assertEqual([option["date_time"] for option in alternatives["same_restaurant"]], ["2030-01-01 20:30"])
+        alternatives = find_alternatives(self.data_service, "Restaurant A", "2030-01-01 19:00", 2, now="2030-01-01 19:30")
+        self.assertEqual(alternatives, {"same_restaurant": [{"restaurant_name": "Restaurant A", "date_time": "2030-01-01 20:30",
+                                                             "seats": 10}], "nearby": []})
+        # A query in the past, by the real clock, is never answered with the requested time
+        alternatives = find_alternatives(self.data_service, "Restaurant A", "2020-01-01 19:00", 2)
+        self.assertEqual([option["date_time"] for option in alternatives["same_restaurant"]],
+                         ["2030-01-01 17:00", "2030-01-01 18:00", "2030-01-01 20:30"])
+        self.assertEqual([(option["restaurant_name"], option["date_time"]) for option in alternatives["nearby"]],
+                         [("Restaurant B", "2030-01-01 19:30")])
+
+    def test_make_reservation_lists_alternatives_when_full(self):
+        params = {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 1800", "party_size": "10"}
+        self.assertIn("Reservation successful", make_reservation(params, self.data_service))
+        response = make_reservation(params, self.data_service)
+        self.assertIn("fully booked", response)
+        self.assertIn("Nearest available times at Restaurant A: 2030-01-01 20:30", response)
+        self.assertIn("Restaurant C at 2030-01-01 18:00", response)
+
+if __name__ == "__main__":
+    unittest.main()
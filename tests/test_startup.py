@@ -0,0 +1,54 @@
+# tests/test_startup.py
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter (-B so bytecode writes do not count as I/O). An audit hook
+# records every file write, filesystem change or data file read made while importing.
+IMPORT_PROBE = """
+import json, os, sys
+DATA_DIR = os.path.join(os.getcwd(), "data")
+WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND
+events = []
+
+def audit(event, args):
+    if event == "open":
+        path, mode, flags = args
+        if isinstance(path, int):
+            return
+        path = os.fsdecode(path)
+        writes = any(c in mode for c in "wax+") if mode else bool((flags or 0) & WRITE_FLAGS)
+        if writes or os.path.abspath(path).startswith(DATA_DIR):
+            events.append(f"open {path} {mode or flags}")
+    elif event in ("os.mkdir", "os.rename", "os.replace", "os.remove", "os.truncate", "sqlite3.connect"):
+        events.append(f"{event} {args[0]}")
+
+sys.addaudithook(audit)
+import config, local_llm
+import agents.core_agent, agents.tool_registry
+import tools.reservation_tools, tools.query_tools, tools.recommendation_tools
+import services.data_service, services.validation_service
+print(json.dumps({"events": events, "heavy": sorted({"numpy", "pytz", "sqlite3"} & set(sys.modules))}))
+"""
+
+class TestStartup(unittest.TestCase):
+    def setUp(self):
+        result = subprocess.run([sys.executable, "-B", "-c", IMPORT_PROBE], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        self.stdout = result.stdout
+
+    def test_imports_do_no_io_and_print_nothing(self):
+        lines = self.stdout.splitlines()
+        self.assertEqual(len(lines), 1, f"imports printed output: {lines[:-1]}")
+        self.assertEqual(json.loads(lines[-1])["events"], [])
+
+    def test_heavy_modules_are_imported_lazily(self):
+        self.assertEqual(json.loads(self.stdout.splitlines()[-1])["heavy"], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# tests/test_tool_registry.py
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+from agents.core_agent import FoodieSpotAgent
+from agents.metrics import COMPUTE_METHODS, io_clock_start, io_clock_stop
+from agents.tool_registry import ToolRegistry, create_registry
+from services.data_service import DataService
+from services.slot_index import SlotIndex
+
+class TestToolRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_schema_validation(self):
+        registry = ToolRegistry()
+        registry.register_tool("echo", lambda params: params, "Echo params.", {
+            "party_size": {"type": "integer", "required": True},
+            "date": {"type": "string", "format": "YYYY-MM-DD", "required": False},
+        })
+        self.assertEqual(registry.execute_tool("echo", {"party_size": "4"}), {"party_size": "4"})
+        for params, problem in [({}, "missing required parameter 'party_size'"),
+                                ({"party_size": "four"}, "'party_size' must be of type integer"),
+                                ({"party_size": 2, "date": "17/05/2030"}, "'date' must match format YYYY-MM-DD"),
+                                ({"party_size": 2, "color": "red"}, "unexpected parameter 'color'")]:
+            with self.assertRaisesRegex(ValueError, problem):
+                registry.execute_tool("echo", params)
+        registry = create_registry(self.data_service)
+        params = {"cuisine": "Italian", "party_size": 2, "date_time": "2030-01-01 19:00", "weights": {"roomy": float("nan")}}
+        with self.assertRaisesRegex(ValueError, "'weights' must match format weights"):
+            registry.execute_tool("recommend_restaurant", params)
+        with self.assertRaisesRegex(ValueError, "Unknown tool"):
+            registry.execute_tool("missing", {})
+        with self.assertRaisesRegex(ValueError, "unknown type"):
+            registry.register_tool("bad", print, "Bad schema.", {"x": {"type": "uuid"}})
+
+    def test_metrics_split_io_from_compute_and_export(self):
+        registry = ToolRegistry()
+        data_service = registry.instrument(self.data_service)
+
+        def slow_tool(params):
+            data_service.load_restaurants()
+            time.sleep(0.02)  # Compute outside the DataService
+            if params.get("fail"):
+                raise RuntimeError("boom")
+            return "ok"
+
+        registry.register_tool("slow", slow_tool, "Sleeps.", {"fail": {"type": "boolean", "required": False}})
+        registry.execute_tool("slow", {})
+        with self.assertRaises(RuntimeError):
+            registry.execute_tool("slow", {"fail": True})
+        with self.assertRaises(ValueError):
+            registry.execute_tool("slow", {"fail": "yes"})
+
+        stats = json.loads(registry.metrics.to_json())["slow"]
+        self.assertEqual(stats["calls"], 3)
+        self.assertEqual(stats["errors_by_type"], {"RuntimeError": 1, "ValueError": 1})
+        self.assertEqual(stats["latency_seconds"]["buckets"]["+Inf"], 3)
+        self.assertGreater(stats["io_seconds"], 0)
+        self.assertGreaterEqual(stats["compute_seconds"], 0.04)
+
+        text = registry.metrics.to_prometheus()
+        self.assertIn('foodiespot_tool_calls_total{tool="slow"} 3', text)
+        self.assertIn('foodiespot_tool_errors_total{tool="slow",error="RuntimeError"} 1', text)
+        self.assertIn('foodiespot_tool_latency_seconds_bucket{tool="slow",le="+Inf"} 3', text)
+        self.assertIn("# TYPE foodiespot_tool_latency_seconds histogram", text)
+
+    def test_only_storage_reads_count_as_io(self):
+        data_service = ToolRegistry().instrument(self.data_service)
+        for name in COMPUTE_METHODS:
+            self.assertEqual(getattr(data_service, name), getattr(self.data_service, name))
+        data_service.get_slot_index()
+        data_service.reservations_on("2030-01-01")
+        # A booking by another process: the next reads reload the catalog and the ledger tail
+        other = DataService(self.data_service.restaurants_file, self.data_service.reservations_file)
+        self.assertTrue(other.book_reservation({"restaurant_name": "Restaurant B", "date_time": "2030-01-01 19:00", "party_size": 4}))
+        build = SlotIndex.__init__
+
+        def slow_build(index, *args):
+            time.sleep(0.05)
+            build(index, *args)
+
+        with mock.patch.object(SlotIndex, "__init__", slow_build):
+            previous = io_clock_start()
+            data_service.get_slot_index()
+            self.assertEqual(len(data_service.reservations_on("2030-01-01")), 1)
+            seconds = io_clock_stop(previous)
+        # The reload and ledger read are I/O; rebuilding the index from them is not
+        self.assertGreater(seconds, 0.0)
+        self.assertLess(seconds, 0.05)
+        previous = io_clock_start()
+        data_service.load_restaurants()
+        data_service.get_restaurant("Restaurant B")
+        self.assertGreater(io_clock_stop(previous), 0.0)
+
+    def test_registry_serves_intent_tools(self):
+        registry = create_registry(self.data_service)
+        response = registry.execute_tool("query_restaurant", {"restaurant_name": "Restaurant B"})
+        self.assertIn("Location: Midtown", response)
+        self.assertEqual(registry.metrics.snapshot()["query_restaurant"]["calls"], 1)
+        with self.assertRaisesRegex(ValueError, "restaurant_name"):
+            registry.execute_tool("make_reservation", {"restaurant_name": None, "date_time": "2030-01-01 18:00", "party_size": "2"})
+
+    def test_agent_tools_dispatch_through_registry(self):
+        agent = FoodieSpotAgent(llm=None, data_service=self.data_service)
+        registry = agent.tool_registry
+        self.assertEqual([tool["name"] for tool in registry.list_tools()],
+                         ["check_availability", "list_restaurants", "get_recommendations"])
+        result = registry.execute_tool("check_availability", {"restaurant_id": "Restaurant A", "date": "2030-01-01",
+                                                              "time_slot": "18:00", "party_size": 4})
+        self.assertTrue(result["available"])
+        listed = registry.execute_tool("list_restaurants", {"cuisine": ["Italian", "Mexican"], "location": "Downtown"})
+        self.assertEqual([r["name"] for r in listed["restaurants"]], ["Restaurant A", "Restaurant F", "Restaurant K", "Restaurant P"])
+        recommended = registry.execute_tool("get_recommendations", {"occasion": "family dinner", "preferences": "japanese, midtown"})
+        self.assertTrue(recommended)
+        self.assertTrue(all(r["cuisine"] == "Japanese" for r in recommended))
+        self.assertIn("Found 4 restaurants", agent._format_tool_response("list_restaurants", listed))
+        self.assertEqual(set(registry.metrics.snapshot()), {"check_availability", "list_restaurants", "get_recommendations"})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
 # tests/test_tools.py
 
+import os
+import shutil
+import tempfile
 import unittest
-from tools.reservation_tools import make_reservation
+from tools.reservation_tools import make_reservation, make_reservations
 from services.data_service import DataService
 from config import RESTAURANTS_FILE, RESERVATIONS_FILE
 
@@ -18,5 +21,38 @@ class TestTools(unittest.TestCase):
         result = make_reservation(params, self.data_service)
         self.assertTrue("Reservation successful" in result)
 
+class TestBatchReservations(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"))
+        self.batch = [
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": "12"},
+            {"restaurant_name": "Restaurant B", "date_time": "2030-01-01 1900", "party_size": "4"},
+            {"restaurant_name": "Restaurant A", "date_time": "2030-01-01 19:00", "party_size": "10"},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_atomic_batch_books_nothing_if_one_item_fails(self):
+        results = make_reservations(self.batch, self.data_service)
+        self.assertEqual([r["status"] for r in results], ["skipped", "skipped", "skipped"])
+        self.assertEqual(self.data_service.load_reservations(), [])
+        self.assertNotIn("2030-01-01 19:00", self.data_service.get_restaurant("Restaurant A")["available_slots"])
+
+    def test_best_effort_batch_books_what_fits(self):
+        batch = self.batch + [{"restaurant_name": "Nowhere", "date_time": "2030-01-01 19:00", "party_size": "2"}]
+        results = make_reservations(batch, self.data_service, atomic=False)
+        self.assertEqual([r["status"] for r in results], ["booked", "booked", "unavailable", "invalid"])
+        self.assertEqual(results[1]["date_time"], "2030-01-01 19:00")
+        self.assertEqual(len(self.data_service.load_reservations()), 2)
+        self.assertEqual(self.data_service.get_restaurant("Restaurant A")["available_slots"]["2030-01-01 19:00"], 8)
+
+    def test_atomic_batch_commits_when_everything_fits(self):
+        results = make_reservations(self.batch[:2], self.data_service)
+        self.assertEqual([r["status"] for r in results], ["booked", "booked"])
+        self.assertEqual(len(self.data_service.load_reservations()), 2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,130 @@
+# tests/test_waitlist.py
+
+import os
+import shutil
+import tempfile
+import unittest
+from agents.tool_registry import create_registry, detect_intent
+from services.data_service import DataService
+from services.reservation_ledger import ReservationLedger
+from services.waitlist import Waitlist
+from tools.reservation_tools import cancel_reservation, make_reservation
+
+SLOT = "2030-01-01 19:00"
+
+def _reservation(party_size, restaurant_name="Restaurant A"):
+    return {"restaurant_name": restaurant_name, "date_time": SLOT, "party_size": party_size}
+
+class TestWaitlist(unittest.TestCase):
+    def test_earliest_fitting_party_is_promoted_first(self):
+        waitlist = Waitlist()
+        waitlist.join(_reservation(8), requested_at=1)
+        waitlist.join(_reservation(4), requested_at=2)
+        waitlist.join(_reservation(2), requested_at=3)
+        self.assertEqual(waitlist.pop("Restaurant A", SLOT, 5).reservation["party_size"], 4)
+        self.assertEqual(waitlist.pop("Restaurant A", SLOT, 10).reservation["party_size"], 8)
+        self.assertIsNone(waitlist.pop("Restaurant A", SLOT, 1))
+        self.assertIsNone(waitlist.pop("Restaurant B", SLOT, 10))
+
+    def test_smaller_party_wins_a_tie_and_positions_follow_order(self):
+        waitlist = Waitlist()
+        first = waitlist.join(_reservation(4), requested_at=5)
+        self.assertEqual(waitlist.position(first), 1)
+        second = waitlist.join(_reservation(2), requested_at=5)
+        self.assertEqual(waitlist.position(second), 1)
+        self.assertEqual(waitlist.position(first), 2)
+        self.assertEqual(waitlist.pop("Restaurant A", SLOT, 4).waitlist_id, second)
+
+    def test_removed_and_restored_entries(self):
+        waitlist = Waitlist()
+        first = waitlist.join(_reservation(2), requested_at=1)
+        second = waitlist.join(_reservation(2), requested_at=2)
+        self.assertEqual(waitlist.remove(first)["party_size"], 2)
+        self.assertIsNone(waitlist.position(first))
+        entry = waitlist.pop("Restaurant A", SLOT, 2)
+        self.assertEqual(entry.waitlist_id, second)
+        waitlist.restore(entry)
+        self.assertEqual(waitlist.waiting("Restaurant A", SLOT), 1)
+        self.assertEqual(len(waitlist), 1)
+
+class TestReservationLedgerIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger = ReservationLedger(os.path.join(self.tmp_dir, "reservations.jsonl"))
+        self.ledger.create()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_index_follows_appends_tombstones_and_compaction(self):
+        self.ledger.append_many([dict(_reservation(2), reservation_id="a"), _reservation(3)])
+        self.assertEqual(self.ledger.find("a")["party_size"], 2)
+        # Another writer of the same file is seen on the next lookup
+        ReservationLedger(self.ledger.path).append(dict(_reservation(4), reservation_id="b"))
+        self.assertEqual(self.ledger.find("b")["party_size"], 4)
+        self.ledger.cancel("a")
+        self.assertIsNone(self.ledger.find("a"))
+        self.assertEqual([r["party_size"] for r in self.ledger], [3, 4])
+        self.assertEqual(self.ledger.compact(), 2)
+        self.assertEqual(self.ledger.find("b")["party_size"], 4)
+        self.assertIsNone(self.ledger.find("a"))
+
+class CancellationTests:
+    backend = None
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.data_service = DataService(os.path.join(self.tmp_dir, "restaurants.json"),
+                                        os.path.join(self.tmp_dir, "reservations.json"), backend=self.backend)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _seats(self):
+        restaurant = self.data_service.get_restaurant("Restaurant A")
+        return restaurant["available_slots"].get(SLOT, restaurant["seating_capacity"])
+
+    def test_cancel_gives_seats_back_and_promotes_waitlist(self):
+        big = _reservation(16)
+        self.assertTrue(self.data_service.book_reservation(big))
+        self.assertTrue(self.data_service.book_reservation(_reservation(4)))
+        self.assertEqual(self.data_service.get_reservation(big["reservation_id"]), big)
+        self.data_service.join_waitlist(_reservation(12))
+        self.data_service.join_waitlist(_reservation(6))
+        self.data_service.get_slot_index()
+
+        cancelled, promoted = self.data_service.cancel_reservation(big["reservation_id"])
+        self.assertEqual(cancelled, big)
+        self.assertEqual([r["party_size"] for r in promoted], [12])
+        self.assertEqual(self._seats(), 4)
+        self.assertIsNone(self.data_service.get_reservation(big["reservation_id"]))
+        self.assertEqual(sorted(r["party_size"] for r in self.data_service.load_reservations()), [4, 12])
+        self.assertEqual(self.data_service.get_slot_index().inventory_generation, self.data_service.inventory_generation)
+        self.assertEqual(self.data_service.cancel_reservation(big["reservation_id"]), (None, []))
+
+    def test_cancel_tool_and_waitlist_flag(self):
+        params = {"restaurant_name": "Restaurant A", "date_time": SLOT, "party_size": "20"}
+        booked = make_reservation(params, self.data_service)
+        self.assertIn("Reservation successful", booked)
+        reservation_id = self.data_service.load_reservations()[0]["reservation_id"]
+        self.assertIn(reservation_id, booked)
+        self.assertIn("waitlist (position 1)", make_reservation(dict(params, party_size="2", waitlist=True), self.data_service))
+        registry = create_registry(self.data_service)
+        intent, intent_params = detect_intent(f"please cancel reservation {reservation_id}", self.data_service, use_cache=False)
+        self.assertEqual((intent, intent_params), ("cancel_reservation", {"reservation_id": reservation_id}))
+        message = registry.execute_tool(intent, intent_params)
+        self.assertIn(f"Reservation {reservation_id} cancelled", message)
+        self.assertIn("1 waitlisted party", message)
+        self.assertIn("couldn't find", cancel_reservation({"reservation_id": reservation_id}, self.data_service))
+
+class TestJsonCancellation(CancellationTests, unittest.TestCase):
+    backend = "json"
+
+class TestSqliteCancellation(CancellationTests, unittest.TestCase):
+    backend = "sqlite"
+
+class TestPartitionedCancellation(CancellationTests, unittest.TestCase):
+    backend = "partitioned"
+
+if __name__ == "__main__":
+    unittest.main()
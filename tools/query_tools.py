@@ -1,17 +1,48 @@
 # tools/query_tools.py
 
+from services.validation_service import ValidationService
+
 def query_restaurant(params, data_service):
     """Queries details about a restaurant."""
-    restaurant_name = params.get("restaurant_name")
-    restaurants = data_service.load_restaurants()
-
-    for restaurant in restaurants:
-        if restaurant["name"] == restaurant_name:
-            return f"""
+    # Exact names resolve to themselves; a misspelled one to its unique close match
+    restaurant_name = ValidationService.resolve_restaurant_name(params.get("restaurant_name"), data_service.get_fuzzy_index())
+    if restaurant_name is not None:
+        restaurant = data_service.get_restaurant(restaurant_name)
+        return f"""
 Restaurant Details:
 - Name: {restaurant['name']}
 - Location: {restaurant['location']}
 - Cuisine: {restaurant['cuisine']}
 - Seating Capacity: {restaurant['seating_capacity']}
 """
-    return "Restaurant not found."
\ No newline at end of file
+    return "Restaurant not found."
+
+def list_restaurants(params, data_service):
+    """Lists restaurants matching optional cuisines, location and features.
+
+    `cuisine` may be one cuisine or a list of them. `features` only match restaurants
+    whose catalog entry has a "features" list containing all of them.
+    Returns {"count": n, "restaurants": [...]}.
+    """
+    cuisines = params.get("cuisine") or [None]
+    if isinstance(cuisines, str):
+        cuisines = [cuisines]
+    features = {feature.lower() for feature in params.get("features") or []}
+    restaurants = []
+    for cuisine in cuisines:
+        for restaurant in data_service.find_restaurants(cuisine=cuisine, location=params.get("location")):
+            if features <= {feature.lower() for feature in restaurant.get("features", [])}:
+                restaurants.append(restaurant)
+    return {"count": len(restaurants), "restaurants": restaurants}
+
+class QueryTools:
+    """Query tools bound to a DataService, in the `func(params)` form ToolRegistry dispatches."""
+
+    def __init__(self, data_service):
+        self.data_service = data_service
+
+    def query_restaurant(self, params):
+        return query_restaurant(params, self.data_service)
+
+    def list_restaurants(self, params):
+        return list_restaurants(params, self.data_service)
\ No newline at end of file
@@ -1,70 +1,77 @@
 # tools/recommendation_tools.py
 
 from agents.prompt_templates import RESPONSE_RECOMMENDATION
+from services.datetime_parser import canonical_slot
 
 def recommend_restaurant(params, data_service):
-    """Recommends up to 3 restaurants based on user preferences with ranking."""
+    """Recommends restaurants based on user preferences with ranking.
+
+    Optional params: `location` (the user's location, defaults to Downtown), `offset` and
+    `limit` for paging through results (3 per page by default) and `weights` to override
+    the scoring weights in services.ranking.DEFAULT_WEIGHTS.
+    """
     cuisine = params.get("cuisine")
     party_size = params.get("party_size")
-    date_time = params.get("date_time")
-    restaurants = data_service.load_restaurants()
-
-    # List to store matching restaurants with scores
-    candidates = []
+    date_time = canonical_slot(params.get("date_time")) or params.get("date_time")
+    offset = int(params.get("offset") or 0)
+    limit = int(params.get("limit") or 3)
+    engine = data_service.get_availability_engine()
+    # Imported here so importing the tools does not pull in NumPy
+    from services.ranking import DEFAULT_USER_LOCATION, get_ranker
 
-    # Simulated user location for scoring (for demonstration; in a real system, this would come from user input)
-    user_location = "Downtown"  # Assume the user is in Downtown
+    # Simulated user location for scoring (in a real system, this would come from the user's profile)
+    user_location = params.get("location") or DEFAULT_USER_LOCATION
 
-    # Evaluate each restaurant
-    for restaurant in restaurants:
-        # Check cuisine match
-        if restaurant["cuisine"].lower() != cuisine.lower():
-            continue
+    # Filters and scores are vectorized; only the requested page is selected and formatted
+    ranker = get_ranker(engine, user_location, params.get("weights"))
+    total, page = ranker.top(int(party_size), date_time, cuisine=cuisine, offset=offset, limit=limit)
 
-        # Check availability
-        available = restaurant["available_slots"].get(date_time, restaurant["seating_capacity"])
-        if available < int(party_size):
-            continue
+    if not page:
+        return "No more recommendations." if total else "No suitable restaurants found."
 
-        # Calculate a score for ranking
-        score = 0.0
+    # Format response for multiple recommendations
+    reason = f"Matches your cuisine preference ({cuisine}) and has enough seating for {party_size} people."
+    response = "Here are my top recommendations:\n"
+    for i, (row, _, _) in enumerate(page, offset + 1):
+        restaurant = engine.restaurants[row]
+        response += f"{i}. **{restaurant['name']}** ({restaurant['cuisine']}) - {restaurant['location']}\n"
+        response += f"   - {reason}\n"
+        response += "   - Would you like to book a reservation here?\n"
+    if offset + limit < total:
+        response += f"Showing {offset + 1}-{offset + len(page)} of {total}. Ask for more to see the next ones.\n"
 
-        # Factor 1: Cuisine match (already filtered, but could add partial matches in the future)
-        score += 1.0
+    return response
 
-        # Factor 2: Availability (prefer restaurants with capacity closer to party size)
-        capacity_ratio = available / int(party_size)
-        if 1.0 <= capacity_ratio <= 2.0:  # Ideal fit: capacity is 1x to 2x the party size
-            score += 0.5
-        elif capacity_ratio > 2.0:  # Too much capacity (less cozy)
-            score += 0.3
+# Typical party size per occasion when the user does not give one
+OCCASION_PARTY_SIZES = {"date": 2, "anniversary": 2, "business": 4, "family": 4, "birthday": 6, "celebration": 6}
 
-        # Factor 3: Location proximity (simplified scoring)
-        if restaurant["location"] == user_location:
-            score += 0.4
-        elif restaurant["location"] in ["Midtown", "Uptown"]:  # Nearby locations
-            score += 0.2
+def get_recommendations(params, data_service):
+    """Returns up to 3 restaurant dicts for a free-text occasion and preferences.
 
-        # Add to candidates with score
-        candidates.append({
-            "restaurant": restaurant,
-            "score": score,
-            "reason": f"Matches your cuisine preference ({cuisine}) and has enough seating for {party_size} people."
-        })
+    Cuisines and locations named in `preferences` become the cuisine filter and the user's
+    location; the occasion picks a typical party size unless `party_size` is given. Without
+    a `date_time`, restaurants are ranked on their full seating capacity.
+    """
+    engine = data_service.get_availability_engine()
+    from services.ranking import DEFAULT_USER_LOCATION, get_ranker
+    words = set((params.get("preferences") or "").lower().replace(",", " ").split())
+    cuisine = next((r["cuisine"] for r in engine.restaurants if r["cuisine"].lower() in words), None)
+    location = next((r["location"] for r in engine.restaurants if r["location"].lower() in words), DEFAULT_USER_LOCATION)
+    occasion = (params.get("occasion") or "").lower()
+    party_size = int(params.get("party_size") or next(
+        (size for name, size in OCCASION_PARTY_SIZES.items() if name in occasion), 2))
+    date_time = canonical_slot(params.get("date_time")) if params.get("date_time") else None
+    _, page = get_ranker(engine, location).top(party_size, date_time, cuisine=cuisine)
+    return [engine.restaurants[row] for row, _, _ in page]
 
-    # Sort candidates by score (descending)
-    candidates.sort(key=lambda x: x["score"], reverse=True)
+class RecommendationTools:
+    """Recommendation tools bound to a DataService, in the `func(params)` form ToolRegistry dispatches."""
 
-    # Return up to 3 recommendations
-    if not candidates:
-        return "No suitable restaurants found."
+    def __init__(self, data_service):
+        self.data_service = data_service
 
-    # Format response for multiple recommendations
-    response = "Here are my top recommendations:\n"
-    for i, candidate in enumerate(candidates[:3], 1):  # Limit to 3 recommendations
-        restaurant = candidate["restaurant"]
-        response += f"{i}. **{restaurant['name']}** ({restaurant['cuisine']}) - {restaurant['location']}\n"
-        response += f"   - {candidate['reason']}\n"
-        response += "   - Would you like to book a reservation here?\n"
+    def recommend_restaurant(self, params):
+        return recommend_restaurant(params, self.data_service)
 
-    return response
\ No newline at end of file
+    def get_recommendations(self, params):
+        return get_recommendations(params, self.data_service)
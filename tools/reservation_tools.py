@@ -1,47 +1,225 @@
 # tools/reservation_tools.py
 
-from agents.prompt_templates import RESPONSE_RESERVATION_SUCCESS, ERROR_NO_AVAILABILITY
+from agents.prompt_templates import RESPONSE_RESERVATION_SUCCESS, ERROR_NO_AVAILABILITY, ALTERNATIVE_TIMES, ALTERNATIVE_RESTAURANTS
+from agents.prompt_templates import RESPONSE_RESERVATION_ID, RESPONSE_WAITLISTED, RESPONSE_CANCELLATION_SUCCESS
+from agents.prompt_templates import RESPONSE_WAITLIST_PROMOTED, ERROR_RESERVATION_NOT_FOUND
+from agents.prompt_templates import RESPONSE_RESERVATION_LIST, RESPONSE_NO_RESERVATIONS, ASK_RESERVATION_FILTER
 from services.validation_service import ValidationService
-from datetime import datetime
+from services.datetime_parser import canonical_slot, parse_slot
+from services.slot_index import find_alternatives
+from datetime import datetime, timedelta
 
-print(f"ReservationTools: datetime = {datetime}, has strptime = {hasattr(datetime, 'strptime')}")
+# Reservations listed in full by find_reservations; the rest are only counted
+MAX_LISTED = 20
 
-def make_reservation(params, data_service):
-    """Makes a reservation at a restaurant."""
-    restaurant_name = params.get("restaurant_name")
+def _validate_reservation(params, data_service):
+    """Validate booking params; returns (reservation, None) or (None, error message)."""
     date_time = params.get("date_time")
     party_size = params.get("party_size")
-    
-    print(f"Validating date_time: '{date_time}'")
+
     # Validate inputs
     validation_service = ValidationService()
-    restaurants = data_service.load_restaurants()
 
-    if not validation_service.validate_restaurant_name(restaurant_name, restaurants):
-        return "Invalid restaurant name."
+    # A booking is never moved to another restaurant on a guess: a misspelled name is only
+    # answered with its close match, for the user to confirm by booking it by name
+    fuzzy_index = data_service.get_fuzzy_index()
+    restaurant_name = validation_service.resolve_restaurant_name(params.get("restaurant_name"), fuzzy_index, exact=True)
+    if restaurant_name is None:
+        suggestion = validation_service.resolve_restaurant_name(params.get("restaurant_name"), fuzzy_index)
+        return None, "Invalid restaurant name." + (f" Did you mean {suggestion}?" if suggestion else "")
     if not validation_service.validate_date_time(date_time):
         # Check if the date-time is in the past
-        try:
-            parsed_time = datetime.strptime(date_time, '%Y-%m-%d %H:%M')
-            if parsed_time <= datetime.now():
-                return "The date and time must be in the future. Please choose a later time."
-        except ValueError:
-            pass
-        return "Invalid date-time format. Use YYYY-MM-DD HH:MM (e.g., 2025-05-17 18:00)."
+        parsed_time = parse_slot(date_time)
+        if parsed_time is not None and parsed_time <= datetime.now():
+            return None, "The date and time must be in the future. Please choose a later time."
+        return None, "Invalid date-time format. Use YYYY-MM-DD HH:MM (e.g., 2025-05-17 18:00)."
     if not validation_service.validate_party_size(party_size):
-        return "Invalid party size. Must be a positive number."
-
-    # Check availability and update
-    if data_service.update_availability(restaurant_name, date_time, party_size):
-        reservation = {
-            "restaurant_name": restaurant_name,
-            "date_time": date_time,
-            "party_size": int(party_size)
-        }
-        data_service.save_reservation(reservation)
+        return None, "Invalid party size. Must be a positive number."
+
+    # "2025-05-17 1800" and "2025-05-17 18:00" must book the same availability entry
+    reservation = {
+        "restaurant_name": restaurant_name,
+        "date_time": canonical_slot(date_time),
+        "party_size": int(party_size)
+    }
+    if params.get("customer") and str(params["customer"]).strip():
+        reservation["customer"] = str(params["customer"]).strip()
+    return reservation, None
+
+def make_reservation(params, data_service):
+    """Makes a reservation at a restaurant.
+
+    With a truthy `waitlist` param, a party that does not fit joins the slot's waitlist
+    instead of being turned away.
+    """
+    reservation, error = _validate_reservation(params, data_service)
+    if error:
+        return error
+
+    # Check availability, take the seats and record the booking in one transaction
+    restaurant_name, date_time, party_size = reservation["restaurant_name"], reservation["date_time"], reservation["party_size"]
+    if data_service.book_reservation(reservation):
         return RESPONSE_RESERVATION_SUCCESS.format(
             restaurant_name=restaurant_name,
             date_time=date_time,
             party_size=party_size
-        )
-    return ERROR_NO_AVAILABILITY
\ No newline at end of file
+        ) + RESPONSE_RESERVATION_ID.format(reservation_id=reservation["reservation_id"])
+    if params.get("waitlist") and party_size <= data_service.get_restaurant(restaurant_name)["seating_capacity"]:
+        waitlist_id, position = data_service.join_waitlist(reservation)
+        return RESPONSE_WAITLISTED.format(position=position, waitlist_id=waitlist_id)
+    alternatives = find_alternatives(data_service, restaurant_name, date_time, int(party_size))
+    return ERROR_NO_AVAILABILITY + _format_alternatives(restaurant_name, alternatives)
+
+def make_reservations(batch, data_service, atomic=True):
+    """Makes many reservations in one pass with a single commit.
+
+    Every item is validated first. With `atomic`, nothing is booked unless every item is
+    valid and fits; otherwise each valid item that fits is booked. Returns one result dict
+    per item with a "status" of "booked", "invalid", "unavailable" or "skipped" and a "message".
+    """
+    results, reservations = [], []
+    for params in batch:
+        reservation, error = _validate_reservation(params, data_service)
+        if error:
+            results.append({"status": "invalid", "message": error})
+        else:
+            results.append(None)
+            reservations.append(reservation)
+
+    if atomic and len(reservations) < len(batch):
+        booked = [False] * len(reservations)
+    else:
+        booked = data_service.book_reservations(reservations, atomic)
+
+    outcomes = iter(zip(reservations, booked))
+    for i, result in enumerate(results):
+        if result is not None:
+            continue
+        reservation, ok = next(outcomes)
+        if ok:
+            results[i] = dict(reservation, status="booked", message=RESPONSE_RESERVATION_SUCCESS.format(**reservation))
+        elif atomic and _fits(reservation, data_service):
+            results[i] = dict(reservation, status="skipped", message="Not booked because another item in the batch failed.")
+        else:
+            results[i] = dict(reservation, status="unavailable", message=ERROR_NO_AVAILABILITY)
+    return results
+
+def cancel_reservation(params, data_service):
+    """Cancels a reservation by ID; the freed seats go to waitlisted parties that fit."""
+    reservation_id = str(params.get("reservation_id") or "").strip()
+    cancelled, promoted = data_service.cancel_reservation(reservation_id)
+    if cancelled is None:
+        return ERROR_RESERVATION_NOT_FOUND.format(reservation_id=reservation_id)
+    message = RESPONSE_CANCELLATION_SUCCESS.format(**cancelled)
+    if promoted:
+        message += RESPONSE_WAITLIST_PROMOTED.format(count=len(promoted), plural="y" if len(promoted) == 1 else "ies")
+    return message
+
+def find_reservations(params, data_service):
+    """Lists reservations by `customer`, or by `restaurant_name` and/or `date` (YYYY-MM-DD).
+
+    `start`/`end` ("YYYY-MM-DD HH:MM") narrow a restaurant's reservations to a time range.
+    Every lookup goes through the reservation index, so none of them scans all bookings.
+    """
+    restaurant_name = None
+    if params.get("restaurant_name"):
+        restaurant_name = ValidationService.resolve_restaurant_name(params["restaurant_name"], data_service.get_fuzzy_index())
+        if restaurant_name is None:
+            return "Invalid restaurant name."
+    day = params.get("date")
+    if params.get("customer"):
+        reservations = data_service.by_customer(params["customer"])
+        if restaurant_name:
+            reservations = [r for r in reservations if r["restaurant_name"] == restaurant_name]
+        if day:
+            reservations = [r for r in reservations if r["date_time"].startswith(day)]
+    elif restaurant_name:
+        start = params.get("start") or day or "0000"
+        end = params.get("end") or (_next_day(day) if day else "9999")
+        reservations = data_service.reservations_between(restaurant_name, start, end)
+    elif day:
+        reservations = sorted(data_service.reservations_on(day), key=lambda r: r["date_time"])
+    else:
+        return ASK_RESERVATION_FILTER
+    if not reservations:
+        return RESPONSE_NO_RESERVATIONS
+    lines = [f"- {r['date_time']} at {r['restaurant_name']}, party of {r['party_size']}"
+             + (f" (ID {r['reservation_id']})" if "reservation_id" in r else "") for r in reservations[:MAX_LISTED]]
+    if len(reservations) > MAX_LISTED:
+        lines.append(f"... and {len(reservations) - MAX_LISTED} more")
+    return RESPONSE_RESERVATION_LIST.format(count=len(reservations), plural="" if len(reservations) == 1 else "s",
+                                            lines="\n".join(lines))
+
+def _next_day(day):
+    try:
+        return (datetime.strptime(day, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    except ValueError:
+        return day
+
+def _fits(reservation, data_service):
+    """Whether a single reservation would fit on its own, used to explain atomic batch failures."""
+    restaurant = data_service.get_restaurant(reservation["restaurant_name"])
+    return restaurant["available_slots"].get(reservation["date_time"], restaurant["seating_capacity"]) >= reservation["party_size"]
+
+def _format_alternatives(restaurant_name, alternatives):
+    """Render the alternative slots and restaurants suggested for a fully booked request."""
+    message = ""
+    if alternatives["same_restaurant"]:
+        times = ", ".join(option["date_time"] for option in alternatives["same_restaurant"])
+        message += ALTERNATIVE_TIMES.format(restaurant_name=restaurant_name, times=times)
+    if alternatives["nearby"]:
+        options = ", ".join(f"{option['restaurant_name']} at {option['date_time']}" for option in alternatives["nearby"])
+        message += ALTERNATIVE_RESTAURANTS.format(options=options)
+    return message
+
+def check_availability(params, data_service):
+    """Checks whether a restaurant can seat a party, suggesting the nearest alternatives if not.
+
+    Accepts either `restaurant_name`/`date_time` or the agent's `restaurant_id`/`date`/`time_slot`.
+    """
+    restaurant_name = ValidationService.resolve_restaurant_name(
+        params.get("restaurant_name") or params.get("restaurant_id"), data_service.get_fuzzy_index())
+    date_time = params.get("date_time") or f"{params.get('date')} {params.get('time_slot')}"
+    date_time = canonical_slot(date_time)
+    restaurant = data_service.get_restaurant(restaurant_name) if restaurant_name else None
+    if restaurant is None or date_time is None or not ValidationService.validate_party_size(params.get("party_size")):
+        return {"restaurant_name": None, "available": False}
+    party_size = int(params.get("party_size"))
+    seats = restaurant["available_slots"].get(date_time, restaurant["seating_capacity"])
+    result = {
+        "restaurant_name": restaurant_name,
+        "date_time": date_time,
+        "available": seats >= party_size,
+        "alternative_times": [],
+        "alternative_restaurants": []
+    }
+    if not result["available"]:
+        alternatives = find_alternatives(data_service, restaurant_name, date_time, party_size)
+        result["alternative_times"] = [option["date_time"] for option in alternatives["same_restaurant"]]
+        result["alternative_restaurants"] = [
+            f"{option['restaurant_name']} at {option['date_time']}" for option in alternatives["nearby"]
+        ]
+    return result
+
+class ReservationTools:
+    """Reservation tools bound to a DataService, in the `func(params)` form ToolRegistry dispatches."""
+
+    def __init__(self, data_service, validation_service=None):
+        self.data_service = data_service
+        self.validation_service = validation_service or ValidationService()
+
+    def make_reservation(self, params):
+        return make_reservation(params, self.data_service)
+
+    def make_reservations(self, params):
+        """Params: "reservations" (a list of make_reservation params) and optional "atomic"."""
+        return make_reservations(params["reservations"], self.data_service, params.get("atomic", True))
+
+    def check_availability(self, params):
+        return check_availability(params, self.data_service)
+
+    def cancel_reservation(self, params):
+        return cancel_reservation(params, self.data_service)
+
+    def find_reservations(self, params):
+        return find_reservations(params, self.data_service)